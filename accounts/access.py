@@ -24,9 +24,21 @@ def is_admin(user) -> bool:
 def in_groups(user, group_names) -> bool:
     if not _is_authenticated(user):
         return False
+    loaded = getattr(user, "_group_names", None)
+    if loaded is not None:
+        return not loaded.isdisjoint(group_names)
     return user.groups.filter(name__in=group_names).exists()
 
 
+async def aload_group_names(user) -> None:
+    """
+    Load the user's group names once, so the helpers of this module answer
+    without a query and can be called from async code.
+    """
+    if _is_authenticated(user) and getattr(user, "_group_names", None) is None:
+        user._group_names = frozenset([name async for name in user.groups.values_list("name", flat=True)])
+
+
 def is_hr(user) -> bool:
     if not _is_authenticated(user):
         return False
@@ -69,3 +81,20 @@ def is_security_admin(user) -> bool:
 
 def is_support(user) -> bool:
     return bool(is_admin(user) or in_groups(user, SUPPORT_GROUPS))
+
+
+def access_scope(user) -> str:
+    """
+    Describe everything the role/group helpers above can depend on.
+
+    Two users with the same scope get identical answers from every helper in
+    this module, so the scope can key shared caches and ETags for endpoints
+    whose visibility depends on role and groups only (not on identity).
+    """
+    if not _is_authenticated(user):
+        return "anonymous"
+    if is_admin(user):
+        return "admin"
+    loaded = getattr(user, "_group_names", None)
+    group_names = sorted(loaded if loaded is not None else user.groups.values_list("name", flat=True))
+    return f"{getattr(user, 'role', '')}:{','.join(group_names)}"
@@ -0,0 +1,209 @@
+"""
+Optional monthly range partitioning of LoginActivity on PostgreSQL.
+
+Once converted, ``accounts_loginactivity`` is a table partitioned by range on
+``timestamp`` with one partition per calendar month (UTC), named
+``accounts_loginactivity_pYYYYMM``, plus a default partition catching rows
+outside every monthly range. Retention then drops whole monthly partitions
+instead of deleting rows (see the ``purge_login_activity`` command).
+
+PostgreSQL refuses to create a partition for a range the default partition
+already holds rows of, so ``ensure_partitions`` detaches the default
+partition, creates the monthly ones, moves the matching rows into them and
+attaches it again, in one transaction.
+
+The conversion rewrites the table under an exclusive lock; run it during a
+maintenance window. PostgreSQL requires the primary key of a partitioned table
+to include the partition key, so the converted table's primary key is
+``(id, timestamp)``. ``id`` stays unique because it still comes from a single
+sequence. Django's migration state is unchanged.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+
+from django.db import connection
+
+from .models import LoginActivity
+
+TABLE = LoginActivity._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_RE = re.compile(rf"^{TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+class PartitioningError(Exception):
+    pass
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    years, month_index = divmod(value.month - 1 + months, 12)
+    return date(value.year + years, month_index + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def _require_postgresql() -> None:
+    if connection.vendor != "postgresql":
+        raise PartitioningError("Monthly partitioning of login activity requires PostgreSQL.")
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.oid = to_regclass(%s)",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def partition_names() -> list[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s)",
+            [TABLE],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def monthly_partitions() -> dict[date, str]:
+    """Existing monthly partitions by first day of month."""
+    partitions = {}
+    for name in partition_names():
+        match = PARTITION_RE.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def _create_partition(schema_editor, month: date) -> str:
+    name = partition_name(month)
+    schema_editor.execute(
+        f"CREATE TABLE {schema_editor.quote_name(name)} PARTITION OF {schema_editor.quote_name(TABLE)} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+    return name
+
+
+def _move_out_of_default(schema_editor, month: date) -> None:
+    """Move the rows of ``month`` from the (detached) default partition to the table."""
+    qn = schema_editor.quote_name
+    schema_editor.execute(
+        f"WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} "
+        f"WHERE \"timestamp\" >= %s AND \"timestamp\" < %s RETURNING *) "
+        f"INSERT INTO {qn(TABLE)} SELECT * FROM moved",
+        [month, add_months(month, 1)],
+    )
+
+
+def ensure_partitions(first_month: date, last_month: date) -> list[str]:
+    """Create the missing monthly partitions between two months (inclusive)."""
+    _require_postgresql()
+    if not is_partitioned():
+        raise PartitioningError(f"{TABLE} is not partitioned; run login_activity_partitions --convert first.")
+    existing = monthly_partitions()
+    missing = []
+    month = month_start(first_month)
+    while month <= last_month:
+        if month not in existing:
+            missing.append(month)
+        month = add_months(month, 1)
+    if not missing:
+        return []
+
+    has_default = DEFAULT_PARTITION in partition_names()
+    created = []
+    with connection.schema_editor() as schema_editor:
+        qn = schema_editor.quote_name
+        if has_default:
+            schema_editor.execute(f"ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(DEFAULT_PARTITION)}")
+        for month in missing:
+            created.append(_create_partition(schema_editor, month))
+            if has_default:
+                _move_out_of_default(schema_editor, month)
+        if has_default:
+            schema_editor.execute(f"ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(DEFAULT_PARTITION)} DEFAULT")
+    return created
+
+
+def drop_partitions_before(cutoff: datetime) -> list[str]:
+    """Drop the monthly partitions whose whole range is older than ``cutoff``."""
+    if not is_partitioned():
+        return []
+    cutoff_day = cutoff.date()
+    dropped = []
+    with connection.schema_editor() as schema_editor:
+        for month, name in sorted(monthly_partitions().items()):
+            if add_months(month, 1) <= cutoff_day:
+                schema_editor.execute(f"DROP TABLE {schema_editor.quote_name(name)}")
+                dropped.append(name)
+    return dropped
+
+
+def convert(*, months_ahead: int, today: date) -> list[str]:
+    """
+    Rebuild the table as a partitioned table and copy every row into it.
+
+    Returns the names of the monthly partitions created.
+    """
+    _require_postgresql()
+    if is_partitioned():
+        raise PartitioningError(f"{TABLE} is already partitioned.")
+
+    old_table = f"{TABLE}_unpartitioned"
+    sequence = f"{TABLE}_id_seq"
+    with connection.schema_editor() as schema_editor:
+        qn = schema_editor.quote_name
+        schema_editor.execute(f"LOCK TABLE {qn(TABLE)} IN ACCESS EXCLUSIVE MODE")
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT min("timestamp") FROM {qn(TABLE)}')
+            oldest = cursor.fetchone()[0]
+
+        schema_editor.execute(f"ALTER TABLE {qn(TABLE)} RENAME TO {qn(old_table)}")
+        schema_editor.execute(
+            f"CREATE TABLE {qn(TABLE)} (LIKE {qn(old_table)} INCLUDING DEFAULTS) PARTITION BY RANGE (\"timestamp\")"
+        )
+
+        current = month_start(today)
+        first = min(month_start(oldest.date()), current) if oldest else current
+        created = []
+        month = first
+        while month <= add_months(current, months_ahead):
+            created.append(_create_partition(schema_editor, month))
+            month = add_months(month, 1)
+        schema_editor.execute(f"CREATE TABLE {qn(DEFAULT_PARTITION)} PARTITION OF {qn(TABLE)} DEFAULT")
+
+        schema_editor.execute(f"INSERT INTO {qn(TABLE)} SELECT * FROM {qn(old_table)}")
+        # Drops the old identity sequence, indexes and constraints with it.
+        schema_editor.execute(f"DROP TABLE {qn(old_table)}")
+
+        schema_editor.execute(f"CREATE SEQUENCE {qn(sequence)} OWNED BY {qn(TABLE)}.\"id\"")
+        schema_editor.execute(
+            f"SELECT setval(%s, COALESCE((SELECT max(\"id\") FROM {qn(TABLE)}), 0) + 1, false)",
+            [sequence],
+        )
+        schema_editor.execute(
+            f"ALTER TABLE {qn(TABLE)} ALTER COLUMN \"id\" SET DEFAULT nextval(%s::regclass)",
+            [sequence],
+        )
+        schema_editor.execute(f"ALTER TABLE {qn(TABLE)} ADD PRIMARY KEY (\"id\", \"timestamp\")")
+
+        user_table = LoginActivity._meta.get_field("user").related_model._meta.db_table
+        schema_editor.execute(
+            f"ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(TABLE + '_user_id_fk')} "
+            f"FOREIGN KEY (\"user_id\") REFERENCES {qn(user_table)} (\"id\") DEFERRABLE INITIALLY DEFERRED"
+        )
+        for index in LoginActivity._meta.indexes:
+            schema_editor.add_index(LoginActivity, index)
+    return created
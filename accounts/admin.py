@@ -70,7 +70,10 @@ class UserAdmin(BaseUserAdmin):
 class LoginActivityAdmin(admin.ModelAdmin):
     list_display = ("user", "action", "success", "timestamp", "ip_address")
     list_filter = ("action", "success", "timestamp")
-    search_fields = ("user__email", "ip_address", "user_agent")
+    # Exact matches only: substring search over user agents scans the whole table.
+    search_fields = ("=user__email", "=ip_address")
+    list_select_related = ("user",)
+    show_full_result_count = False
     readonly_fields = (
         "user",
         "action",
@@ -0,0 +1,130 @@
+"""
+Sink for LoginActivity audit records.
+
+With ``LOGIN_ACTIVITY_ASYNC`` off (default outside production, and in tests)
+each record is inserted immediately, inside the caller's transaction.
+
+With it on, records are queued in memory per worker process and written with
+``bulk_create`` by a background thread when ``LOGIN_ACTIVITY_BATCH_SIZE``
+records are waiting or every ``LOGIN_ACTIVITY_FLUSH_INTERVAL`` seconds, and once
+more at interpreter exit. Records are queued only when the caller's
+transaction commits. If ``LOGIN_ACTIVITY_MAX_QUEUE`` records pile up, the
+request that hits the limit flushes synchronously (backpressure instead of
+unbounded memory).
+
+Timestamps are taken when the event happens, not when the batch is written.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+
+from .models import LoginActivity
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedActivityWriter:
+    def __init__(self, *, batch_size: int, flush_interval: float, max_queue: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue: list[LoginActivity] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, activity: LoginActivity) -> None:
+        transaction.on_commit(partial(self._enqueue, activity))
+
+    def _enqueue(self, activity: LoginActivity) -> None:
+        self._ensure_thread()
+        with self._lock:
+            self._queue.append(activity)
+            pending = len(self._queue)
+        if pending >= self.max_queue:
+            self.flush()
+        elif pending >= self.batch_size:
+            self._wake.set()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="login-activity-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            finally:
+                connections.close_all()
+
+    def flush(self) -> int:
+        """Write every queued record; return how many were written."""
+        with self._lock:
+            batch, self._queue = self._queue, []
+        if not batch:
+            return 0
+        try:
+            with transaction.atomic():
+                LoginActivity.objects.bulk_create(batch, batch_size=self.batch_size)
+            return len(batch)
+        except DatabaseError:
+            # One bad row (e.g. its user was deleted meanwhile) must not lose the batch.
+            logger.exception("Bulk insert of %d login activity records failed; retrying one by one", len(batch))
+            written = 0
+            for activity in batch:
+                try:
+                    activity.save(force_insert=True)
+                    written += 1
+                except DatabaseError:
+                    logger.exception("Dropping login activity record for user %s", activity.user_id)
+            return written
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+
+_writer: BatchedActivityWriter | None = None
+_writer_pid: int | None = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> BatchedActivityWriter:
+    """The batched writer of this process (recreated after a fork)."""
+    global _writer, _writer_pid
+    with _writer_lock:
+        if _writer is None or _writer_pid != os.getpid():
+            _writer = BatchedActivityWriter(
+                batch_size=settings.LOGIN_ACTIVITY_BATCH_SIZE,
+                flush_interval=settings.LOGIN_ACTIVITY_FLUSH_INTERVAL,
+                max_queue=settings.LOGIN_ACTIVITY_MAX_QUEUE,
+            )
+            _writer_pid = os.getpid()
+            atexit.register(_writer.flush)
+        return _writer
+
+
+def record_login_activity(user, action, *, success: bool, ip_address=None, user_agent=None, extra_data=None) -> None:
+    activity = LoginActivity(
+        user=user,
+        action=action,
+        success=success,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        extra_data=extra_data,
+    )
+    if settings.LOGIN_ACTIVITY_ASYNC:
+        get_writer().add(activity)
+    else:
+        activity.save(force_insert=True)
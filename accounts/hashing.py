@@ -0,0 +1,218 @@
+"""
+Password hashing across processes.
+
+A hash costs ~0.1-0.5 s of CPU. Hashed in request threads, a login storm runs
+as many hashes at once as the server has threads, and every other request
+waits for CPU behind them. With ``PASSWORD_HASH_POOL`` on, hashing and
+verification run in a per-process pool of ``PASSWORD_HASH_WORKERS`` processes
+(default: one per CPU): at most that many hashes run at once per web worker,
+and the request thread just waits for the result.
+
+The pool accepts at most ``PASSWORD_HASH_MAX_PENDING`` jobs at a time (queued
+or running; default four per pool process). A caller that finds it full waits
+up to ``PASSWORD_HASH_QUEUE_TIMEOUT`` seconds for a slot, then gets
+``HashingBusy`` (HTTP 503): a login storm is refused early instead of piling
+up requests that would time out anyway.
+
+``check_password`` / ``set_password`` (and ``acheck_password`` /
+``aset_password`` for async code) are drop-in replacements for the ``User``
+methods. With the pool off (default outside production, and in tests) they
+call the ``User`` methods in the calling thread (through ``sync_to_async`` for
+the async ones).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers, make_password, verify_password
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Service momentanément surchargé, réessayez dans quelques secondes.")
+    default_code = "hashing_busy"
+
+
+def _mp_context():
+    # The pool starts while the worker may already run threads: fork a clean
+    # server process instead of the worker itself.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class HashingPool:
+    def __init__(self, *, workers: int, max_pending: int, queue_timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context())
+            return self._executor
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _submit_acquired(self, fn, *args) -> Future:
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def submit(self, fn, *args) -> Future:
+        """Queue ``fn(*args)`` in the pool; raise ``HashingBusy`` if no slot frees up in time."""
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise HashingBusy()
+        return self._submit_acquired(fn, *args)
+
+    def run(self, fn, *args):
+        try:
+            return self.submit(fn, *args).result()
+        except BrokenProcessPool:
+            # A pool process died (OOM killer...): start a new pool for the next
+            # callers and do this one here.
+            self.shutdown(wait=False)
+            return fn(*args)
+
+    async def arun(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            if not await asyncio.to_thread(self._slots.acquire, timeout=self.queue_timeout):
+                raise HashingBusy()
+        try:
+            return await asyncio.wrap_future(self._submit_acquired(fn, *args))
+        except BrokenProcessPool:
+            self.shutdown(wait=False)
+            return await asyncio.to_thread(fn, *args)
+
+    def pending(self) -> int:
+        """Jobs queued or running."""
+        with self._lock:
+            return self._pending
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+_pool: HashingPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "PASSWORD_HASH_POOL", False)
+
+
+def hash_workers() -> int:
+    return settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+
+
+def get_pool() -> HashingPool:
+    """The hashing pool of this process (recreated after a fork)."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            workers = hash_workers()
+            _pool = HashingPool(
+                workers=workers,
+                max_pending=settings.PASSWORD_HASH_MAX_PENDING or workers * 4,
+                queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def warm_up() -> int:
+    """
+    Start the pool processes and import the configured hashers in them, so the
+    first logins after a deploy do not pay for it. Return the number of jobs run.
+    """
+    pool = get_pool()
+    for future in [pool.submit(get_hashers) for _job in range(pool.workers)]:
+        future.result()
+    return pool.workers
+
+
+def reset_pool() -> None:
+    """Stop the process pool (tests, settings changes)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def check_password(user, raw_password: str) -> bool:
+    if not is_enabled():
+        return user.check_password(raw_password)
+    is_correct, must_update = get_pool().run(verify_password, raw_password, user.password)
+    if is_correct and must_update:
+        # Hasher or iteration count changed since this hash was made: upgrade it,
+        # as AbstractBaseUser.check_password() does.
+        set_password(user, raw_password)
+        user.save(update_fields=["password"])
+    return is_correct
+
+
+def set_password(user, raw_password: str) -> None:
+    if not is_enabled():
+        user.set_password(raw_password)
+        return
+    user.password = get_pool().run(make_password, raw_password)
+    # Lets save() notify the password validators, as User.set_password() does.
+    user._password = raw_password
+
+
+async def acheck_password(user, raw_password: str) -> bool:
+    if not is_enabled():
+        return await sync_to_async(user.check_password)(raw_password)
+    is_correct, must_update = await get_pool().arun(verify_password, raw_password, user.password)
+    if is_correct and must_update:
+        await aset_password(user, raw_password)
+        await user.asave(update_fields=["password"])
+    return is_correct
+
+
+async def aset_password(user, raw_password: str) -> None:
+    if not is_enabled():
+        await sync_to_async(user.set_password)(raw_password)
+        return
+    user.password = await get_pool().arun(make_password, raw_password)
+    user._password = raw_password
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """Return ``make_password(p)`` for each password, in order."""
+    if not is_enabled() or len(passwords) <= 1:
+        return [make_password(password) for password in passwords]
+    pool = get_pool()
+    # One job per password: the batch waits for free slots like any other
+    # caller instead of bypassing the bound.
+    futures = [pool.submit(make_password, password) for password in passwords]
+    return [future.result() for future in futures]
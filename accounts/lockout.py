@@ -0,0 +1,92 @@
+"""
+Where login failure counters live.
+
+``LoginAttempt`` always holds the lock itself (``is_locked`` / ``locked_until``),
+so every reader of the lock (login, password reset, admin) keeps working. The
+backend decides where failures are counted until a lock begins:
+
+- ``DatabaseLockoutBackend`` (default): on the ``LoginAttempt`` row, one
+  partial UPDATE per failure.
+- ``CacheLockoutBackend``: in the default cache with an atomic ``incr``.
+  ``LoginAttempt`` is written only when a lock begins or ends. Like the
+  database backend it counts every failure since the last success: the
+  counter has no expiry and is cleared on success or when the lock begins.
+  Refused unless ``CACHE_SHARED``: with a per-process cache each worker would
+  count separately, multiplying the limit by the number of workers.
+
+Select one with the ``LOGIN_LOCKOUT_BACKEND`` setting.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import LoginAttempt
+
+KEY_PREFIX = "login-lockout"
+LOCK_FIELDS = ["failed_attempts", "last_failed_at", "is_locked", "locked_until"]
+
+
+class DatabaseLockoutBackend:
+    """Count failures on the LoginAttempt row."""
+
+    def register_failure(self, attempt: LoginAttempt, *, lock_cleared: bool) -> None:
+        # An expired lock was already cleared in memory; mark_failed() saves it too.
+        attempt.mark_failed()
+
+    def register_success(self, attempt: LoginAttempt, *, lock_cleared: bool) -> None:
+        if lock_cleared or attempt.failed_attempts:
+            attempt.reset_attempts()
+
+
+class CacheLockoutBackend:
+    """Count failures in the cache; persist to LoginAttempt when a lock begins or ends."""
+
+    def __init__(self):
+        if not getattr(settings, "CACHE_SHARED", False):
+            raise ImproperlyConfigured("CacheLockoutBackend needs a cache shared by all workers (CACHE_SHARED).")
+
+    def _key(self, attempt: LoginAttempt) -> str:
+        return f"{KEY_PREFIX}:{attempt.user_id}"
+
+    def _incr(self, key: str) -> int:
+        # No expiry: failures count until a success or a lock clears them.
+        cache.add(key, 0, timeout=None)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Deleted (success or lock on another worker) between add() and incr().
+            cache.add(key, 0, timeout=None)
+            return cache.incr(key)
+
+    def register_failure(self, attempt: LoginAttempt, *, lock_cleared: bool) -> None:
+        now = timezone.now()
+        key = self._key(attempt)
+        count = self._incr(key)
+
+        attempt.failed_attempts = count
+        attempt.last_failed_at = now
+        if count >= attempt.MAX_ATTEMPTS:
+            attempt.is_locked = True
+            attempt.locked_until = now + timedelta(minutes=attempt.LOCKOUT_MINUTES)
+            attempt.save(update_fields=LOCK_FIELDS)
+            cache.delete(key)
+        elif lock_cleared:
+            LoginAttempt.objects.filter(pk=attempt.pk).update(failed_attempts=0, is_locked=False, locked_until=None)
+
+    def register_success(self, attempt: LoginAttempt, *, lock_cleared: bool) -> None:
+        cache.delete(self._key(attempt))
+        # A counter left on the row (lock that ended, or the database backend
+        # before a switch) is cleared as well.
+        if lock_cleared or attempt.failed_attempts:
+            attempt.reset_attempts()
+
+
+def get_lockout_backend():
+    return import_string(settings.LOGIN_LOCKOUT_BACKEND)()
@@ -0,0 +1,169 @@
+"""
+Single-pass login pipeline behind ``LoginSerializer``.
+
+- One query fetches the user together with its ``LoginAttempt`` row.
+- django-axes is consulted through ``AxesProxyHandler.is_allowed()`` and fed
+  through the ``user_login_failed`` signal, exactly as ``authenticate()`` did,
+  but the user is not fetched a second time by ``ModelBackend``.
+- The password is verified once, in the hashing pool when it is enabled
+  (see ``accounts.hashing``).
+- Lockout changes (see ``accounts.lockout``) and the ``LoginActivity`` record
+  (see ``accounts.audit``) are written in one transaction; a clean successful
+  login does not touch ``LoginAttempt``.
+"""
+
+from __future__ import annotations
+
+from axes.handlers.proxy import AxesProxyHandler
+from django.conf import settings
+from django.contrib.auth.signals import user_login_failed
+from django.db import transaction
+from django.utils import timezone
+
+from outbox.mail import queue_mail
+
+from . import hashing
+from .audit import record_login_activity
+from .lockout import get_lockout_backend
+from .models import LoginActivity, LoginAttempt, User, normalize_email_address
+
+
+class LoginError(Exception):
+    """Login refused; ``message`` is safe to return to the client."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+def _request_meta(request):
+    if request is None:
+        return None, None
+    return request.META.get("REMOTE_ADDR"), request.META.get("HTTP_USER_AGENT", "")
+
+
+def find_user(email: str, username: str) -> User | None:
+    """Resolve the login identifier; the lockout row comes with the user."""
+    queryset = User.objects.select_related("login_attempt")
+    user = None
+    if email:
+        if "@" in email:
+            user = queryset.filter(email__iexact=normalize_email_address(email)).first()
+        else:
+            user = queryset.filter(username__iexact=email).first()
+    if not user and username:
+        user = queryset.filter(username__iexact=username).first()
+    return user
+
+
+def _get_attempt(user: User) -> LoginAttempt:
+    try:
+        return user.login_attempt
+    except LoginAttempt.DoesNotExist:
+        attempt, _ = LoginAttempt.objects.get_or_create(user=user)
+        return attempt
+
+
+def _send_lock_email(user: User) -> None:
+    try:
+        queue_mail(
+            subject="Votre compte SmartHR360 a été temporairement verrouillé",
+            message=(
+                "Bonjour,\n\n"
+                "Votre compte a été temporairement verrouillé en raison de plusieurs "
+                "tentatives de connexion échouées.\n\n"
+                "Si vous n'êtes pas à l'origine de ces tentatives, nous vous "
+                "conseillons de contacter l'administrateur ou de réinitialiser votre "
+                "mot de passe.\n\n"
+                "Cordialement,\nL'équipe SmartHR360"
+            ),
+            recipient_list=[user.email],
+        )
+    except Exception:
+        # en dev on ignore les erreurs email
+        pass
+
+
+def login_user(request, *, email: str = "", username: str = "", password: str) -> User:
+    """
+    Check credentials and lockout state, record the outcome, and return the user.
+
+    Raises ``LoginError`` with the client-facing message when the login is refused.
+    """
+    email = (email or "").strip()
+    username = (username or "").strip()
+    ip, ua = _request_meta(request)
+
+    if not email and not username:
+        raise LoginError("Email ou username requis.")
+
+    user = find_user(email, username)
+    if not user:
+        # optional: we don't log here since we don't have a user FK
+        raise LoginError("Identifiants invalides.")
+
+    def record(success: bool, extra_data=None):
+        record_login_activity(
+            user,
+            LoginActivity.Action.LOGIN,
+            success=success,
+            ip_address=ip,
+            user_agent=ua,
+            extra_data=extra_data,
+        )
+
+    attempt = _get_attempt(user)
+    lockout = get_lockout_backend()
+    now = timezone.now()
+
+    # 1) Lockout. An expired lock is cleared in memory and persisted with the
+    #    outcome of this attempt instead of in a separate write.
+    lock_cleared = False
+    if attempt.is_locked:
+        if attempt.locked_until and attempt.locked_until <= now:
+            attempt.failed_attempts = 0
+            attempt.is_locked = False
+            attempt.locked_until = None
+            lock_cleared = True
+        else:
+            seconds_left = max(0, (attempt.locked_until - now).total_seconds()) if attempt.locked_until else 0
+            minutes_left = max(1, int(seconds_left / 60)) if seconds_left > 0 else 0
+            record(
+                False,
+                {"reason": "locked", "seconds_left": int(seconds_left), "minutes_left": minutes_left},
+            )
+            raise LoginError(f"Compte verrouillé. Réessayez dans {minutes_left} minutes.")
+
+    # 2) django-axes, as AxesStandaloneBackend.authenticate() would do it.
+    credentials = {settings.AXES_USERNAME_FORM_FIELD: user.email}
+    if settings.AXES_ENABLED and request is not None and not AxesProxyHandler.is_allowed(request, credentials):
+        record(False, {"reason": "axes_locked"})
+        raise LoginError("Compte verrouillé. Réessayez plus tard.")
+
+    # 3) Password, verified once (ModelBackend semantics: inactive users fail).
+    if not (hashing.check_password(user, password) and user.is_active):
+        with transaction.atomic():
+            user_login_failed.send(sender=__name__, credentials=credentials, request=request)
+            lockout.register_failure(attempt, lock_cleared=lock_cleared)  # increments & possibly locks
+            remaining = attempt.MAX_ATTEMPTS - attempt.failed_attempts
+            record(
+                False,
+                {
+                    "reason": "invalid_password",
+                    "failed_attempts": attempt.failed_attempts,
+                    "remaining_attempts": remaining,
+                },
+            )
+
+        # 🔔 Send email exactly when account becomes locked now
+        if attempt.is_locked:
+            _send_lock_email(user)
+
+        raise LoginError(f"Mot de passe incorrect. Tentatives restantes: {remaining}")
+
+    # 4) Success → reset attempts (only if there is something to reset) and log
+    with transaction.atomic():
+        lockout.register_success(attempt, lock_cleared=lock_cleared)
+        record(True)
+
+    return user
@@ -0,0 +1,50 @@
+"""
+Manage monthly partitions of LoginActivity on PostgreSQL.
+
+    manage.py login_activity_partitions --convert     # one-off, maintenance window
+    manage.py login_activity_partitions               # monthly cron: create upcoming partitions
+"""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts import activity_partitions
+from accounts.activity_partitions import PartitioningError, add_months, month_start
+
+
+class Command(BaseCommand):
+    help = "Partition login activity by month (PostgreSQL) and create upcoming partitions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Rebuild the existing table as a partitioned table (takes an exclusive lock).",
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Create partitions up to this many months after the current one (default: 3).",
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+        months_ahead = options["months_ahead"]
+        if months_ahead < 0:
+            raise CommandError("--months-ahead cannot be negative.")
+
+        try:
+            if options["convert"]:
+                created = activity_partitions.convert(months_ahead=months_ahead, today=today)
+            else:
+                current = month_start(today)
+                created = activity_partitions.ensure_partitions(current, add_months(current, months_ahead))
+        except PartitioningError as exc:
+            raise CommandError(str(exc)) from exc
+
+        for name in created:
+            self.stdout.write(f"Created partition {name}")
+        self.stdout.write(self.style.SUCCESS(f"{len(created)} partitions created."))
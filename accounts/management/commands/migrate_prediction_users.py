@@ -2,27 +2,42 @@
 Migrate users from prediction_skills auth tables into accounts.User.
 
 Default behavior is a dry-run. Use --apply to write changes.
+
+The source is read twice, streamed with a server-side cursor on PostgreSQL:
+first a narrow pass that picks one source user per e-mail address, then the
+full rows in chunks of ``--chunk-size`` users. Existing e-mails and usernames
+are preloaded once. Each chunk is written in its own transaction with
+``bulk_create`` / ``bulk_update``, plus the login attempts and base role group
+links that the per-row ``User`` signals would have created. With
+``--checkpoint FILE`` the last source id of every committed chunk is saved, and
+``--resume`` continues after it.
 """
 
 from __future__ import annotations
 
+import json
 import re
+import time
 from datetime import datetime
+from pathlib import Path
 
 import dj_database_url
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.base_user import AbstractBaseUser
 from django.core.management.base import BaseCommand, CommandError
 from django.db import connections, transaction
 from django.db.utils import OperationalError
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
-from accounts.models import normalize_email_address
+from accounts.models import LoginAttempt, normalize_email_address
+from accounts.roles import set_base_group
 
 SOURCE_ALIAS = "prediction_source"
 HR_GROUPS = {"DRH", "RESPONSABLE_RH", "HR", "HR_ADMIN"}
 MANAGER_GROUPS = {"MANAGER", "MANAGER_ADMIN"}
+DEFAULT_CHUNK_SIZE = 2000
 
 
 def _to_aware(value):
@@ -51,6 +66,14 @@ def _build_placeholder_email(username: str | None, source_id: int, domain: str)
     return f"{local}@{domain}"
 
 
+def _target_email(email: str | None, username: str | None, source_id: int, domain: str) -> tuple[str, bool]:
+    """Normalized e-mail, or a placeholder; and whether it is a placeholder."""
+    normalized = normalize_email_address(email)
+    if normalized:
+        return normalized, False
+    return _build_placeholder_email(username, source_id, domain), True
+
+
 def _ensure_unique_username(base: str, used: set[str], max_length: int = 150) -> str:
     base_clean = base.strip()[:max_length] or "user"
     candidate = base_clean
@@ -89,6 +112,20 @@ def _prefer_candidate(current: dict, candidate: dict) -> bool:
 class Command(BaseCommand):
     help = "Migrate users from prediction_skills auth_user/auth_group tables."
 
+    UPDATE_FIELDS = [
+        "first_name",
+        "last_name",
+        "is_active",
+        "is_staff",
+        "is_superuser",
+        "role",
+        "last_login",
+        "date_joined",
+        "password",
+        "is_email_verified",
+        "email_verified_at",
+    ]
+
     def add_arguments(self, parser):
         parser.add_argument(
             "--source-url",
@@ -126,129 +163,79 @@ class Command(BaseCommand):
             default=None,
             help="Limit the number of users processed (after de-duplication).",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Source users written per transaction (default: {DEFAULT_CHUNK_SIZE}).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="File recording the last migrated source user id after each chunk (with --apply).",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the source users up to the id recorded in --checkpoint.",
+        )
 
     def handle(self, *args, **options):
         source_url = options["source_url"]
-        apply_changes = options["apply"]
-        update_existing = options["update_existing"]
-        match_username = options["match_username"]
-        mark_verified = options["mark_verified"]
-        default_domain = options["default_email_domain"]
+        self.apply_changes = options["apply"]
+        self.update_existing = options["update_existing"]
+        self.match_username = options["match_username"]
+        self.mark_verified = options["mark_verified"]
+        self.default_domain = options["default_email_domain"]
         limit = options["limit"]
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+        checkpoint = Path(options["checkpoint"]) if options["checkpoint"] else None
+        if options["resume"] and checkpoint is None:
+            raise CommandError("--resume requires --checkpoint.")
 
         self._register_source_db(source_url)
+        self.started = time.monotonic()
 
-        source_users = self._fetch_source_users()
-        if not source_users:
+        selected_ids, source_total, duplicate_emails, placeholder_count = self._select_source_users()
+        if not source_total:
             self.stdout.write(self.style.WARNING("No users found in source database."))
             return
-
-        selected_users, duplicate_emails, placeholder_count = self._dedupe_and_prepare(
-            source_users,
-            default_domain=default_domain,
-        )
-
         if limit:
-            selected_users = selected_users[:limit]
+            selected_ids = set(sorted(selected_ids)[:limit])
 
-        User = get_user_model()
-        existing_emails = {
-            normalize_email_address(email)
-            for email in User.objects.values_list("email", flat=True)
-            if email
-        }
-        existing_usernames = {
-            username.lower()
-            for username in User.objects.values_list("username", flat=True)
-            if username
-        }
+        resume_after = 0
+        if options["resume"]:
+            resume_after = self._read_checkpoint(checkpoint)
+            self.stdout.write(f"Resuming after source user id {resume_after}.")
 
-        stats = {
-            "source_total": len(source_users),
-            "after_dedupe": len(selected_users),
+        self.User = get_user_model()
+        self._preload_existing()
+
+        self.stats = {
+            "source_total": source_total,
+            "after_dedupe": len(selected_ids),
             "created": 0,
             "updated": 0,
             "skipped_existing": 0,
             "duplicates": len(duplicate_emails),
             "placeholder_emails": placeholder_count,
         }
+        to_process = sum(1 for source_id in selected_ids if source_id > resume_after)
+        processed = 0
 
-        def process_user(source, *, apply_changes: bool):
-            role = self._map_role(User, source["is_superuser"], source["groups"])
-            email = source["email"]
+        for chunk in self._iter_source_chunks(chunk_size, selected_ids, resume_after):
+            self._process_chunk(chunk)
+            processed += len(chunk)
+            if self.apply_changes and checkpoint is not None:
+                self._write_checkpoint(checkpoint, chunk[-1]["source_id"])
+            self._progress(processed, to_process)
 
-            existing_user = User.objects.filter(email__iexact=email).first()
-            if not existing_user and match_username and source["username"]:
-                existing_user = User.objects.filter(username__iexact=source["username"]).first()
-
-            verified_at = None
-            is_verified = False
-            if mark_verified and email:
-                is_verified = True
-                verified_at = (
-                    _to_aware(source["last_login"])
-                    or _to_aware(source["date_joined"])
-                    or timezone.now()
-                )
-
-            if existing_user:
-                if not update_existing:
-                    stats["skipped_existing"] += 1
-                    return
+        self._print_summary(self.stats, duplicate_emails, dry_run=not self.apply_changes)
 
-                if apply_changes:
-                    existing_user.first_name = source["first_name"]
-                    existing_user.last_name = source["last_name"]
-                    existing_user.is_active = source["is_active"]
-                    existing_user.is_staff = bool(source["is_staff"] or source["is_superuser"])
-                    existing_user.is_superuser = source["is_superuser"]
-                    existing_user.role = role
-                    existing_user.last_login = _to_aware(source["last_login"])
-                    existing_user.date_joined = _to_aware(source["date_joined"]) or existing_user.date_joined
-                    existing_user.password = source["password"]
-                    if is_verified:
-                        existing_user.is_email_verified = True
-                        if verified_at:
-                            existing_user.email_verified_at = verified_at
-                    existing_user.save()
-                stats["updated"] += 1
-                return
-
-            if normalize_email_address(email) in existing_emails:
-                stats["skipped_existing"] += 1
-                return
-
-            username_base = source["username"] or email
-            username = _ensure_unique_username(username_base, existing_usernames)
-            user = User(
-                email=email,
-                username=username,
-                first_name=source["first_name"],
-                last_name=source["last_name"],
-                is_active=source["is_active"],
-                is_staff=bool(source["is_staff"] or source["is_superuser"]),
-                is_superuser=source["is_superuser"],
-                role=role,
-                last_login=_to_aware(source["last_login"]),
-                date_joined=_to_aware(source["date_joined"]) or timezone.now(),
-                is_email_verified=is_verified,
-                email_verified_at=verified_at,
-            )
-            user.password = source["password"]
-            if apply_changes:
-                user.save()
-            stats["created"] += 1
-            existing_emails.add(normalize_email_address(email))
-
-        if apply_changes:
-            with transaction.atomic():
-                for source in selected_users:
-                    process_user(source, apply_changes=True)
-        else:
-            for source in selected_users:
-                process_user(source, apply_changes=False)
-
-        self._print_summary(stats, duplicate_emails, dry_run=not apply_changes)
+    # ------------------------------------------------------------------
+    # Source
+    # ------------------------------------------------------------------
 
     def _register_source_db(self, source_url: str) -> None:
         try:
@@ -274,8 +261,58 @@ class Command(BaseCommand):
         except OperationalError as exc:
             raise CommandError(f"Failed to connect to source database: {exc}") from exc
 
-    def _fetch_source_users(self) -> list[dict]:
+    def _stream(self, query: str, chunk_size: int):
+        """Yield source rows; a server-side (named) cursor on PostgreSQL."""
+        with connections[SOURCE_ALIAS].chunked_cursor() as cursor:
+            cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield from rows
+
+    def _select_source_users(self):
+        """
+        Pick one source user per e-mail (see ``_prefer_candidate``).
+
+        Returns the selected source ids, the number of source users, the
+        duplicates by e-mail and the number of placeholder e-mails.
+        """
         query = """
+            SELECT u.id, u.username, u.email, u.is_active, u.last_login, u.date_joined
+            FROM auth_user u
+            ORDER BY u.id
+        """
+        selected = {}
+        duplicates = {}
+        placeholder_count = 0
+        source_total = 0
+
+        for source_id, username, email, is_active, last_login, date_joined in self._stream(query, 5000):
+            source_total += 1
+            email, placeholder = _target_email(email, username, source_id, self.default_domain)
+            placeholder_count += placeholder
+            candidate = {
+                "source_id": source_id,
+                "is_active": bool(is_active),
+                "last_login": last_login,
+                "date_joined": date_joined,
+            }
+            current = selected.get(email)
+            if current is None:
+                selected[email] = candidate
+            elif _prefer_candidate(current, candidate):
+                # Resolve duplicate emails deterministically.
+                duplicates.setdefault(email, []).append(current["source_id"])
+                selected[email] = candidate
+            else:
+                duplicates.setdefault(email, []).append(source_id)
+
+        return {item["source_id"] for item in selected.values()}, source_total, duplicates, placeholder_count
+
+    def _iter_source_chunks(self, chunk_size: int, selected_ids: set[int], resume_after: int):
+        """Yield lists of at most ``chunk_size`` selected source users, in id order."""
+        query = f"""
             SELECT
                 u.id,
                 u.username,
@@ -292,77 +329,181 @@ class Command(BaseCommand):
             FROM auth_user u
             LEFT JOIN auth_user_groups ug ON u.id = ug.user_id
             LEFT JOIN auth_group g ON ug.group_id = g.id
+            WHERE u.id > {int(resume_after)}
             ORDER BY u.id
         """
 
-        users = {}
-        with connections[SOURCE_ALIAS].cursor() as cursor:
-            cursor.execute(query)
-            for row in cursor.fetchall():
-                (
-                    source_id,
-                    username,
-                    email,
-                    first_name,
-                    last_name,
-                    is_active,
-                    is_staff,
-                    is_superuser,
-                    last_login,
-                    date_joined,
-                    password,
-                    group_name,
-                ) = row
-
-                record = users.setdefault(
-                    source_id,
-                    {
-                        "source_id": source_id,
-                        "username": username or "",
-                        "email": email or "",
-                        "first_name": first_name or "",
-                        "last_name": last_name or "",
-                        "is_active": bool(is_active),
-                        "is_staff": bool(is_staff),
-                        "is_superuser": bool(is_superuser),
-                        "last_login": last_login,
-                        "date_joined": date_joined,
-                        "password": password,
-                        "groups": set(),
-                    },
-                )
-                if group_name:
-                    record["groups"].add(str(group_name))
-
-        result = list(users.values())
-        result.sort(key=lambda item: item["source_id"])
-        return result
-
-    def _dedupe_and_prepare(self, users: list[dict], default_domain: str):
-        selected = {}
-        duplicates = {}
-        placeholder_count = 0
-
-        for user in users:
-            email = normalize_email_address(user["email"])
-            if not email:
-                email = _build_placeholder_email(user["username"], user["source_id"], default_domain)
-                placeholder_count += 1
-            user["email"] = email
-            email_key = email.lower()
-
-            if email_key in selected:
-                # Resolve duplicate emails deterministically.
-                if _prefer_candidate(selected[email_key], user):
-                    duplicates.setdefault(email_key, []).append(selected[email_key]["source_id"])
-                    selected[email_key] = user
+        chunk = []
+        record = None
+        for row in self._stream(query, chunk_size):
+            (
+                source_id,
+                username,
+                email,
+                first_name,
+                last_name,
+                is_active,
+                is_staff,
+                is_superuser,
+                last_login,
+                date_joined,
+                password,
+                group_name,
+            ) = row
+
+            if record is None or record["source_id"] != source_id:
+                if record is not None and record["source_id"] in selected_ids:
+                    chunk.append(record)
+                    if len(chunk) >= chunk_size:
+                        yield chunk
+                        chunk = []
+                record = {
+                    "source_id": source_id,
+                    "username": username or "",
+                    "email": _target_email(email, username, source_id, self.default_domain)[0],
+                    "first_name": first_name or "",
+                    "last_name": last_name or "",
+                    "is_active": bool(is_active),
+                    "is_staff": bool(is_staff),
+                    "is_superuser": bool(is_superuser),
+                    "last_login": last_login,
+                    "date_joined": date_joined,
+                    "password": password,
+                    "groups": set(),
+                }
+            if group_name:
+                record["groups"].add(str(group_name))
+
+        if record is not None and record["source_id"] in selected_ids:
+            chunk.append(record)
+        if chunk:
+            yield chunk
+
+    # ------------------------------------------------------------------
+    # Target
+    # ------------------------------------------------------------------
+
+    def _preload_existing(self) -> None:
+        self.existing_emails: dict[str, int] = {}
+        self.existing_usernames: dict[str, int] = {}
+        rows = self.User.objects.values_list("pk", "email", "username").iterator(chunk_size=10000)
+        for pk, email, username in rows:
+            if email:
+                self.existing_emails[normalize_email_address(email)] = pk
+            if username:
+                self.existing_usernames[username.lower()] = pk
+        # Lowercased usernames taken, including the ones given in this run.
+        self.used_usernames = set(self.existing_usernames)
+
+    def _process_chunk(self, chunk: list[dict]) -> None:
+        User = self.User
+        to_create = []
+        to_update = {}  # existing user id -> source record
+        pending_usernames: dict[str, AbstractBaseUser] = {}  # lowercased username -> user created by this chunk
+
+        for source in chunk:
+            email = source["email"]
+            existing_id = self.existing_emails.get(email)
+            if existing_id is None and self.match_username and source["username"]:
+                existing_id = self.existing_usernames.get(source["username"].lower())
+                pending = pending_usernames.get(source["username"].lower())
+                if existing_id is None and pending is not None:
+                    # Created earlier in this chunk: matched as it would be once inserted.
+                    if self.update_existing:
+                        pending.password = source["password"]
+                        pending.date_joined = _to_aware(source["date_joined"]) or pending.date_joined
+                        self._apply_source(pending, source)
+                        self.stats["updated"] += 1
+                    else:
+                        self.stats["skipped_existing"] += 1
+                    continue
+
+            if existing_id is not None:
+                if not self.update_existing or existing_id in to_update:
+                    self.stats["skipped_existing"] += 1
                 else:
-                    duplicates.setdefault(email_key, []).append(user["source_id"])
+                    to_update[existing_id] = source
                 continue
 
-            selected[email_key] = user
+            username = _ensure_unique_username(source["username"] or email, self.used_usernames)
+            user = User(
+                email=email,
+                username=username,
+                password=source["password"],
+                date_joined=_to_aware(source["date_joined"]) or timezone.now(),
+            )
+            self._apply_source(user, source)
+            to_create.append(user)
+            pending_usernames[username.lower()] = user
 
-        return list(selected.values()), duplicates, placeholder_count
+        self.stats["created"] += len(to_create)
+        self.stats["updated"] += len(to_update)
+        if not self.apply_changes:
+            return
+
+        with transaction.atomic():
+            created = User.objects.bulk_create(to_create)
+            # What the User post_save handlers would have done row by row.
+            LoginAttempt.objects.bulk_create(LoginAttempt(user_id=user.pk) for user in created)
+
+            updated = list(User.objects.filter(pk__in=to_update).order_by("pk"))
+            for user in updated:
+                source = to_update[user.pk]
+                user.password = source["password"]
+                user.date_joined = _to_aware(source["date_joined"]) or user.date_joined
+                self._apply_source(user, source)
+            User.objects.bulk_update(updated, self.UPDATE_FIELDS)
+
+            by_role: dict[str, list[int]] = {}
+            for user in [*created, *updated]:
+                by_role.setdefault(user.role, []).append(user.pk)
+            for role, user_ids in by_role.items():
+                set_base_group(user_ids, role)
+
+        for user in created:
+            self.existing_emails[user.email] = user.pk
+            self.existing_usernames[user.username.lower()] = user.pk
+
+    def _apply_source(self, user, source: dict) -> None:
+        user.first_name = source["first_name"]
+        user.last_name = source["last_name"]
+        user.is_active = source["is_active"]
+        user.is_staff = bool(source["is_staff"] or source["is_superuser"])
+        user.is_superuser = source["is_superuser"]
+        user.role = self._map_role(self.User, source["is_superuser"], source["groups"])
+        user.last_login = _to_aware(source["last_login"])
+        if self.mark_verified and source["email"]:
+            user.is_email_verified = True
+            user.email_verified_at = (
+                _to_aware(source["last_login"])
+                or _to_aware(source["date_joined"])
+                or timezone.now()
+            )
+
+    # ------------------------------------------------------------------
+    # Checkpoints and output
+    # ------------------------------------------------------------------
+
+    def _read_checkpoint(self, path: Path) -> int:
+        try:
+            return int(json.loads(path.read_text())["last_source_id"])
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            raise CommandError(f"Unreadable checkpoint {path}: {exc}") from exc
+
+    def _write_checkpoint(self, path: Path, last_source_id: int) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({"last_source_id": last_source_id, "updated_at": timezone.now().isoformat()}))
+        tmp.replace(path)
+
+    def _progress(self, processed: int, total: int) -> None:
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(
+            f"[{elapsed:7.1f}s] {processed}/{total} users "
+            f"(created {self.stats['created']}, updated {self.stats['updated']}, "
+            f"skipped {self.stats['skipped_existing']})"
+        )
 
     def _map_role(self, user_model, is_superuser: bool, groups: set[str]) -> str:
         if is_superuser:
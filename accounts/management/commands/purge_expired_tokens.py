@@ -0,0 +1,59 @@
+"""
+Delete expired outstanding refresh tokens and their blacklist entries.
+
+Unlike simplejwt's ``flushexpiredtokens`` (one unbounded DELETE, plus a SELECT
+of every cascaded blacklist row), rows are removed in batches of
+``--batch-size``. Each batch is two short DELETE statements (blacklist, then
+outstanding) in their own transaction.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding and blacklisted JWT refresh tokens, in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Tokens deleted per batch.")
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the expired tokens.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{expired.count()} expired tokens would be deleted.")
+            return
+
+        total = 0
+        blacklisted = 0
+        while True:
+            ids = list(expired.order_by("id").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            # BlacklistedToken has no dependents, so the cascade is a single
+            # DELETE ... WHERE token_id IN (...) without fetching the rows.
+            _, per_model = OutstandingToken.objects.filter(pk__in=ids, expires_at__lte=now).delete()
+            total += per_model.get(OutstandingToken._meta.label, 0)
+            blacklisted += per_model.get("token_blacklist.BlacklistedToken", 0)
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Deleted {total} tokens...")
+            if len(ids) < batch_size:
+                break
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {total} expired tokens ({blacklisted} of them blacklisted).")
+        )
@@ -0,0 +1,74 @@
+"""
+Delete LoginActivity records older than the retention period.
+
+Rows are deleted in bounded batches (one short transaction each) so the purge
+never holds long locks or builds a huge transaction. When the table is
+partitioned by month on PostgreSQL (see ``login_activity_partitions``), whole
+monthly partitions older than the cutoff are dropped first.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts import activity_partitions
+from accounts.models import LoginActivity
+
+
+class Command(BaseCommand):
+    help = "Delete login activity older than LOGIN_ACTIVITY_RETENTION_DAYS, in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.LOGIN_ACTIVITY_RETENTION_DAYS,
+            help="Keep this many days of activity (default: LOGIN_ACTIVITY_RETENTION_DAYS).",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows deleted per statement.")
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would be deleted.")
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        batch_size = options["batch_size"]
+        if days < 1:
+            raise CommandError("--days must be at least 1.")
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        cutoff = timezone.now() - timedelta(days=days)
+        expired = LoginActivity.objects.filter(timestamp__lt=cutoff)
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"{expired.count()} login activity records older than {cutoff:%Y-%m-%d %H:%M} would be deleted."
+            )
+            return
+
+        for name in activity_partitions.drop_partitions_before(cutoff):
+            self.stdout.write(f"Dropped partition {name}")
+
+        total = 0
+        while True:
+            ids = list(expired.order_by("timestamp").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            # No signals or reverse relations: a single DELETE per batch.
+            deleted, _ = LoginActivity.objects.filter(pk__in=ids, timestamp__lt=cutoff).delete()
+            total += deleted
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Deleted {total} records...")
+            if len(ids) < batch_size:
+                break
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {total} login activity records older than {cutoff:%Y-%m-%d %H:%M}.")
+        )
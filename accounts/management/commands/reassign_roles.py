@@ -0,0 +1,65 @@
+"""
+Change the role (and base role group) of many users at once.
+
+    manage.py reassign_roles --role MANAGER --user-id 12 --user-id 40
+    manage.py reassign_roles --role EMPLOYEE --email-file leavers.txt
+    manage.py reassign_roles --role HR --from-role MANAGER --dry-run
+
+See ``accounts.roles.reassign_role``: set-based SQL per chunk of users, in one
+transaction.
+"""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User, normalize_email_address
+from accounts.roles import CHUNK_SIZE, reassign_role
+
+
+class Command(BaseCommand):
+    help = "Reassign the role of many users, updating their base role groups in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--role", required=True, choices=User.Role.values, help="New role.")
+        parser.add_argument("--user-id", type=int, action="append", dest="user_ids", help="User id (repeatable).")
+        parser.add_argument("--email-file", help="File with one e-mail address per line.")
+        parser.add_argument("--from-role", choices=User.Role.values, help="Only users that currently have this role.")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Users updated per statement.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the users that would change.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+        if not (options["user_ids"] or options["email_file"] or options["from_role"]):
+            raise CommandError("Select users with --user-id, --email-file and/or --from-role.")
+
+        users = User.objects.all()
+        if options["user_ids"]:
+            users = users.filter(pk__in=options["user_ids"])
+        if options["email_file"]:
+            try:
+                with open(options["email_file"], encoding="utf-8") as handle:
+                    emails = {normalize_email_address(line) for line in handle if line.strip()}
+            except OSError as exc:
+                raise CommandError(f"Cannot read {options['email_file']}: {exc}") from exc
+            users = users.filter(email__in=emails)
+        if options["from_role"]:
+            users = users.filter(role=options["from_role"])
+
+        result = reassign_role(
+            users,
+            options["role"],
+            chunk_size=options["chunk_size"],
+            dry_run=options["dry_run"],
+        )
+        if options["dry_run"]:
+            self.stdout.write(
+                f"{result.matched} users selected, {result.changed} would change role to {options['role']}."
+            )
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result.matched} users selected, {result.changed} changed role to {options['role']}."
+            )
+        )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_create_default_groups'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='loginactivity',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_login_activity_event_timestamp'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loginactivity',
+            index=models.Index(fields=['user', 'timestamp'], name='accounts_la_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loginactivity',
+            index=models.Index(fields=['timestamp'], name='accounts_la_timestamp_idx'),
+        ),
+    ]
@@ -3,9 +3,10 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser, BaseUserManager, Group
-from django.db import models
+from django.core.cache import cache
+from django.db import IntegrityError, models, transaction
 from django.db.models.functions import Lower
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_migrate, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
@@ -150,6 +151,13 @@ class User(AbstractUser):
             self.email_verified_at = timezone.now()
         super().save(*args, **kwargs)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        # The role the base role group already matches (see sync_user_role_group).
+        user._synced_role = user.__dict__.get("role")
+        return user
+
     def __str__(self):
         return f"{self.email} ({self.role})"
 
@@ -169,6 +177,9 @@ class PasswordResetToken(models.Model):
     token = models.CharField(max_length=64, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
     is_used = models.BooleanField(default=False)
+    # Set for invitations (see accounts.provisioning); otherwise the token
+    # expires EXPIRATION_HOURS after creation.
+    expires_at = models.DateTimeField(null=True, blank=True)
 
     EXPIRATION_HOURS = 1
 
@@ -183,10 +194,8 @@ class PasswordResetToken(models.Model):
         )
 
     def _expiration_datetime(self):
-        # Allow tests to inject a custom expires_at attribute without a schema change
-        explicit = getattr(self, "expires_at", None)
-        if explicit is not None:
-            return explicit
+        if self.expires_at is not None:
+            return self.expires_at
         return self.created_at + timedelta(hours=self.EXPIRATION_HOURS)
 
     def mark_used(self):
@@ -260,13 +269,13 @@ class LoginAttempt(models.Model):
             self.is_locked = True
             self.locked_until = now + timedelta(minutes=self.LOCKOUT_MINUTES)
 
-        self.save()
+        self.save(update_fields=["failed_attempts", "last_failed_at", "is_locked", "locked_until"])
 
     def reset_attempts(self):
         self.failed_attempts = 0
         self.is_locked = False
         self.locked_until = None
-        self.save()
+        self.save(update_fields=["failed_attempts", "is_locked", "locked_until"])
 
     def check_lock_status(self):
         from django.utils import timezone
@@ -287,35 +296,84 @@ def create_login_attempt(sender, instance, created, **kwargs):
         LoginAttempt.objects.create(user=instance)
 
 
-def _ensure_group(name: str) -> Group:
-    group, _ = Group.objects.get_or_create(name=name)
-    return group
+BASE_ROLE_GROUP_IDS_KEY = "accounts:base-role-group-ids"
+BASE_ROLE_GROUP_IDS_TTL = 60
 
 
-def _sync_role_base_group(user: User) -> None:
-    if not user.pk:
-        return
+def base_role_group_ids() -> dict[str, int]:
+    """
+    Ids of the base role groups by name, created if missing.
 
-    if user.role == User.Role.ADMIN:
-        if BASE_ROLE_GROUPS:
-            user.groups.remove(*Group.objects.filter(name__in=BASE_ROLE_GROUPS))
-        return
+    Kept in the shared cache for ``BASE_ROLE_GROUP_IDS_TTL`` seconds once they
+    all exist; renaming or deleting a group, and migrate/flush, clear them for
+    every worker. A per-process cache only clears its own copy: the TTL bounds
+    how long the other workers keep stale ids.
+    """
+    ids = cache.get(BASE_ROLE_GROUP_IDS_KEY)
+    if ids is not None:
+        return ids
+
+    ids = dict(Group.objects.filter(name__in=BASE_ROLE_GROUPS).values_list("name", "id"))
+    missing = BASE_ROLE_GROUPS - ids.keys()
+    for name in missing:
+        ids[name] = Group.objects.get_or_create(name=name)[0].pk
+    if not missing:
+        # Groups created just now may still be rolled back with the caller's transaction.
+        cache.set(BASE_ROLE_GROUP_IDS_KEY, ids, BASE_ROLE_GROUP_IDS_TTL)
+    return ids
 
-    base_group_name = ROLE_TO_BASE_GROUP.get(user.role)
-    if not base_group_name:
-        return
 
-    target_group = _ensure_group(base_group_name)
-    user.groups.add(target_group)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_migrate)
+def clear_base_role_group_ids(**kwargs):
+    cache.delete(BASE_ROLE_GROUP_IDS_KEY)
 
-    other_base_groups = BASE_ROLE_GROUPS - {base_group_name}
-    if other_base_groups:
-        user.groups.remove(*Group.objects.filter(name__in=other_base_groups))
+
+def _set_role_base_group(user: User, base_group_name: str | None, *, created: bool) -> None:
+    group_ids = base_role_group_ids()
+    if not created:
+        other_ids = [group_id for name, group_id in group_ids.items() if name != base_group_name]
+        user.groups.remove(*other_ids)
+    if base_group_name:
+        user.groups.add(group_ids[base_group_name])
+
+
+def _sync_role_base_group(user: User, *, created: bool = False) -> None:
+    if not user.pk:
+        return
+
+    if user.role == User.Role.ADMIN:
+        base_group_name = None
+    else:
+        base_group_name = ROLE_TO_BASE_GROUP.get(user.role)
+        if not base_group_name:
+            return
+
+    try:
+        _set_role_base_group(user, base_group_name, created=created)
+    except IntegrityError:
+        # Most likely a group deleted since its id was cached. The caller's
+        # transaction, if any, is aborted and must roll back; the next
+        # attempt looks the ids up again.
+        clear_base_role_group_ids()
+        if transaction.get_connection().in_atomic_block:
+            raise
+        _set_role_base_group(user, base_group_name, created=created)
 
 
 @receiver(post_save, sender=User)
-def sync_user_role_group(sender, instance, **kwargs):
-    _sync_role_base_group(instance)
+def sync_user_role_group(sender, instance, created, update_fields=None, **kwargs):
+    # Only when the role may have changed: not on saves of other fields (such
+    # as last_login), nor when the role is still the one loaded or last synced.
+    if update_fields is not None and "role" not in update_fields:
+        return
+    if "role" not in instance.__dict__:
+        return
+    if not created and getattr(instance, "_synced_role", None) == instance.role:
+        return
+    _sync_role_base_group(instance, created=created)
+    instance._synced_role = instance.role
 
 class LoginActivity(models.Model):
     class Action(models.TextChoices):
@@ -328,11 +386,20 @@ class LoginActivity(models.Model):
         related_name="login_activities",
     )
     action = models.CharField(max_length=20, choices=Action.choices)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the event happens, not when a batched writer inserts the row.
+    timestamp = models.DateTimeField(default=timezone.now)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(null=True, blank=True)
     success = models.BooleanField(default=True)
     extra_data = models.JSONField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Per-user timeline (keyset pagination on timestamp).
+            models.Index(fields=["user", "timestamp"], name="accounts_la_user_ts_idx"),
+            # Retention purges and admin date filtering.
+            models.Index(fields=["timestamp"], name="accounts_la_timestamp_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.email} - {self.action} ({'success' if self.success else 'failed'})"
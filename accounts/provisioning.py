@@ -0,0 +1,135 @@
+"""
+Bulk user provisioning (``POST /api/auth/users/bulk/``).
+
+Creating users one by one through /register/ costs, per user, two uniqueness
+queries, a password hash, the INSERT, the ``post_save`` handlers (login
+attempt, role group), a verification token and an e-mail. Here a whole batch
+costs:
+
+- one ``IN`` query per chunk of e-mails and of usernames to find the taken ones;
+- the given passwords hashed in a process pool (``accounts.hashing``); users
+  without a password get an unusable one and an invitation instead: a
+  password-reset token valid ``PROVISIONING_INVITE_EXPIRATION_HOURS`` and an
+  e-mail with the link;
+- ``bulk_create`` of the users, their login attempts, the base role group
+  links and the invitation tokens, and one batch of e-mails, in one transaction.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from outbox.mail import queue_mass_mail
+
+from .hashing import hash_passwords
+from .models import LoginAttempt, PasswordResetToken, User
+from .roles import set_base_group
+
+CHUNK_SIZE = 500
+
+
+@dataclass
+class ProvisioningResult:
+    users: list[User] = field(default_factory=list)
+    invited: int = 0
+
+
+def find_taken(emails: list[str], usernames: list[str], *, chunk_size: int = CHUNK_SIZE) -> tuple[set, set]:
+    """Lowercased e-mails and usernames that already belong to a user."""
+    taken_emails = set()
+    taken_usernames = set()
+    emails = sorted({email.lower() for email in emails})
+    usernames = sorted({username.lower() for username in usernames})
+    for start in range(0, len(emails), chunk_size):
+        taken_emails.update(
+            User.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=emails[start:start + chunk_size])
+            .values_list("email_lower", flat=True)
+        )
+    for start in range(0, len(usernames), chunk_size):
+        taken_usernames.update(
+            User.objects.annotate(username_lower=Lower("username"))
+            .filter(username_lower__in=usernames[start:start + chunk_size])
+            .values_list("username_lower", flat=True)
+        )
+    return taken_emails, taken_usernames
+
+
+def provision_users(rows: list[dict], *, send_invites: bool = True) -> ProvisioningResult:
+    """
+    Create users from validated rows.
+
+    Each row has ``email``, ``username``, ``first_name``, ``last_name``,
+    ``role`` and an optional ``password``; uniqueness is checked by the caller.
+    """
+    with_password = [index for index, row in enumerate(rows) if row.get("password")]
+    hashed = hash_passwords([rows[index]["password"] for index in with_password])
+    hashes = dict(zip(with_password, hashed, strict=True))
+
+    users = [
+        User(
+            email=row["email"],
+            username=row["username"],
+            first_name=row.get("first_name", ""),
+            last_name=row.get("last_name", ""),
+            role=row["role"],
+            password=hashes.get(index) or make_password(None),
+        )
+        for index, row in enumerate(rows)
+    ]
+
+    result = ProvisioningResult()
+    with transaction.atomic():
+        result.users = User.objects.bulk_create(users, batch_size=CHUNK_SIZE)
+        # What the User post_save handlers would have done row by row.
+        LoginAttempt.objects.bulk_create(
+            (LoginAttempt(user_id=user.pk) for user in result.users),
+            batch_size=CHUNK_SIZE,
+        )
+        by_role: dict[str, list[int]] = {}
+        for user in result.users:
+            by_role.setdefault(user.role, []).append(user.pk)
+        for role, user_ids in by_role.items():
+            for start in range(0, len(user_ids), CHUNK_SIZE):
+                set_base_group(user_ids[start:start + CHUNK_SIZE], role)
+
+        if send_invites:
+            invitees = [user for index, user in enumerate(result.users) if index not in hashes]
+            result.invited = _invite(invitees)
+    return result
+
+
+def _invite(users: list[User]) -> int:
+    expires_at = timezone.now() + timedelta(hours=settings.PROVISIONING_INVITE_EXPIRATION_HOURS)
+    tokens = PasswordResetToken.objects.bulk_create(
+        (PasswordResetToken(user=user, token=uuid.uuid4().hex, expires_at=expires_at) for user in users),
+        batch_size=CHUNK_SIZE,
+    )
+    frontend_base = "http://localhost:3000"
+    messages = []
+    for token in tokens:
+        link = f"{frontend_base}/reset-password?token={token.token}"
+        messages.append(
+            (
+                "Votre compte SmartHR360",
+                (
+                    "Bonjour,\n\n"
+                    "Un compte SmartHR360 a été créé pour vous.\n"
+                    "Veuillez cliquer sur le lien suivant pour choisir votre mot de passe :\n\n"
+                    f"{link}\n\n"
+                    f"Ce lien expire le {expires_at:%d/%m/%Y à %H:%M} (UTC)."
+                ),
+                None,
+                [token.user.email],
+            )
+        )
+    queue_mass_mail(messages)
+    return len(tokens)
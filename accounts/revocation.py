@@ -0,0 +1,122 @@
+"""
+Per-process filter of revoked (blacklisted) refresh-token jtis.
+
+With ``JWT_REVOCATION_FILTER`` on, ``accounts.tokens.RefreshToken`` checks the
+filter instead of querying ``token_blacklist`` on every refresh or logout:
+
+- a hit means the token is revoked, and the request is refused without a query;
+- a miss is not proof, since another worker may have revoked the token since
+  the last sync. Refresh (with ``BLACKLIST_AFTER_ROTATION``) and logout then
+  blacklist the token, and that insert fails for a token that is already
+  blacklisted. The database stays the authority and a stale filter only costs
+  the query it was meant to save.
+
+The filter holds exact jtis (no false positives). It is fed by every
+``BlacklistedToken`` saved in this process and synced from the table every
+``JWT_REVOCATION_FILTER_SYNC_SECONDS`` seconds. An incremental sync reads rows
+with a higher id than the last one seen. A full reload every
+``FULL_SYNC_SECONDS`` picks up rows committed out of id order and drops expired
+tokens.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+FULL_SYNC_SECONDS = 600
+
+
+class RevocationFilter:
+    def __init__(self, *, sync_interval: float, full_sync_interval: float = FULL_SYNC_SECONDS):
+        self.sync_interval = sync_interval
+        self.full_sync_interval = full_sync_interval
+        self._expiry: dict[str, float] = {}  # jti -> expiry (epoch seconds)
+        self._last_id = 0
+        self._synced_at: float | None = None
+        self._full_synced_at: float | None = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._expiry[jti] = expires_at.timestamp()
+
+    def contains(self, jti: str) -> bool:
+        self.sync_if_due()
+        expiry = self._expiry.get(jti)
+        return expiry is not None and expiry > time.time()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def sync_if_due(self) -> None:
+        now = time.monotonic()
+        if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+            return
+        # One thread syncs; the others keep using the current set.
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            full = self._full_synced_at is None or now - self._full_synced_at >= self.full_sync_interval
+            self.sync(full=full)
+        finally:
+            self._sync_lock.release()
+
+    def sync(self, *, full: bool = False) -> int:
+        """Load blacklisted jtis from the database; return how many rows were read."""
+        queryset = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        if not full:
+            queryset = queryset.filter(id__gt=self._last_id)
+        rows = list(queryset.order_by("id").values_list("id", "token__jti", "token__expires_at"))
+
+        loaded = {jti: expires_at.timestamp() for _, jti, expires_at in rows}
+        now = time.time()
+        with self._lock:
+            if full:
+                # Keep what was added meanwhile by this process.
+                loaded.update(self._expiry)
+                self._expiry = {jti: expiry for jti, expiry in loaded.items() if expiry > now}
+                self._full_synced_at = time.monotonic()
+            else:
+                self._expiry.update(loaded)
+            if rows:
+                self._last_id = max(self._last_id, rows[-1][0])
+            self._synced_at = time.monotonic()
+        return len(rows)
+
+
+_filter: RevocationFilter | None = None
+_filter_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "JWT_REVOCATION_FILTER", False)
+
+
+def get_filter() -> RevocationFilter:
+    global _filter
+    with _filter_lock:
+        if _filter is None:
+            _filter = RevocationFilter(sync_interval=settings.JWT_REVOCATION_FILTER_SYNC_SECONDS)
+        return _filter
+
+
+def reset_filter() -> None:
+    """Forget the process filter (tests, settings changes)."""
+    global _filter
+    with _filter_lock:
+        _filter = None
+
+
+@receiver(post_save, sender=BlacklistedToken, dispatch_uid="accounts.revocation.feed_filter")
+def feed_filter(sender, instance, created, **kwargs):
+    if created and is_enabled():
+        get_filter().add(instance.token.jti, instance.token.expires_at)
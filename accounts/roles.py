@@ -0,0 +1,87 @@
+"""
+Bulk role reassignment.
+
+Saving a ``User`` keeps its base role group in line with its role, one user at
+a time (see ``accounts.models.sync_user_role_group``). ``reassign_role`` changes
+the role of many users without loading them. For each chunk of users it runs
+one UPDATE of ``role``, one DELETE of the other base groups from the
+``groups`` through table and one INSERT of the new base group. Other groups
+(HR_ADMIN, AUDITOR, ...) are kept. ``m2m_changed`` is not sent.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from .grouping import ROLE_TO_BASE_GROUP
+from .models import User, base_role_group_ids
+
+CHUNK_SIZE = 1000
+
+
+@dataclass
+class RoleReassignment:
+    matched: int = 0
+    changed: int = 0
+    not_found: list[int] = field(default_factory=list)
+
+
+def reassign_role(
+    users: QuerySet | Iterable[int],
+    role: str,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    dry_run: bool = False,
+) -> RoleReassignment:
+    """Give ``role`` to the users (a queryset or user ids)."""
+    if role not in User.Role.values:
+        raise ValueError(f"Unknown role {role!r}.")
+
+    result = RoleReassignment()
+    if isinstance(users, QuerySet):
+        user_ids = list(users.order_by("pk").values_list("pk", flat=True))
+    else:
+        requested = sorted(set(users))
+        user_ids = []
+        for start in range(0, len(requested), chunk_size):
+            chunk = requested[start:start + chunk_size]
+            user_ids.extend(User.objects.filter(pk__in=chunk).order_by("pk").values_list("pk", flat=True))
+        result.not_found = sorted(set(requested) - set(user_ids))
+    result.matched = len(user_ids)
+
+    if dry_run:
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            result.changed += User.objects.filter(pk__in=chunk).exclude(role=role).count()
+        return result
+
+    with transaction.atomic():
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            result.changed += User.objects.filter(pk__in=chunk).exclude(role=role).update(role=role)
+            set_base_group(chunk, role)
+    return result
+
+
+def set_base_group(user_ids: list[int], role: str) -> None:
+    """
+    Put the users in the base group of ``role`` and out of the other base groups.
+
+    Two statements for the whole list; call it with chunks of ids, inside the
+    caller's transaction.
+    """
+    base_group_name = None if role == User.Role.ADMIN else ROLE_TO_BASE_GROUP.get(role)
+    group_ids = base_role_group_ids()
+    other_group_ids = [group_id for name, group_id in group_ids.items() if name != base_group_name]
+    through = User.groups.through
+
+    through.objects.filter(user_id__in=user_ids, group_id__in=other_group_ids).delete()
+    if base_group_name:
+        through.objects.bulk_create(
+            [through(user_id=user_id, group_id=group_ids[base_group_name]) for user_id in user_ids],
+            ignore_conflicts=True,
+        )
@@ -6,8 +6,11 @@ OpenAPI schema extensions for authentication endpoints.
 from drf_spectacular.utils import OpenApiExample, OpenApiResponse, extend_schema
 
 from .serializers import (
+    BulkRoleChangeSerializer,
+    BulkUserProvisionSerializer,
     ChangePasswordSerializer,
     EmailVerificationSerializer,
+    LoginActivitySerializer,
     LoginSerializer,
     LogoutSerializer,
     PasswordResetSerializer,
@@ -156,6 +159,93 @@ user_list_schema = extend_schema(
     tags=["User Management"],
 )
 
+user_login_activity_schema = extend_schema(
+    summary="User login activity",
+    description=(
+        "Login and logout events of one user, newest first. Cursor-paginated: "
+        "follow `next` / `previous`; there is no total count. Optional filters: "
+        "`action` (LOGIN, LOGOUT), `success` (true, false). Requires security admin role."
+    ),
+    responses={
+        200: OpenApiResponse(
+            description="Page of login activity",
+            response=LoginActivitySerializer(many=True),
+        ),
+        403: OpenApiResponse(description="Permission denied - security admin role required"),
+        404: OpenApiResponse(description="User not found"),
+    },
+    tags=["User Management"],
+)
+
+user_bulk_role_schema = extend_schema(
+    summary="Reassign user roles in bulk",
+    description=(
+        "Give one role to up to 10,000 users and update their base role group "
+        "(EMPLOYEE, MANAGER, HR; none for ADMIN) with a few set-based statements. "
+        "Other groups are kept. Unknown ids are reported in `not_found`. Requires admin role."
+    ),
+    request=BulkRoleChangeSerializer,
+    responses={
+        200: OpenApiResponse(description="Users matched, users whose role changed, unknown ids"),
+        400: OpenApiResponse(description="Invalid role or user ids"),
+        403: OpenApiResponse(description="Permission denied - admin role required"),
+    },
+    tags=["User Management"],
+    examples=[
+        OpenApiExample(
+            "Promote to manager",
+            value={"role": "MANAGER", "user_ids": [12, 40, 41]},
+            request_only=True,
+        ),
+        OpenApiExample(
+            "Result",
+            value={"role": "MANAGER", "matched": 3, "changed": 2, "not_found": []},
+            response_only=True,
+        ),
+    ],
+)
+
+user_bulk_provision_schema = extend_schema(
+    summary="Provision users in bulk",
+    description=(
+        "Create many users in one request (up to PROVISIONING_MAX_USERS, 5000 by default). "
+        "E-mails and usernames are checked for the whole batch, and any error rejects the batch: "
+        "errors are listed per user, in request order. A username defaults to the e-mail. "
+        "At most PROVISIONING_MAX_PASSWORDS (200) users may be given a password, since each one is "
+        "hashed. Users without a password get an unusable one; with `send_invites` (default) they "
+        "receive an e-mail with a link to choose it. Requires HR or admin role; only admins "
+        "may create ADMIN users."
+    ),
+    request=BulkUserProvisionSerializer,
+    responses={
+        201: OpenApiResponse(
+            description="Users created; number of invitations sent",
+            response=UserSerializer(many=True),
+        ),
+        400: OpenApiResponse(description="Validation errors, per user"),
+        403: OpenApiResponse(description="Permission denied - HR role required"),
+    },
+    tags=["User Management"],
+    examples=[
+        OpenApiExample(
+            "Onboard two employees",
+            value={
+                "users": [
+                    {"email": "jane.doe@acquired.com", "first_name": "Jane", "last_name": "Doe"},
+                    {
+                        "email": "john.roe@acquired.com",
+                        "username": "jroe",
+                        "role": "MANAGER",
+                        "password": "StrongPass123!",
+                    },
+                ],
+                "send_invites": True,
+            },
+            request_only=True,
+        ),
+    ],
+)
+
 # Password reset request schema
 request_password_reset_schema = extend_schema(
     summary="Request password reset",
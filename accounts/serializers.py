@@ -1,21 +1,26 @@
 from django.conf import settings
-from django.contrib.auth import authenticate
-from django.core.mail import send_mail
+from django.db import transaction
 from django.utils import timezone
-from axes.exceptions import AxesBackendPermissionDenied
 from rest_framework import exceptions, serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
 
-# + the new import we just added:
-from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+from outbox.mail import queue_mail
 
+from . import hashing
+from .access import is_admin
+from .login import LoginError, login_user
 from .models import (
     EmailVerificationToken,
     LoginActivity,
-    LoginAttempt,
     PasswordResetToken,
     User,
     normalize_email_address,
 )
+from .provisioning import find_taken
+from .tokens import RefreshToken
+
+USERNAME_MAX_LENGTH = User._meta.get_field("username").max_length
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -33,6 +38,100 @@ class UserSerializer(serializers.ModelSerializer):
         ]
 
 
+class LoginActivitySerializer(serializers.ModelSerializer):
+    """One entry of a user's login/logout timeline."""
+    class Meta:
+        model = LoginActivity
+        fields = [
+            "id",
+            "action",
+            "success",
+            "timestamp",
+            "ip_address",
+            "user_agent",
+            "extra_data",
+        ]
+
+
+class BulkRoleChangeSerializer(serializers.Serializer):
+    """Used for /users/role/: give one role to many users."""
+    MAX_USERS = 10000
+
+    role = serializers.ChoiceField(choices=User.Role.choices)
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_USERS,
+    )
+
+
+class ProvisionedUserSerializer(serializers.Serializer):
+    """One user of a /users/bulk/ request; no password means an invitation."""
+    email = serializers.EmailField()
+    username = serializers.CharField(required=False, allow_blank=True, max_length=USERNAME_MAX_LENGTH)
+    first_name = serializers.CharField(required=False, allow_blank=True, max_length=150)
+    last_name = serializers.CharField(required=False, allow_blank=True, max_length=150)
+    role = serializers.ChoiceField(choices=User.Role.choices, default=User.Role.EMPLOYEE)
+    password = serializers.CharField(required=False, write_only=True, min_length=8)
+
+    def validate(self, attrs):
+        attrs["email"] = normalize_email_address(attrs["email"])
+        attrs["username"] = attrs.get("username", "").strip() or attrs["email"]
+        # The e-mail stands in for a missing username, which is capped at 150 characters.
+        if len(attrs["username"]) > USERNAME_MAX_LENGTH:
+            raise serializers.ValidationError(
+                {"username": [f"Obligatoire lorsque l'email dépasse {USERNAME_MAX_LENGTH} caractères."]}
+            )
+        return attrs
+
+
+class BulkUserProvisionSerializer(serializers.Serializer):
+    """Used for /users/bulk/: uniqueness is checked for the whole batch at once."""
+    users = ProvisionedUserSerializer(many=True, allow_empty=False)
+    send_invites = serializers.BooleanField(default=True)
+
+    def validate_users(self, rows):
+        max_users = settings.PROVISIONING_MAX_USERS
+        if len(rows) > max_users:
+            raise serializers.ValidationError(f"{max_users} utilisateurs au maximum par requête.")
+        # Each password costs a hash (~100-500 ms of CPU); larger batches should use invitations.
+        max_passwords = settings.PROVISIONING_MAX_PASSWORDS
+        if sum(1 for row in rows if row.get("password")) > max_passwords:
+            raise serializers.ValidationError(
+                f"{max_passwords} mots de passe au maximum par requête ; invitez les autres utilisateurs."
+            )
+
+        taken_emails, taken_usernames = find_taken(
+            [row["email"] for row in rows],
+            [row["username"] for row in rows],
+        )
+        can_create_admins = is_admin(self.context["request"].user)
+        seen_emails = set()
+        seen_usernames = set()
+        errors = []
+        for row in rows:
+            row_errors = {}
+            email = row["email"].lower()
+            username = row["username"].lower()
+            if email in taken_emails:
+                row_errors["email"] = ["Un utilisateur avec cet email existe déjà."]
+            elif email in seen_emails:
+                row_errors["email"] = ["Cet email apparaît plusieurs fois dans la requête."]
+            if username in taken_usernames:
+                row_errors["username"] = ["Un utilisateur avec ce username existe déjà."]
+            elif username in seen_usernames:
+                row_errors["username"] = ["Ce username apparaît plusieurs fois dans la requête."]
+            if row["role"] == User.Role.ADMIN and not can_create_admins:
+                row_errors["role"] = ["Seul un administrateur peut créer des comptes ADMIN."]
+            seen_emails.add(email)
+            seen_usernames.add(username)
+            errors.append(row_errors)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return rows
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     """Used for /register endpoint."""
     password = serializers.CharField(write_only=True, min_length=8)
@@ -46,31 +145,31 @@ class RegisterSerializer(serializers.ModelSerializer):
         role = validated_data.pop("role", User.Role.EMPLOYEE)
         password = validated_data.pop("password")
 
-        user = User.objects.create_user(
-            role=role,
-            **validated_data,
-        )
-        user.set_password(password)
-        user.save()
-
-        # Auto-send email verification (optional)
-        token_obj = EmailVerificationToken.create_for_user(user)
-        frontend_base = "http://localhost:3000"
-        verify_link = f"{frontend_base}/verify-email?token={token_obj.token}"
+        # The outbox row commits or rolls back with the account.
+        with transaction.atomic():
+            user = User.objects.create_user(
+                role=role,
+                **validated_data,
+            )
+            hashing.set_password(user, password)
+            user.save()
 
-        send_mail(
-            subject="Vérifiez votre adresse email SmartHR360",
-            message=(
-                "Bonjour,\n\n"
-                "Merci de vous être inscrit sur SmartHR360.\n"
-                "Veuillez cliquer sur le lien suivant pour vérifier votre adresse email :\n\n"
-                f"{verify_link}\n\n"
-                "Si vous n'êtes pas à l'origine de cette inscription, ignorez cet email."
-            ),
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=True,
-        )
+            # Auto-send email verification (optional)
+            token_obj = EmailVerificationToken.create_for_user(user)
+            frontend_base = "http://localhost:3000"
+            verify_link = f"{frontend_base}/verify-email?token={token_obj.token}"
+
+            queue_mail(
+                subject="Vérifiez votre adresse email SmartHR360",
+                message=(
+                    "Bonjour,\n\n"
+                    "Merci de vous être inscrit sur SmartHR360.\n"
+                    "Veuillez cliquer sur le lien suivant pour vérifier votre adresse email :\n\n"
+                    f"{verify_link}\n\n"
+                    "Si vous n'êtes pas à l'origine de cette inscription, ignorez cet email."
+                ),
+                recipient_list=[user.email],
+            )
 
         return user
 
@@ -95,153 +194,16 @@ class LoginSerializer(serializers.Serializer):
     username = serializers.CharField(required=False, allow_blank=True)
     password = serializers.CharField(write_only=True)
 
-    def _get_request_meta(self):
-        request = self.context.get("request")
-        if not request:
-            return None, None
-        ip = request.META.get("REMOTE_ADDR")
-        ua = request.META.get("HTTP_USER_AGENT", "")
-        return ip, ua
-
     def validate(self, attrs):
-        raw_email = (attrs.get("email") or "").strip()
-        raw_username = (attrs.get("username") or "").strip()
-        password = attrs.get("password")
-        ip, ua = self._get_request_meta()
-
-        if not raw_email and not raw_username:
-            raise serializers.ValidationError("Email ou username requis.")
-
-        user = None
-
-        if raw_email:
-            if "@" in raw_email:
-                normalized_email = normalize_email_address(raw_email)
-                user = User.objects.filter(email__iexact=normalized_email).first()
-            else:
-                user = User.objects.filter(username__iexact=raw_email).first()
-
-        if not user and raw_username:
-            user = User.objects.filter(username__iexact=raw_username).first()
-
-        if not user:
-            # optional: we don't log here since we don't have a user FK
-            raise serializers.ValidationError("Identifiants invalides.") from None
-
-        # Ensure a LoginAttempt exists
-        attempt, _ = LoginAttempt.objects.get_or_create(user=user)
-
-        # 1) Check lockout (robust against locked_until = None)
-        if attempt.check_lock_status():
-            # 🔧 Robustness fix: handle possible None locked_until
-            if attempt.locked_until:
-                seconds_left = (attempt.locked_until - timezone.now()).total_seconds()
-                if seconds_left < 0:
-                    seconds_left = 0
-                minutes_left = max(1, int(seconds_left / 60)) if seconds_left > 0 else 0
-            else:
-                seconds_left = 0
-                minutes_left = 0
-
-            # log failed login (locked)
-            LoginActivity.objects.create(
-                user=user,
-                action=LoginActivity.Action.LOGIN,
-                success=False,
-                ip_address=ip,
-                user_agent=ua,
-                extra_data={
-                    "reason": "locked",
-                    "seconds_left": int(seconds_left),
-                    "minutes_left": minutes_left,
-                },
-            )
-
-            raise serializers.ValidationError(
-                f"Compte verrouillé. Réessayez dans {minutes_left} minutes."
-            )
-
-        # 2) Check password (use authenticate for axes integration)
         try:
-            authenticated_user = authenticate(
-                request=self.context.get("request"),
-                email=user.email,
-                password=password,
-            )
-        except AxesBackendPermissionDenied:
-            LoginActivity.objects.create(
-                user=user,
-                action=LoginActivity.Action.LOGIN,
-                success=False,
-                ip_address=ip,
-                user_agent=ua,
-                extra_data={"reason": "axes_locked"},
-            )
-            raise serializers.ValidationError(
-                "Compte verrouillé. Réessayez plus tard."
+            attrs["user"] = login_user(
+                self.context.get("request"),
+                email=attrs.get("email") or "",
+                username=attrs.get("username") or "",
+                password=attrs.get("password"),
             )
-
-        if not authenticated_user:
-            # before increment, were we unlocked?
-            was_locked_before = attempt.is_locked
-
-            attempt.mark_failed()  # increments & possibly locks
-
-            remaining = attempt.MAX_ATTEMPTS - attempt.failed_attempts
-
-            # log failed login (bad password)
-            LoginActivity.objects.create(
-                user=user,
-                action=LoginActivity.Action.LOGIN,
-                success=False,
-                ip_address=ip,
-                user_agent=ua,
-                extra_data={
-                    "reason": "invalid_password",
-                    "failed_attempts": attempt.failed_attempts,
-                    "remaining_attempts": remaining,
-                },
-            )
-
-            # 🔔 Send email exactly when account becomes locked now
-            if not was_locked_before and attempt.is_locked:
-                try:
-                    send_mail(
-                        subject="Votre compte SmartHR360 a été temporairement verrouillé",
-                        message=(
-                            "Bonjour,\n\n"
-                            "Votre compte a été temporairement verrouillé en raison de plusieurs "
-                            "tentatives de connexion échouées.\n\n"
-                            "Si vous n'êtes pas à l'origine de ces tentatives, nous vous "
-                            "conseillons de contacter l'administrateur ou de réinitialiser votre "
-                            "mot de passe.\n\n"
-                            "Cordialement,\nL'équipe SmartHR360"
-                        ),
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[user.email],
-                        fail_silently=True,
-                    )
-                except Exception:
-                    # en dev on ignore les erreurs email
-                    pass
-
-            raise serializers.ValidationError(
-                f"Mot de passe incorrect. Tentatives restantes: {remaining}"
-            )
-
-        # 3) Success → reset attempts and log success
-        attempt.reset_attempts()
-
-        LoginActivity.objects.create(
-            user=user,
-            action=LoginActivity.Action.LOGIN,
-            success=True,
-            ip_address=ip,
-            user_agent=ua,
-            extra_data=None,
-        )
-
-        attrs["user"] = authenticated_user
+        except LoginError as exc:
+            raise serializers.ValidationError(exc.message) from None
         return attrs
 
 
@@ -254,7 +216,7 @@ class ChangePasswordSerializer(serializers.Serializer):
 
     def validate_old_password(self, value):
         user = self.context["request"].user
-        if not user.check_password(value):
+        if not hashing.check_password(user, value):
             raise serializers.ValidationError("Ancien mot de passe incorrect.")
         return value
 
@@ -267,7 +229,7 @@ class ChangePasswordSerializer(serializers.Serializer):
 
     def save(self, **kwargs):
         user = self.context["request"].user
-        user.set_password(self.validated_data["new_password"])
+        hashing.set_password(user, self.validated_data["new_password"])
         user.save()
         return user
 
@@ -290,6 +252,11 @@ class LogoutSerializer(serializers.Serializer):
             raise exceptions.ValidationError("Token invalide ou déjà blacklisté.") from None
 
 
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """/refresh/ with ``accounts.tokens.RefreshToken`` (see SIMPLE_JWT["TOKEN_REFRESH_SERIALIZER"])."""
+    token_class = RefreshToken
+
+
 class RequestPasswordResetSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
@@ -321,7 +288,7 @@ class RequestPasswordResetSerializer(serializers.Serializer):
         frontend_base = "http://localhost:3000"
         reset_link = f"{frontend_base}/reset-password?token={token_obj.token}"
 
-        send_mail(
+        queue_mail(
             subject="Réinitialisation de votre mot de passe SmartHR360",
             message=(
                 "Bonjour,\n\n"
@@ -329,9 +296,7 @@ class RequestPasswordResetSerializer(serializers.Serializer):
                 f"Veuillez utiliser le lien suivant pour le réinitialiser :\n\n{reset_link}\n\n"
                 "Si vous n'êtes pas à l'origine de cette demande, ignorez cet email."
             ),
-            from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[user.email],
-            fail_silently=True,
         )
 
         return token_obj
@@ -364,7 +329,7 @@ class PasswordResetSerializer(serializers.Serializer):
         new_password = self.validated_data["new_password"]
         user = token_obj.user
 
-        user.set_password(new_password)
+        hashing.set_password(user, new_password)
         user.save()
 
         token_obj.mark_used()
@@ -405,7 +370,7 @@ class RequestEmailVerificationSerializer(serializers.Serializer):
         frontend_base = "http://localhost:3000"  # adapt later to your real FE URL
         verify_link = f"{frontend_base}/verify-email?token={token_obj.token}"
 
-        send_mail(
+        queue_mail(
             subject="Vérifiez votre adresse email SmartHR360",
             message=(
                 "Bonjour,\n\n"
@@ -414,9 +379,7 @@ class RequestEmailVerificationSerializer(serializers.Serializer):
                 f"{verify_link}\n\n"
                 "Si vous n'êtes pas à l'origine de cette inscription, ignorez cet email."
             ),
-            from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[user.email],
-            fail_silently=True,
         )
 
         return token_obj
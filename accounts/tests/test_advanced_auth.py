@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework import status
 
 from accounts.models import (
@@ -11,6 +11,8 @@ from accounts.models import (
 from accounts.tests.helpers import DEFAULT_PASSWORD, api_client, create_user, login
 
 
+# Audit rows are read right after the request: write them synchronously.
+@override_settings(LOGIN_ACTIVITY_ASYNC=False)
 class AdvancedAuthTests(TestCase):
     def setUp(self):
         self.client = api_client()
@@ -1,6 +1,6 @@
 from datetime import timedelta
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 from rest_framework import status
 
@@ -14,6 +14,8 @@ from accounts.models import (
 from accounts.tests.helpers import DEFAULT_PASSWORD, api_client, create_user
 
 
+# Audit rows are read right after the request: write them synchronously.
+@override_settings(LOGIN_ACTIVITY_ASYNC=False)
 class AuthEdgeCaseTests(TestCase):
     def setUp(self):
         self.client = api_client()
@@ -0,0 +1,165 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import LoginAttempt, PasswordResetToken, User
+from accounts.tests.helpers import DEFAULT_PASSWORD, authenticate, create_user, login
+from outbox.models import OutgoingEmail
+
+
+# Invitations are read from mail.outbox: send them inline.
+@override_settings(EMAIL_OUTBOX_ENABLED=False)
+class BulkUserProvisioningTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("auth-user-bulk-provision")
+        self.hr = create_user(email="hr-bulk@example.com", role=User.Role.HR)
+        authenticate(self.client, self.hr.email, DEFAULT_PASSWORD)
+
+    def post(self, users, **extra):
+        return self.client.post(self.url, {"users": users, **extra}, format="json")
+
+    def test_creates_users_with_groups_login_attempts_and_invitations(self):
+        resp = self.post(
+            [
+                {"email": "Jane.Doe@Acquired.com", "first_name": "Jane", "last_name": "Doe"},
+                {"email": "john@acquired.com", "username": "jroe", "role": "MANAGER"},
+                {"email": "pat@acquired.com", "password": "PatPass123!"},
+            ]
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        self.assertEqual(resp.data["data"]["created"], 3)
+        self.assertEqual(resp.data["data"]["invited"], 2)
+        self.assertEqual(
+            [user["username"] for user in resp.data["data"]["users"]],
+            ["jane.doe@acquired.com", "jroe", "pat@acquired.com"],
+        )
+
+        jane = User.objects.get(email="jane.doe@acquired.com")
+        self.assertFalse(jane.has_usable_password())
+        self.assertEqual(set(jane.groups.values_list("name", flat=True)), {"EMPLOYEE"})
+        john = User.objects.get(username="jroe")
+        self.assertEqual(set(john.groups.values_list("name", flat=True)), {"MANAGER"})
+        self.assertEqual(LoginAttempt.objects.filter(user__email__endswith="@acquired.com").count(), 3)
+
+        # Invitations: one e-mail per user without a password, valid for days.
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ["jane.doe@acquired.com", "john@acquired.com"],
+        )
+        token = PasswordResetToken.objects.get(user=jane)
+        self.assertIn(token.token, mail.outbox[0].body + mail.outbox[1].body)
+        self.assertGreater(token.expires_at, timezone.now() + timedelta(hours=71))
+
+        with mock.patch("django.utils.timezone.now", return_value=timezone.now() + timedelta(hours=2)):
+            self.assertFalse(token.is_expired())
+
+        # The user with a password can log in right away.
+        login(self.client_class(), "pat@acquired.com", "PatPass123!")
+
+    @override_settings(EMAIL_OUTBOX_ENABLED=True)
+    def test_invitations_are_queued_with_the_outbox(self):
+        self.post([{"email": "a@acquired.com"}, {"email": "b@acquired.com"}])
+
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(
+            sorted(email.to[0] for email in OutgoingEmail.objects.all()),
+            ["a@acquired.com", "b@acquired.com"],
+        )
+
+    def test_invitation_link_sets_the_password(self):
+        self.post([{"email": "invitee@acquired.com"}])
+        token = PasswordResetToken.objects.get(user__email="invitee@acquired.com")
+
+        resp = self.client.post(
+            "/api/auth/password-reset/confirm/",
+            {"token": token.token, "new_password": "InviteePass123!"},
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        login(self.client_class(), "invitee@acquired.com", "InviteePass123!")
+
+    def test_without_invites(self):
+        resp = self.post([{"email": "quiet@acquired.com"}], send_invites=False)
+
+        self.assertEqual(resp.data["data"]["invited"], 0)
+        self.assertEqual(mail.outbox, [])
+        self.assertFalse(PasswordResetToken.objects.exists())
+
+    def test_uniqueness_errors_are_reported_per_user_and_nothing_is_created(self):
+        create_user(email="taken@acquired.com", username="taken")
+
+        resp = self.post(
+            [
+                {"email": "ok@acquired.com"},
+                {"email": "TAKEN@acquired.com"},
+                {"email": "other@acquired.com", "username": "Taken"},
+                {"email": "ok@acquired.com", "username": "ok2"},
+            ]
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = resp.data["users"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("email", errors[1])
+        self.assertIn("username", errors[2])
+        self.assertIn("email", errors[3])
+        self.assertFalse(User.objects.filter(email="ok@acquired.com").exists())
+
+    def test_long_email_needs_a_username(self):
+        long_email = f"{'x' * 150}@acquired.com"
+
+        resp = self.post([{"email": long_email}])
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("username", resp.data["users"][0])
+        self.assertFalse(User.objects.filter(email=long_email).exists())
+
+        resp = self.post([{"email": long_email, "username": "long"}])
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        self.assertTrue(User.objects.filter(email=long_email, username="long").exists())
+
+    def test_validation_queries_do_not_grow_with_the_batch(self):
+        def count_queries(prefix, size):
+            users = [{"email": f"{prefix}{i}@acquired.com"} for i in range(size)]
+            with CaptureQueriesContext(connection) as queries:
+                resp = self.post(users)
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+
+        self.assertEqual(count_queries("small", 5), count_queries("large", 60))
+
+    def test_only_admins_create_admins(self):
+        resp = self.post([{"email": "boss@acquired.com", "role": "ADMIN"}])
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+        admin = create_user(email="admin-bulk@example.com", role=User.Role.ADMIN)
+        authenticate(self.client, admin.email, DEFAULT_PASSWORD)
+        resp = self.post([{"email": "boss@acquired.com", "role": "ADMIN"}])
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(User.objects.get(email="boss@acquired.com").groups.exists())
+
+    def test_requires_hr(self):
+        employee = create_user(email="emp-bulk@example.com")
+        authenticate(self.client, employee.email, DEFAULT_PASSWORD)
+
+        resp = self.post([{"email": "x@acquired.com"}])
+
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(PROVISIONING_MAX_USERS=2, PROVISIONING_MAX_PASSWORDS=1)
+    def test_batch_size_limits(self):
+        resp = self.post([{"email": f"u{i}@acquired.com"} for i in range(3)])
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+        resp = self.post([{"email": f"p{i}@acquired.com", "password": "PassWord123!"} for i in range(2)])
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
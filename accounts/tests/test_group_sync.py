@@ -1,7 +1,18 @@
+from io import StringIO
+
 from django.contrib.auth.models import Group
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
 
-from accounts.models import User
+from accounts.models import BASE_ROLE_GROUP_IDS_KEY, User, base_role_group_ids
+from accounts.roles import reassign_role
+from accounts.tests.helpers import DEFAULT_PASSWORD, authenticate
 
 
 class GroupSyncTests(TestCase):
@@ -45,3 +56,142 @@ class GroupSyncTests(TestCase):
         user.save()
 
         self.assertFalse(user.groups.filter(name__in=["HR", "MANAGER", "EMPLOYEE"]).exists())
+
+
+class RoleSyncQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="sync@example.com",
+            password="SyncPass123!",
+            role=User.Role.EMPLOYEE,
+        )
+
+    def test_save_without_role_change_does_not_touch_groups(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = "Sync"
+        with self.assertNumQueries(1):  # the UPDATE
+            user.save()
+
+    def test_last_login_update_does_not_touch_groups(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.last_login = timezone.now()
+        with self.assertNumQueries(1):
+            user.save(update_fields=["last_login"])
+
+    def test_role_change_is_one_delete_and_one_insert(self):
+        user = User.objects.get(pk=self.user.pk)
+        base_role_group_ids()  # warm the process cache
+        user.role = User.Role.MANAGER
+        with self.assertNumQueries(3):  # UPDATE user, DELETE other base groups, INSERT new one
+            user.save()
+
+        self.assertEqual(set(user.groups.values_list("name", flat=True)), {"MANAGER"})
+
+        # A second save with the same role is a no-op for groups.
+        with self.assertNumQueries(1):
+            user.save()
+
+    def test_deleted_group_is_recreated(self):
+        Group.objects.filter(name="HR").delete()
+
+        self.user.role = User.Role.HR
+        self.user.save()
+
+        self.assertTrue(self.user.groups.filter(name="HR").exists())
+
+
+class StaleGroupIdTests(TransactionTestCase):
+    def test_stale_cached_id_is_looked_up_again(self):
+        # What another worker still holds after the HR group was recreated.
+        ids = base_role_group_ids()
+        cache.set(BASE_ROLE_GROUP_IDS_KEY, {**ids, "HR": ids["HR"] + 1000})
+
+        user = User.objects.create_user(email="stale@example.com", password="StalePass123!", role=User.Role.HR)
+
+        self.assertEqual(list(user.groups.values_list("name", flat=True)), ["HR"])
+        self.assertEqual(cache.get(BASE_ROLE_GROUP_IDS_KEY), ids)
+
+
+class BulkRoleReassignmentTests(APITestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email=f"bulk{i}@example.com",
+                password="BulkPass123!",
+                role=User.Role.EMPLOYEE,
+            )
+            for i in range(5)
+        ]
+        self.auditor, _ = Group.objects.get_or_create(name="AUDITOR")
+        self.users[0].groups.add(self.auditor)
+        self.users[1].role = User.Role.MANAGER
+        self.users[1].save()
+
+    def group_names(self, user):
+        return set(user.groups.values_list("name", flat=True))
+
+    def test_reassign_role_updates_role_and_base_groups_in_chunks(self):
+        ids = [user.pk for user in self.users]
+        base_role_group_ids()
+
+        # Per chunk of 2 ids: SELECT the existing ids, then UPDATE, DELETE, INSERT; plus SAVEPOINT/RELEASE.
+        with self.assertNumQueries(3 + 3 * 3 + 2):
+            result = reassign_role(ids + [999999], User.Role.HR, chunk_size=2)
+
+        self.assertEqual(result.matched, 5)
+        self.assertEqual(result.changed, 5)
+        self.assertEqual(result.not_found, [999999])
+        for user in self.users:
+            user.refresh_from_db()
+            self.assertEqual(user.role, User.Role.HR)
+        self.assertEqual(self.group_names(self.users[0]), {"HR", "AUDITOR"})
+        self.assertEqual(self.group_names(self.users[1]), {"HR"})
+
+    def test_reassign_to_admin_removes_base_groups(self):
+        result = reassign_role(User.objects.filter(pk=self.users[0].pk), User.Role.ADMIN)
+
+        self.assertEqual((result.matched, result.changed), (1, 1))
+        self.assertEqual(self.group_names(self.users[0]), {"AUDITOR"})
+
+    def test_unknown_role_is_rejected(self):
+        with self.assertRaises(ValueError):
+            reassign_role([self.users[0].pk], "CEO")
+
+    def test_command_with_from_role(self):
+        out = StringIO()
+        call_command("reassign_roles", "--role", "HR", "--from-role", "EMPLOYEE", "--dry-run", stdout=out)
+        self.assertIn("4 users selected, 4 would change", out.getvalue())
+        self.assertEqual(User.objects.filter(role=User.Role.HR).count(), 0)
+
+        call_command("reassign_roles", "--role", "HR", "--from-role", "EMPLOYEE", stdout=out)
+        self.assertEqual(User.objects.filter(role=User.Role.HR).count(), 4)
+        self.assertEqual(self.group_names(self.users[1]), {"MANAGER"})
+
+    def test_command_requires_a_selection(self):
+        with self.assertRaises(CommandError):
+            call_command("reassign_roles", "--role", "HR")
+
+    def test_api_requires_admin_and_reassigns(self):
+        admin = User.objects.create_user(
+            email="bulk-admin@example.com",
+            password=DEFAULT_PASSWORD,
+            role=User.Role.ADMIN,
+        )
+        url = reverse("auth-user-bulk-role")
+        payload = {"role": "MANAGER", "user_ids": [self.users[2].pk, self.users[3].pk, 424242]}
+
+        authenticate(self.client, self.users[4].email, "BulkPass123!")
+        self.assertEqual(self.client.post(url, payload, format="json").status_code, status.HTTP_403_FORBIDDEN)
+
+        authenticate(self.client, admin.email, DEFAULT_PASSWORD)
+        resp = self.client.post(url, payload, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            resp.data["data"],
+            {"role": "MANAGER", "matched": 2, "changed": 2, "not_found": [424242]},
+        )
+        self.assertEqual(self.group_names(self.users[2]), {"MANAGER"})
+
+        bad = self.client.post(url, {"role": "CEO", "user_ids": []}, format="json")
+        self.assertEqual(bad.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,99 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import skipIf, skipUnless
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts import activity_partitions
+from accounts.activity_partitions import add_months, partition_name
+from accounts.models import LoginActivity
+from accounts.tests.helpers import create_user
+
+
+class PurgeLoginActivityCommandTests(TestCase):
+    def setUp(self):
+        self.user = create_user(email="retention@example.com")
+        now = timezone.now()
+        LoginActivity.objects.bulk_create(
+            LoginActivity(user=self.user, action=LoginActivity.Action.LOGIN, timestamp=now - timedelta(days=days))
+            for days in (1, 10, 29, 31, 40, 90, 400)
+        )
+
+    def _purge(self, *args):
+        out = StringIO()
+        call_command("purge_login_activity", *args, stdout=out)
+        return out.getvalue()
+
+    def test_deletes_only_expired_rows_in_batches(self):
+        output = self._purge("--days", "30", "--batch-size", "2")
+
+        self.assertIn("Deleted 4 login activity records", output)
+        self.assertEqual(LoginActivity.objects.count(), 3)
+        self.assertFalse(LoginActivity.objects.filter(timestamp__lt=timezone.now() - timedelta(days=30)).exists())
+
+    def test_dry_run_keeps_rows(self):
+        output = self._purge("--days", "30", "--dry-run")
+
+        self.assertIn("4 login activity records", output)
+        self.assertEqual(LoginActivity.objects.count(), 7)
+
+    def test_default_retention_setting(self):
+        with self.settings(LOGIN_ACTIVITY_RETENTION_DAYS=365):
+            self._purge()
+        self.assertEqual(LoginActivity.objects.count(), 6)
+
+
+class LoginActivityPartitionsCommandTests(TestCase):
+    @skipIf(connection.vendor == "postgresql", "Checks the refusal on other databases.")
+    def test_requires_postgresql(self):
+        with self.assertRaisesMessage(CommandError, "requires PostgreSQL"):
+            call_command("login_activity_partitions", "--convert", stdout=StringIO())
+
+    def test_month_arithmetic(self):
+        self.assertEqual(add_months(date(2025, 11, 1), 3), date(2026, 2, 1))
+        self.assertEqual(add_months(date(2025, 1, 1), -1), date(2024, 12, 1))
+        self.assertEqual(partition_name(date(2025, 2, 1)), "accounts_loginactivity_p202502")
+
+
+# CI runs on SQLite: run this with DATABASE_URL pointing at PostgreSQL.
+@skipUnless(connection.vendor == "postgresql", "Partitioning requires PostgreSQL.")
+class LoginActivityPartitionsTests(TestCase):
+    def setUp(self):
+        self.user = create_user(email="partitions@example.com")
+        activity_partitions.convert(months_ahead=0, today=date(2026, 1, 15))
+
+    def _activity_at(self, year, month, day=10):
+        return LoginActivity.objects.create(
+            user=self.user,
+            action=LoginActivity.Action.LOGIN,
+            timestamp=datetime(year, month, day, tzinfo=dt_timezone.utc),
+        )
+
+    def _rows_in(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {connection.ops.quote_name(table)}")
+            return cursor.fetchone()[0]
+
+    def test_rows_in_the_default_partition_move_to_the_new_month(self):
+        march = self._activity_at(2026, 3)
+        self.assertEqual(self._rows_in(activity_partitions.DEFAULT_PARTITION), 1)
+
+        created = activity_partitions.ensure_partitions(date(2026, 2, 1), date(2026, 3, 1))
+
+        self.assertEqual(created, [partition_name(date(2026, 2, 1)), partition_name(date(2026, 3, 1))])
+        self.assertEqual(self._rows_in(partition_name(date(2026, 3, 1))), 1)
+        self.assertEqual(self._rows_in(activity_partitions.DEFAULT_PARTITION), 0)
+        self.assertIn(activity_partitions.DEFAULT_PARTITION, activity_partitions.partition_names())
+        self.assertEqual(LoginActivity.objects.get().pk, march.pk)
+
+        self._activity_at(2026, 3, day=20)
+        self._activity_at(2026, 6)
+        self.assertEqual(self._rows_in(partition_name(date(2026, 3, 1))), 2)
+        self.assertEqual(self._rows_in(activity_partitions.DEFAULT_PARTITION), 1)
+
+    def test_existing_partitions_are_kept(self):
+        self.assertEqual(activity_partitions.ensure_partitions(date(2026, 1, 1), date(2026, 1, 1)), [])
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import LoginActivity
+from accounts.tests.helpers import DEFAULT_PASSWORD, authenticate, create_user
+
+
+class UserLoginActivityTimelineTests(TestCase):
+    """
+    /api/auth/users/<id>/activity/: security admins only, newest first, keyset pages.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.security_admin = create_user(email="secadmin@example.com")
+        self.security_admin.groups.add(Group.objects.get_or_create(name="SECURITY_ADMIN")[0])
+        self.target = create_user(email="target@example.com")
+        now = timezone.now()
+        LoginActivity.objects.bulk_create(
+            LoginActivity(
+                user=self.target,
+                action=LoginActivity.Action.LOGIN if i % 3 else LoginActivity.Action.LOGOUT,
+                success=i % 5 != 0,
+                timestamp=now - timedelta(minutes=i),
+            )
+            for i in range(1, 8)
+        )
+        self.url = f"/api/auth/users/{self.target.pk}/activity/"
+
+    def _get(self, url, **params):
+        return self.client.get(url, params)
+
+    def test_requires_security_admin(self):
+        authenticate(self.client, self.target.email, DEFAULT_PASSWORD)
+        response = self._get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_unknown_user_is_404(self):
+        authenticate(self.client, self.security_admin.email, DEFAULT_PASSWORD)
+        response = self._get("/api/auth/users/999999/activity/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_pages_follow_the_cursor_newest_first(self):
+        authenticate(self.client, self.security_admin.email, DEFAULT_PASSWORD)
+
+        response = self._get(self.url, page_size=3)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        payload = response.data["data"]
+        self.assertIsNone(payload["count"])
+        self.assertIsNone(payload["previous"])
+        seen = [row["timestamp"] for row in payload["results"]]
+
+        # A row logged meanwhile does not shift the following pages.
+        LoginActivity.objects.create(user=self.target, action=LoginActivity.Action.LOGIN)
+        while payload["next"]:
+            payload = self.client.get(payload["next"]).data["data"]
+            seen.extend(row["timestamp"] for row in payload["results"])
+
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_page_query_is_keyset(self):
+        authenticate(self.client, self.security_admin.email, DEFAULT_PASSWORD)
+        first = self._get(self.url, page_size=3).data["data"]
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(first["next"])
+        activity_sql = [q["sql"] for q in ctx.captured_queries if 'FROM "accounts_loginactivity"' in q["sql"]]
+        self.assertEqual(len(activity_sql), 1)
+        self.assertIn('"accounts_loginactivity"."timestamp" <', activity_sql[0])
+        self.assertNotIn("OFFSET", activity_sql[0])
+        self.assertNotIn("COUNT(", activity_sql[0])
+
+    def test_filters(self):
+        authenticate(self.client, self.security_admin.email, DEFAULT_PASSWORD)
+
+        logouts = self._get(self.url, action="logout").data["data"]["results"]
+        self.assertEqual({row["action"] for row in logouts}, {"LOGOUT"})
+        self.assertEqual(len(logouts), 2)
+
+        failures = self._get(self.url, success="false").data["data"]["results"]
+        self.assertEqual([row["success"] for row in failures], [False])
@@ -0,0 +1,99 @@
+import time
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.audit import BatchedActivityWriter, record_login_activity
+from accounts.models import LoginActivity, User
+from accounts.tests.helpers import DEFAULT_PASSWORD, create_user, login
+from smarthr360_backend.config import base as base_settings
+
+
+def _activity(user, **kwargs):
+    return LoginActivity(user=user, action=LoginActivity.Action.LOGIN, **kwargs)
+
+
+class BatchedActivityWriterTests(TransactionTestCase):
+    """
+    Records are queued per worker and inserted with bulk_create on size, time and shutdown.
+    """
+
+    def setUp(self):
+        self.user = create_user(email="audit@example.com")
+
+    def _wait_for(self, count, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if LoginActivity.objects.count() >= count:
+                return
+            time.sleep(0.05)
+        self.fail(f"expected {count} LoginActivity rows, found {LoginActivity.objects.count()}")
+
+    def test_flush_writes_the_queue_in_one_insert(self):
+        writer = BatchedActivityWriter(batch_size=100, flush_interval=60, max_queue=1000)
+        for _ in range(3):
+            writer.add(_activity(self.user))
+        self.assertEqual(writer.pending(), 3)
+        self.assertEqual(LoginActivity.objects.count(), 0)
+
+        self.assertEqual(writer.flush(), 3)
+        self.assertEqual(writer.pending(), 0)
+        self.assertEqual(LoginActivity.objects.count(), 3)
+
+    def test_batch_size_wakes_the_writer(self):
+        writer = BatchedActivityWriter(batch_size=2, flush_interval=60, max_queue=1000)
+        writer.add(_activity(self.user))
+        writer.add(_activity(self.user))
+        self._wait_for(2)
+
+    def test_interval_flushes_a_partial_batch(self):
+        writer = BatchedActivityWriter(batch_size=100, flush_interval=0.1, max_queue=1000)
+        writer.add(_activity(self.user))
+        self._wait_for(1)
+
+    def test_full_queue_flushes_in_the_caller(self):
+        writer = BatchedActivityWriter(batch_size=100, flush_interval=60, max_queue=2)
+        writer.add(_activity(self.user))
+        writer.add(_activity(self.user))
+        self.assertEqual(writer.pending(), 0)
+        self.assertEqual(LoginActivity.objects.count(), 2)
+
+    def test_event_time_is_kept(self):
+        writer = BatchedActivityWriter(batch_size=100, flush_interval=60, max_queue=1000)
+        activity = _activity(self.user)
+        writer.add(activity)
+        writer.flush()
+        self.assertEqual(LoginActivity.objects.get().timestamp, activity.timestamp)
+
+    def test_bad_row_does_not_lose_the_batch(self):
+        other = create_user(email="gone@example.com")
+        writer = BatchedActivityWriter(batch_size=100, flush_interval=60, max_queue=1000)
+        writer.add(_activity(self.user))
+        writer.add(_activity(other))
+        User.objects.filter(pk=other.pk).delete()
+
+        with self.assertLogs("accounts.audit", level="ERROR"):
+            self.assertEqual(writer.flush(), 1)
+        self.assertEqual(LoginActivity.objects.get().user, self.user)
+
+
+class RecordLoginActivityTests(TestCase):
+    def setUp(self):
+        self.user = create_user(email="audit-sync@example.com")
+
+    def test_synchronous_by_default(self):
+        # Off in base.py; the production settings turn it on.
+        self.assertFalse(base_settings.LOGIN_ACTIVITY_ASYNC)
+
+    @override_settings(LOGIN_ACTIVITY_ASYNC=False)
+    def test_synchronous_when_off(self):
+        record_login_activity(self.user, LoginActivity.Action.LOGOUT, success=True)
+        self.assertEqual(LoginActivity.objects.get().action, LoginActivity.Action.LOGOUT)
+
+    @override_settings(LOGIN_ACTIVITY_ASYNC=True)
+    def test_async_login_is_queued_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = login(APIClient(), self.user.email, DEFAULT_PASSWORD)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(LoginActivity.objects.count(), 0)
+        self.assertEqual(len(callbacks), 1)
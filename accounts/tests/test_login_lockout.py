@@ -0,0 +1,98 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.lockout import CacheLockoutBackend
+from accounts.models import LoginAttempt
+from accounts.tests.helpers import DEFAULT_PASSWORD, create_user, login
+
+
+@override_settings(CACHE_SHARED=True, LOGIN_LOCKOUT_BACKEND="accounts.lockout.CacheLockoutBackend")
+class CacheLockoutBackendTests(TestCase):
+    """
+    Failure counters in the cache; LoginAttempt written only when a lock begins or ends.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user(email="lockout@example.com")
+        self.attempt = LoginAttempt.objects.get(user=self.user)
+
+    def _fail(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = login(self.client, self.user.email, "WrongPass!", expect_success=False)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        writes = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "accounts_loginattempt"')]
+        return response, writes
+
+    def _counter(self):
+        return cache.get(CacheLockoutBackend()._key(self.attempt))
+
+    def test_failures_below_the_limit_stay_in_the_cache(self):
+        for expected in range(1, LoginAttempt.MAX_ATTEMPTS):
+            response, writes = self._fail()
+            self.assertEqual(writes, [])
+            self.assertEqual(self._counter(), expected)
+            self.assertIn(f"Tentatives restantes: {LoginAttempt.MAX_ATTEMPTS - expected}", str(response.data))
+
+        self.attempt.refresh_from_db()
+        self.assertEqual(self.attempt.failed_attempts, 0)
+
+    def test_lock_is_persisted_when_it_begins(self):
+        for _ in range(LoginAttempt.MAX_ATTEMPTS - 1):
+            self._fail()
+        _, writes = self._fail()
+
+        self.assertEqual(len(writes), 1)
+        self.attempt.refresh_from_db()
+        self.assertTrue(self.attempt.is_locked)
+        self.assertEqual(self.attempt.failed_attempts, LoginAttempt.MAX_ATTEMPTS)
+        self.assertIsNone(self._counter())
+
+        response = login(self.client, self.user.email, DEFAULT_PASSWORD, expect_success=False)
+        self.assertIn("Compte verrouillé", str(response.data))
+
+    def test_failures_spaced_beyond_the_lock_duration_still_lock(self):
+        start = time.time()
+        for i in range(LoginAttempt.MAX_ATTEMPTS):
+            later = start + i * (LoginAttempt.LOCKOUT_MINUTES * 60 + 1)
+            with mock.patch("time.time", return_value=later):
+                self._fail()
+
+        self.attempt.refresh_from_db()
+        self.assertTrue(self.attempt.is_locked)
+
+    def test_expired_lock_is_cleared_when_it_ends(self):
+        LoginAttempt.objects.filter(pk=self.attempt.pk).update(
+            failed_attempts=LoginAttempt.MAX_ATTEMPTS,
+            is_locked=True,
+            locked_until=timezone.now() - timedelta(minutes=1),
+        )
+
+        response = login(self.client, self.user.email, DEFAULT_PASSWORD, expect_success=False)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.attempt.refresh_from_db()
+        self.assertFalse(self.attempt.is_locked)
+        self.assertEqual(self.attempt.failed_attempts, 0)
+
+    def test_success_clears_the_counter(self):
+        self._fail()
+        login(self.client, self.user.email, DEFAULT_PASSWORD)
+
+        self.assertIsNone(self._counter())
+
+    @override_settings(CACHE_SHARED=False)
+    def test_refused_without_a_shared_cache(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "CACHE_SHARED"):
+            CacheLockoutBackend()
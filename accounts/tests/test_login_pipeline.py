@@ -0,0 +1,82 @@
+from axes.models import AccessAttempt
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import LoginActivity, LoginAttempt
+from accounts.tests.helpers import DEFAULT_PASSWORD, create_user, login
+
+
+# Audit rows are read right after the request: write them synchronously.
+@override_settings(LOGIN_ACTIVITY_ASYNC=False)
+class LoginPipelineTests(TestCase):
+    """
+    Single-pass login: one user lookup, one password check, one audit transaction.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email="pipeline@example.com")
+
+    def _login_queries(self, password):
+        with CaptureQueriesContext(connection) as ctx:
+            response = login(self.client, self.user.email, password, expect_success=False)
+        return response, [query["sql"] for query in ctx.captured_queries]
+
+    def test_user_and_lockout_state_are_fetched_together(self):
+        response, queries = self._login_queries(DEFAULT_PASSWORD)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user_queries = [sql for sql in queries if 'FROM "accounts_user"' in sql]
+        self.assertEqual(len(user_queries), 1)
+        self.assertIn('"accounts_loginattempt"', user_queries[0])
+
+    def test_clean_success_does_not_write_login_attempt(self):
+        response, queries = self._login_queries(DEFAULT_PASSWORD)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([sql for sql in queries if sql.startswith('UPDATE "accounts_loginattempt"')])
+        self.assertEqual(LoginActivity.objects.filter(user=self.user, success=True).count(), 1)
+
+    def test_failure_updates_lockout_axes_and_activity(self):
+        response, queries = self._login_queries("WrongPass!")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Tentatives restantes: 4", str(response.data))
+        attempt = LoginAttempt.objects.get(user=self.user)
+        self.assertEqual(attempt.failed_attempts, 1)
+        self.assertEqual(AccessAttempt.objects.get(username=self.user.email).failures_since_start, 1)
+        activity = LoginActivity.objects.get(user=self.user)
+        self.assertEqual(activity.extra_data["reason"], "invalid_password")
+
+        # Only the lockout columns are written.
+        update = next(sql for sql in queries if sql.startswith('UPDATE "accounts_loginattempt"'))
+        self.assertNotIn('"user_id"', update)
+
+    def test_success_after_failure_resets_counter(self):
+        login(self.client, self.user.email, "WrongPass!", expect_success=False)
+        login(self.client, self.user.email, DEFAULT_PASSWORD)
+
+        attempt = LoginAttempt.objects.get(user=self.user)
+        self.assertEqual(attempt.failed_attempts, 0)
+
+    def test_axes_lockout_is_still_enforced(self):
+        for _ in range(LoginAttempt.MAX_ATTEMPTS):
+            login(self.client, self.user.email, "WrongPass!", expect_success=False)
+
+        # Clearing our own counter leaves the axes lock in place.
+        LoginAttempt.objects.filter(user=self.user).update(failed_attempts=0, is_locked=False, locked_until=None)
+        response = login(self.client, self.user.email, DEFAULT_PASSWORD, expect_success=False)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Réessayez plus tard", str(response.data))
+        self.assertEqual(LoginActivity.objects.filter(user=self.user).last().extra_data, {"reason": "axes_locked"})
+
+    def test_inactive_user_is_refused(self):
+        self.user.is_active = False
+        self.user.save()
+
+        response = login(self.client, self.user.email, DEFAULT_PASSWORD, expect_success=False)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,175 @@
+import json
+import sqlite3
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.test import TestCase
+
+from accounts.management.commands.migrate_prediction_users import SOURCE_ALIAS
+from accounts.models import LoginAttempt, User
+
+SOURCE_SCHEMA = """
+    CREATE TABLE auth_user (
+        id INTEGER PRIMARY KEY, username TEXT, email TEXT, first_name TEXT, last_name TEXT,
+        is_active BOOLEAN, is_staff BOOLEAN, is_superuser BOOLEAN,
+        last_login TEXT, date_joined TEXT, password TEXT
+    );
+    CREATE TABLE auth_group (id INTEGER PRIMARY KEY, name TEXT);
+    CREATE TABLE auth_user_groups (id INTEGER PRIMARY KEY, user_id INTEGER, group_id INTEGER);
+    INSERT INTO auth_group VALUES (1, 'DRH'), (2, 'MANAGER'), (3, 'OTHER');
+"""
+
+
+class MigratePredictionUsersTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.source_path = Path(self.tmp.name) / "source.sqlite3"
+        self.checkpoint = Path(self.tmp.name) / "checkpoint.json"
+
+        source = sqlite3.connect(self.source_path)
+        source.executescript(SOURCE_SCHEMA)
+        users = [
+            (1, "alice", "Alice@Example.com", "Alice", "A", 1, 0, 0, "2025-01-02 10:00:00"),
+            (2, "bob", "bob@example.com", "Bob", "B", 1, 0, 0, None),
+            # Older duplicate of alice's address: dropped.
+            (3, "alice-old", "alice@example.com", "Old", "A", 0, 0, 0, None),
+            (4, "nomail", "", "No", "Mail", 1, 0, 0, None),
+            (5, "root", "root@example.com", "Root", "R", 1, 1, 1, None),
+            (6, "existing", "existing@example.com", "Ex", "Isting", 1, 0, 0, None),
+        ]
+        source.executemany(
+            "INSERT INTO auth_user VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, '2024-06-01 09:00:00', 'pbkdf2_sha256$x')",
+            users,
+        )
+        source.executemany(
+            "INSERT INTO auth_user_groups (user_id, group_id) VALUES (?, ?)",
+            [(1, 1), (1, 3), (2, 2)],
+        )
+        source.commit()
+        source.close()
+        self.addCleanup(self._drop_source_alias)
+
+        self.existing = User.objects.create_user(
+            email="existing@example.com",
+            username="alice",
+            password="ExistingPass123!",
+        )
+
+    def _drop_source_alias(self):
+        if SOURCE_ALIAS in connections.settings:
+            connections[SOURCE_ALIAS].close()
+            del connections[SOURCE_ALIAS]
+            del connections.settings[SOURCE_ALIAS]
+
+    def migrate(self, *extra):
+        out = StringIO()
+        # The command registers the source database itself, after test setup.
+        with mock.patch.object(type(self), "databases", {"default", SOURCE_ALIAS}):
+            call_command(
+                "migrate_prediction_users",
+                "--source-url",
+                f"sqlite:///{self.source_path}",
+                "--chunk-size",
+                "2",
+                *extra,
+                stdout=out,
+            )
+        return out.getvalue()
+
+    def test_dry_run_writes_nothing(self):
+        output = self.migrate()
+
+        self.assertIn("Migration summary (DRY-RUN)", output)
+        self.assertIn("- Created: 4", output)
+        self.assertIn("- Duplicate emails: 1", output)
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_apply_creates_users_with_groups_and_login_attempts(self):
+        output = self.migrate("--apply", "--mark-verified")
+
+        self.assertIn("- Created: 4", output)
+        self.assertIn("- Skipped (existing): 1", output)
+        self.assertIn("4/5 users", output)
+
+        alice = User.objects.get(email="alice@example.com")
+        self.assertEqual(alice.first_name, "Alice")
+        self.assertEqual(alice.role, User.Role.HR)
+        # "alice" is taken by the existing user.
+        self.assertEqual(alice.username, "alice-1")
+        self.assertTrue(alice.is_email_verified)
+        self.assertEqual(alice.password, "pbkdf2_sha256$x")
+        self.assertEqual(set(alice.groups.values_list("name", flat=True)), {"HR"})
+
+        bob = User.objects.get(email="bob@example.com")
+        self.assertEqual(bob.role, User.Role.MANAGER)
+        self.assertEqual(set(bob.groups.values_list("name", flat=True)), {"MANAGER"})
+
+        root = User.objects.get(email="root@example.com")
+        self.assertEqual(root.role, User.Role.ADMIN)
+        self.assertFalse(root.groups.exists())
+
+        self.assertTrue(User.objects.filter(email="nomail@placeholder.local").exists())
+        self.assertEqual(LoginAttempt.objects.filter(user__email__endswith="example.com").count(), 4)
+
+    def test_update_existing(self):
+        self.migrate("--apply", "--update-existing")
+
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.first_name, "Ex")
+        self.assertEqual(self.existing.password, "pbkdf2_sha256$x")
+        self.assertEqual(set(self.existing.groups.values_list("name", flat=True)), {"EMPLOYEE"})
+
+    def test_checkpoint_and_resume(self):
+        self.migrate("--apply", "--checkpoint", str(self.checkpoint))
+        self.assertEqual(json.loads(self.checkpoint.read_text())["last_source_id"], 6)
+
+        # Pretend the run stopped after the first chunk (source ids 1 and 2).
+        User.objects.exclude(email__in=["existing@example.com", "alice@example.com", "bob@example.com"]).delete()
+        self.checkpoint.write_text(json.dumps({"last_source_id": 2}))
+
+        output = self.migrate("--apply", "--checkpoint", str(self.checkpoint), "--resume")
+
+        self.assertIn("Resuming after source user id 2.", output)
+        self.assertIn("- Created: 2", output)
+        self.assertEqual(User.objects.count(), 5)
+
+    def _add_source_user(self, *row):
+        source = sqlite3.connect(self.source_path)
+        source.execute(
+            "INSERT INTO auth_user VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, '2024-06-01 09:00:00', 'pbkdf2_sha256$y')",
+            row,
+        )
+        source.commit()
+        source.close()
+
+    def test_match_username_finds_users_created_in_the_same_run(self):
+        self._add_source_user(7, "BOB", "bob2@example.com", "Robert", "B", 1, 0, 0, None)
+
+        # Chunks of 2 put bob and BOB in different chunks, one chunk holds both.
+        for chunk_size in ("2", "100"):
+            with self.subTest(chunk_size=chunk_size):
+                with transaction.atomic():
+                    output = self.migrate("--apply", "--match-username", "--chunk-size", chunk_size)
+
+                    self.assertIn("- Skipped (existing): 3", output)  # alice, existing, BOB
+                    self.assertFalse(User.objects.filter(email="bob2@example.com").exists())
+                    self.assertEqual(User.objects.filter(username__iexact="bob").count(), 1)
+                    transaction.set_rollback(True)
+
+    def test_match_username_updates_users_created_in_the_same_run(self):
+        self._add_source_user(7, "BOB", "bob2@example.com", "Robert", "B", 1, 0, 0, None)
+
+        for chunk_size in ("2", "100"):
+            with self.subTest(chunk_size=chunk_size):
+                with transaction.atomic():
+                    self.migrate("--apply", "--match-username", "--update-existing", "--chunk-size", chunk_size)
+
+                    bob = User.objects.get(username__iexact="bob")
+                    self.assertEqual(bob.email, "bob@example.com")
+                    self.assertEqual(bob.first_name, "Robert")
+                    transaction.set_rollback(True)
@@ -0,0 +1,99 @@
+import asyncio
+from unittest import mock
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts import hashing
+from accounts.models import User
+from accounts.tests.helpers import DEFAULT_PASSWORD, create_user, login
+
+
+@override_settings(PASSWORD_HASH_POOL=True, PASSWORD_HASH_WORKERS=2)
+class HashingPoolTests(APITestCase):
+    def setUp(self):
+        hashing.reset_pool()
+        self.addCleanup(hashing.reset_pool)
+
+    def test_set_and_check_password_in_pool(self):
+        user = User(email="pool@example.com")
+        hashing.set_password(user, "Pool-Pass123")
+
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+        self.assertEqual(user._password, "Pool-Pass123")
+        self.assertTrue(hashing.check_password(user, "Pool-Pass123"))
+        self.assertFalse(hashing.check_password(user, "wrong-Pass123"))
+        self.assertEqual(hashing.get_pool().pending(), 0)
+
+    def test_outdated_hash_is_upgraded(self):
+        user = create_user(email="old-hash@example.com")
+        user.password = PBKDF2PasswordHasher().encode(DEFAULT_PASSWORD, "oldsalt", iterations=1000)
+        user.save(update_fields=["password"])
+
+        self.assertTrue(hashing.check_password(user, DEFAULT_PASSWORD))
+
+        user.refresh_from_db()
+        self.assertNotIn("$1000$", user.password)
+        self.assertTrue(user.check_password(DEFAULT_PASSWORD))
+
+    def test_async_api(self):
+        user = User(email="async@example.com")
+
+        async def scenario():
+            await hashing.aset_password(user, "Async-Pass123")
+            return await hashing.acheck_password(user, "Async-Pass123"), await hashing.acheck_password(user, "no")
+
+        self.assertEqual(asyncio.run(scenario()), (True, False))
+
+    def test_warm_up_starts_the_processes(self):
+        self.assertEqual(hashing.warm_up(), 2)
+        self.assertEqual(hashing.get_pool().pending(), 0)
+
+    def test_hash_passwords_in_order(self):
+        passwords = ["first-Pass1", "second-Pass2", "third-Pass3"]
+        hashes = hashing.hash_passwords(passwords)
+
+        user = User(email="hash@example.com")
+        for password, encoded in zip(passwords, hashes, strict=True):
+            user.password = encoded
+            self.assertTrue(user.check_password(password))
+
+    def test_login_and_change_password_through_pool(self):
+        user = create_user(email="pool-login@example.com")
+        resp = login(self.client, user.email, DEFAULT_PASSWORD)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {resp.data['data']['tokens']['access']}")
+
+        resp = self.client.post(
+            "/api/auth/change-password/",
+            {"old_password": DEFAULT_PASSWORD, "new_password": "Changed-Pass123"},
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.check_password("Changed-Pass123"))
+
+
+class HashingBackpressureTests(APITestCase):
+    def setUp(self):
+        # A pool whose only slot is taken: nothing is ever submitted to a process.
+        self.pool = hashing.HashingPool(workers=1, max_pending=1, queue_timeout=0.01)
+        self.pool._slots.acquire()
+
+    def test_full_pool_raises_busy(self):
+        with self.assertRaises(hashing.HashingBusy):
+            self.pool.submit(len, "x")
+        with self.assertRaises(hashing.HashingBusy):
+            asyncio.run(self.pool.arun(len, "x"))
+
+    @override_settings(PASSWORD_HASH_POOL=True)
+    def test_login_gets_503_when_pool_is_full(self):
+        user = create_user(email="storm@example.com")
+
+        with mock.patch("accounts.hashing.get_pool", return_value=self.pool):
+            resp = login(self.client, user.email, DEFAULT_PASSWORD, expect_success=False)
+
+        self.assertEqual(resp.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(resp.data["detail"].code, "hashing_busy")
@@ -0,0 +1,148 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts import revocation
+from accounts.tests.helpers import DEFAULT_PASSWORD, create_user, extract_tokens, login
+from accounts.tokens import RefreshToken
+
+REFRESH_URL = "/api/auth/refresh/"
+
+
+class RefreshRotationTests(TestCase):
+    """
+    Rotation keeps refusing reused tokens, with fewer queries.
+    """
+
+    def setUp(self):
+        revocation.reset_filter()
+        self.addCleanup(revocation.reset_filter)
+        self.client = APIClient()
+        self.user = create_user(email="rotation@example.com")
+        _, self.refresh = extract_tokens(login(self.client, self.user.email, DEFAULT_PASSWORD))
+
+    def _refresh(self, token):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(REFRESH_URL, {"refresh": token}, format="json")
+        return response, [q["sql"] for q in ctx.captured_queries]
+
+    def test_rotated_token_cannot_be_reused(self):
+        response, _ = self._refresh(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        _, new_refresh = extract_tokens(response)
+        self.assertTrue(BlacklistedToken.objects.filter(token__token=self.refresh).exists())
+
+        reused, _ = self._refresh(self.refresh)
+        self.assertEqual(reused.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self._refresh(new_refresh)[0].status_code, status.HTTP_200_OK)
+
+    def test_refresh_does_not_fetch_the_user_again(self):
+        _, queries = self._refresh(self.refresh)
+        self.assertEqual(len([sql for sql in queries if 'FROM "accounts_user"' in sql]), 1)
+
+    @override_settings(JWT_REVOCATION_FILTER=True)
+    def test_filter_skips_the_blacklist_lookup(self):
+        revocation.get_filter().sync_if_due()  # initial load, once per process
+        response, queries = self._refresh(self.refresh)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([sql for sql in queries if sql.startswith("SELECT") and "blacklistedtoken" in sql])
+
+    @override_settings(JWT_REVOCATION_FILTER=True)
+    def test_known_revoked_token_is_refused_without_queries(self):
+        self._refresh(self.refresh)
+        self.assertTrue(revocation.get_filter().contains(RefreshToken(self.refresh, verify=False)["jti"]))
+
+        response, queries = self._refresh(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(queries, [])
+
+    @override_settings(JWT_REVOCATION_FILTER=True)
+    def test_stale_filter_still_refuses_reuse(self):
+        self._refresh(self.refresh)
+        # Another worker: its filter has not seen the blacklist entry yet.
+        revocation.reset_filter()
+        revocation.get_filter().sync_if_due()
+        revocation.get_filter()._expiry.clear()
+
+        response, _ = self._refresh(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(JWT_REVOCATION_FILTER=True)
+    def test_logged_out_token_is_refused(self):
+        access, _ = extract_tokens(login(self.client, self.user.email, DEFAULT_PASSWORD))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(
+            self.client.post("/api/auth/logout/", {"refresh": self.refresh}, format="json").status_code,
+            status.HTTP_200_OK,
+        )
+        self.client.credentials()
+
+        self.assertEqual(self._refresh(self.refresh)[0].status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def test_untracked_token_is_recorded_when_blacklisted(self):
+        OutstandingToken.objects.filter(token=self.refresh).delete()
+        token = RefreshToken(self.refresh)
+
+        token.blacklist()
+        outstanding = OutstandingToken.objects.get(jti=token["jti"])
+        self.assertEqual(outstanding.user_id, self.user.pk)
+        self.assertTrue(BlacklistedToken.objects.filter(token=outstanding).exists())
+
+class RevocationFilterSyncTests(TestCase):
+    def setUp(self):
+        self.user = create_user(email="sync@example.com")
+
+    def _outstanding(self, jti, expires_in):
+        return OutstandingToken.objects.create(
+            user=self.user, jti=jti, token=jti, expires_at=timezone.now() + expires_in
+        )
+
+    def test_incremental_and_full_sync(self):
+        revoked_filter = revocation.RevocationFilter(sync_interval=0)
+        # bulk_create bypasses the post_save feed, like writes from other workers.
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=self._outstanding("a", timedelta(days=1)))])
+        self.assertTrue(revoked_filter.contains("a"))
+
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=self._outstanding("b", timedelta(days=1)))])
+        self.assertEqual(revoked_filter.sync(), 1)
+        self.assertTrue(revoked_filter.contains("b"))
+        self.assertFalse(revoked_filter.contains("c"))
+
+    def test_expired_tokens_are_dropped(self):
+        revoked_filter = revocation.RevocationFilter(sync_interval=60)
+        revoked_filter.add("old", timezone.now() - timedelta(seconds=1))
+        revoked_filter.add("live", timezone.now() + timedelta(days=1))
+        revoked_filter.sync(full=True)
+
+        self.assertEqual(len(revoked_filter), 1)
+        self.assertFalse(revoked_filter.contains("old"))
+
+
+class PurgeExpiredTokensCommandTests(TestCase):
+    def test_deletes_expired_tokens_in_batches(self):
+        user = create_user(email="purge@example.com")
+        now = timezone.now()
+        for index in range(5):
+            token = OutstandingToken.objects.create(
+                user=user, jti=f"expired-{index}", token="x", expires_at=now - timedelta(hours=1)
+            )
+            if index % 2:
+                BlacklistedToken.objects.create(token=token)
+        OutstandingToken.objects.create(user=user, jti="live", token="x", expires_at=now + timedelta(days=1))
+
+        out = StringIO()
+        call_command("purge_expired_tokens", "--batch-size", "2", stdout=out)
+
+        self.assertIn("Deleted 5 expired tokens (2 of them blacklisted)", out.getvalue())
+        self.assertEqual(list(OutstandingToken.objects.values_list("jti", flat=True)), ["live"])
+        self.assertFalse(BlacklistedToken.objects.exists())
@@ -0,0 +1,80 @@
+"""
+Refresh token with fewer blacklist queries.
+
+``rest_framework_simplejwt``'s ``RefreshToken`` looks the blacklist up on every
+verification. It fetches the user again in ``blacklist()`` and ``outstand()``,
+and it uses ``get_or_create`` for every row. This subclass:
+
+- consults the in-memory revocation filter (see ``accounts.revocation``) when
+  it is enabled and refresh tokens are blacklisted on rotation;
+- blacklists with a single INSERT, which fails (``TokenError``) when the token
+  was already blacklisted: concurrent reuse of a rotated token is refused even
+  when the filter has not seen it yet;
+- records outstanding tokens with one INSERT, using the user id from the payload.
+"""
+
+from __future__ import annotations
+
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from . import revocation
+
+
+class RefreshToken(BaseRefreshToken):
+    def check_blacklist(self) -> None:
+        if not revocation.is_enabled():
+            super().check_blacklist()
+            return
+
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if revocation.get_filter().contains(jti):
+            raise TokenError(_("Token is blacklisted"))
+        # A miss is authoritative only when the token is blacklisted right after
+        # use (refresh with rotation, logout): that INSERT then detects reuse.
+        if not (api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION):
+            super().check_blacklist()
+
+    def blacklist(self) -> BlacklistedToken:
+        jti = self.payload[api_settings.JTI_CLAIM]
+        outstanding = OutstandingToken.objects.filter(jti=jti).first()
+        if outstanding is None:
+            # Issued before the outstanding list was kept (or flushed since).
+            outstanding, _created = OutstandingToken.objects.get_or_create(
+                jti=jti,
+                defaults={
+                    "user_id": self.payload.get(api_settings.USER_ID_CLAIM),
+                    "created_at": self.current_time,
+                    "token": str(self),
+                    "expires_at": datetime_from_epoch(self.payload["exp"]),
+                },
+            )
+
+        try:
+            with transaction.atomic():
+                blacklisted = BlacklistedToken.objects.create(token=outstanding)
+        except IntegrityError:
+            if revocation.is_enabled():
+                revocation.get_filter().add(jti, outstanding.expires_at)
+            raise TokenError(_("Token is blacklisted")) from None
+        return blacklisted
+
+    def outstand(self) -> None:
+        """Record this token as outstanding: one INSERT, a row with the same jti is kept."""
+        OutstandingToken.objects.bulk_create(
+            [
+                OutstandingToken(
+                    jti=self.payload[api_settings.JTI_CLAIM],
+                    user_id=self.payload.get(api_settings.USER_ID_CLAIM),
+                    created_at=self.current_time,
+                    token=str(self),
+                    expires_at=datetime_from_epoch(self.payload["exp"]),
+                )
+            ],
+            ignore_conflicts=True,
+        )
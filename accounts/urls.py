@@ -1,27 +1,35 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from smarthr360_backend.async_views import read_view
+
 from .views import (
+    AsyncMeView,
     ChangePasswordView,  # ⬅️ NEW
     EmailVerificationView,
     LoginView,
     LogoutView,  # ⬅️ NEW
-    MeView,
     PasswordResetView,
     RegisterView,
     RequestEmailVerificationView,
     RequestPasswordResetView,
+    UserBulkProvisionView,
+    UserBulkRoleView,
     UserListView,
+    UserLoginActivityListView,
 )
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="auth-register"),
     path("login/", LoginView.as_view(), name="auth-login"),
     path("refresh/", TokenRefreshView.as_view(), name="auth-refresh"),
-    path("me/", MeView.as_view(), name="auth-me"),
+    path("me/", read_view(AsyncMeView), name="auth-me"),
 
     # New: list all users (HR & Admin only)
     path("users/", UserListView.as_view(), name="auth-user-list"),
+    path("users/bulk/", UserBulkProvisionView.as_view(), name="auth-user-bulk-provision"),
+    path("users/role/", UserBulkRoleView.as_view(), name="auth-user-bulk-role"),
+    path("users/<int:pk>/activity/", UserLoginActivityListView.as_view(), name="auth-user-activity"),
 
     path("change-password/", ChangePasswordView.as_view(), name="auth-change-password"),
     path("logout/", LogoutView.as_view(), name="auth-logout"),
@@ -1,29 +1,28 @@
 # accounts/views.py (updated with ApiResponseMixin)
 
+from django.db import IntegrityError
+from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from smarthr360_backend.api_mixins import ApiResponseMixin
+from smarthr360_backend.api_mixins import ApiResponseMixin, ReplicaReadMixin
+from smarthr360_backend.async_views import AsyncReadView
+from smarthr360_backend.docs import schema
+from smarthr360_backend.pagination import TimelinePagination
 
+from .audit import record_login_activity
 from .models import LoginActivity, User
-from .permissions import IsHRRole, IsHRRoleOrSupport
-from .schemas import (
-    change_password_schema,
-    email_verification_schema,
-    login_schema,
-    logout_schema,
-    me_schema,
-    password_reset_schema,
-    register_schema,
-    request_email_verification_schema,
-    request_password_reset_schema,
-    user_list_schema,
-)
+from .permissions import IsAdminRole, IsHRRole, IsHRRoleOrSupport, IsSecurityAdmin
+from .provisioning import provision_users
+from .roles import reassign_role
 from .serializers import (
+    BulkRoleChangeSerializer,
+    BulkUserProvisionSerializer,
     ChangePasswordSerializer,
     EmailVerificationSerializer,
+    LoginActivitySerializer,
     LoginSerializer,
     LogoutSerializer,
     PasswordResetSerializer,
@@ -32,6 +31,7 @@ from .serializers import (
     RequestPasswordResetSerializer,
     UserSerializer,
 )
+from .tokens import RefreshToken
 
 
 def get_tokens_for_user(user: User):
@@ -42,7 +42,7 @@ def get_tokens_for_user(user: User):
     }
 
 
-@register_schema
+@schema("accounts.schemas.register_schema")
 class RegisterView(ApiResponseMixin, generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
@@ -59,7 +59,7 @@ class RegisterView(ApiResponseMixin, generics.CreateAPIView):
         return Response(payload, status=status.HTTP_201_CREATED)
 
 
-@login_schema
+@schema("accounts.schemas.login_schema")
 class LoginView(ApiResponseMixin, APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -74,7 +74,7 @@ class LoginView(ApiResponseMixin, APIView):
         }, status=status.HTTP_200_OK)
 
 
-@change_password_schema
+@schema("accounts.schemas.change_password_schema")
 class ChangePasswordView(ApiResponseMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -85,7 +85,7 @@ class ChangePasswordView(ApiResponseMixin, APIView):
         return Response({"detail": "Mot de passe modifié avec succès."}, status=200)
 
 
-@logout_schema
+@schema("accounts.schemas.logout_schema")
 class LogoutView(ApiResponseMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -94,9 +94,9 @@ class LogoutView(ApiResponseMixin, APIView):
         serializer.is_valid(raise_exception=True)
         serializer.save()
 
-        LoginActivity.objects.create(
-            user=request.user,
-            action=LoginActivity.Action.LOGOUT,
+        record_login_activity(
+            request.user,
+            LoginActivity.Action.LOGOUT,
             success=True,
             ip_address=request.META.get("REMOTE_ADDR"),
             user_agent=request.META.get("HTTP_USER_AGENT", ""),
@@ -105,7 +105,7 @@ class LogoutView(ApiResponseMixin, APIView):
         return Response({"detail": "Déconnexion réussie."}, status=200)
 
 
-@me_schema
+@schema("accounts.schemas.me_schema")
 class MeView(ApiResponseMixin, generics.RetrieveAPIView):
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -114,14 +114,85 @@ class MeView(ApiResponseMixin, generics.RetrieveAPIView):
         return self.request.user
 
 
-@user_list_schema
-class UserListView(ApiResponseMixin, generics.ListAPIView):
+class AsyncMeView(AsyncReadView):
+    sync_view = MeView
+
+    async def read(self, request):
+        return self.success_response(UserSerializer(request.user).data)
+
+
+@schema("accounts.schemas.user_list_schema")
+class UserListView(ReplicaReadMixin, ApiResponseMixin, generics.ListAPIView):
     queryset = User.objects.all().order_by("email")
     serializer_class = UserSerializer
     permission_classes = [IsHRRoleOrSupport]
 
 
-@request_password_reset_schema
+@schema("accounts.schemas.user_bulk_provision_schema")
+class UserBulkProvisionView(ApiResponseMixin, APIView):
+    permission_classes = [IsHRRole]
+
+    def post(self, request):
+        serializer = BulkUserProvisionSerializer(data=request.data, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+        try:
+            result = provision_users(
+                serializer.validated_data["users"],
+                send_invites=serializer.validated_data["send_invites"],
+            )
+        except IntegrityError:
+            # An e-mail or username was taken between the check and the insert.
+            raise ValidationError({"detail": "Un des utilisateurs existe déjà ; réessayez."}) from None
+        return Response(
+            {
+                "created": len(result.users),
+                "invited": result.invited,
+                "users": UserSerializer(result.users, many=True).data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+@schema("accounts.schemas.user_bulk_role_schema")
+class UserBulkRoleView(ApiResponseMixin, APIView):
+    permission_classes = [IsAdminRole]
+
+    def post(self, request):
+        serializer = BulkRoleChangeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        role = serializer.validated_data["role"]
+        result = reassign_role(serializer.validated_data["user_ids"], role)
+        return Response(
+            {
+                "role": role,
+                "matched": result.matched,
+                "changed": result.changed,
+                "not_found": result.not_found,
+            },
+            status=200,
+        )
+
+
+@schema("accounts.schemas.user_login_activity_schema")
+class UserLoginActivityListView(ApiResponseMixin, generics.ListAPIView):
+    serializer_class = LoginActivitySerializer
+    permission_classes = [IsSecurityAdmin]
+    pagination_class = TimelinePagination
+
+    def get_queryset(self):
+        user = get_object_or_404(User.objects.only("pk"), pk=self.kwargs["pk"])
+        queryset = LoginActivity.objects.filter(user=user)
+
+        action = self.request.query_params.get("action")
+        if action:
+            queryset = queryset.filter(action=action.upper())
+        success = self.request.query_params.get("success")
+        if success in ("true", "false"):
+            queryset = queryset.filter(success=success == "true")
+        return queryset
+
+
+@schema("accounts.schemas.request_password_reset_schema")
 class RequestPasswordResetView(ApiResponseMixin, APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -139,7 +210,7 @@ class RequestPasswordResetView(ApiResponseMixin, APIView):
         return Response(data, status=200)
 
 
-@password_reset_schema
+@schema("accounts.schemas.password_reset_schema")
 class PasswordResetView(ApiResponseMixin, APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -150,7 +221,7 @@ class PasswordResetView(ApiResponseMixin, APIView):
         return Response({"detail": "Mot de passe réinitialisé avec succès."}, status=200)
 
 
-@request_email_verification_schema
+@schema("accounts.schemas.request_email_verification_schema")
 class RequestEmailVerificationView(ApiResponseMixin, APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -170,7 +241,7 @@ class RequestEmailVerificationView(ApiResponseMixin, APIView):
         return Response(data, status=200)
 
 
-@email_verification_schema
+@schema("accounts.schemas.email_verification_schema")
 class EmailVerificationView(ApiResponseMixin, APIView):
     permission_classes = [permissions.AllowAny]
 
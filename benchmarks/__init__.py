@@ -0,0 +1,6 @@
+"""
+Benchmarks that drive the real URL conf.
+
+Run from the repository root, e.g. ``python -m benchmarks.api_mix --help``.
+See docs/ops/PERFORMANCE.md.
+"""
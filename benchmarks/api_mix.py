@@ -0,0 +1,534 @@
+"""
+Weighted API traffic mix benchmark.
+
+In-process (default): creates a throwaway test database, seeds it with
+``seed_org`` and drives the URL conf through Django's test client, one request
+at a time. This measures the per-request cost of the code (latency, queries).
+
+HTTP (``--url``): sends the same mix to a running server (runserver, gunicorn...)
+from ``--concurrency`` threads, to compare worker / thread configurations. The
+target database must have been seeded with the same ``--employees``, ``--seed``
+and ``--password``.
+
+Results are written as JSON (stdout, or ``--output``); a short table goes to
+stderr. Compare two runs with ``python -m benchmarks.compare``.
+
+    python -m benchmarks.api_mix --requests 2000 --output bench_output.txt
+    python -m benchmarks.api_mix --url http://127.0.0.1:8000 --concurrency 16 --duration 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+DEFAULT_MIX = {
+    "login": 5,
+    "me": 25,
+    "my_team": 10,
+    "reviews_list": 15,
+    "review_detail": 20,
+    "survey_submit": 10,
+    "survey_stats": 5,
+}
+DEFAULT_PASSWORD = "BenchPass123!"
+EMAIL_DOMAIN = "seed.smarthr360.local"
+SERVER_TIMING_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+# ----------------------------------------------------------------------
+# Transports
+# ----------------------------------------------------------------------
+
+
+def _decode(content: bytes):
+    try:
+        return json.loads(content) if content else None
+    except ValueError:
+        return None
+
+
+def _queries(server_timing: str | None) -> int | None:
+    match = SERVER_TIMING_QUERIES_RE.search(server_timing or "")
+    return int(match.group(1)) if match else None
+
+
+class InProcessTransport:
+    """Django test client against the current database (single-threaded)."""
+
+    def __init__(self):
+        from django.test import Client
+
+        self.client = Client(raise_request_exception=False)
+
+    def request(self, method: str, path: str, body=None, token: str | None = None):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else {}
+        data = json.dumps(body) if body is not None else ""
+        response = self.client.generic(method, path, data=data, content_type="application/json", **headers)
+        return response.status_code, _decode(response.content), _queries(response.get("Server-Timing"))
+
+
+class HttpTransport:
+    """Keep-alive HTTP connection to a running server (one per thread)."""
+
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        host = parts.hostname
+        if not host:
+            raise SystemExit(f"--url {base_url!r} has no host.")
+        self.prefix = parts.path.rstrip("/")
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._connect = lambda: connection_class(host, parts.port, timeout=timeout)
+        self.connection: http.client.HTTPConnection | None = None
+
+    def request(self, method: str, path: str, body=None, token: str | None = None):
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Accept": "application/json"}
+        if payload is not None:
+            headers["Content-Type"] = "application/json"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = self._connect()
+            try:
+                self.connection.request(method, self.prefix + path, body=payload, headers=headers)
+                response = self.connection.getresponse()
+                content = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # The server may close idle keep-alive connections: reconnect once.
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+        return response.status, _decode(content), _queries(response.getheader("Server-Timing"))
+
+
+# ----------------------------------------------------------------------
+# Scenario
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class Actor:
+    email: str
+    token: str
+    role: str
+    review_ids: list[int] = field(default_factory=list)
+
+
+@dataclass
+class Context:
+    password: str
+    actors: list[Actor]
+    survey_id: int | None = None
+    questions: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def managers(self) -> list[Actor]:
+        return [actor for actor in self.actors if actor.role == "MANAGER"]
+
+    @property
+    def hr_actors(self) -> list[Actor]:
+        return [actor for actor in self.actors if actor.role in ("HR", "ADMIN")]
+
+    @property
+    def reviewers(self) -> list[Actor]:
+        return [actor for actor in self.actors if actor.review_ids]
+
+
+def _items(payload) -> list[dict]:
+    data = (payload or {}).get("data")
+    if isinstance(data, dict):
+        data = data.get("results", [])
+    return data if isinstance(data, list) else []
+
+
+def prepare(transport, *, employees: int, pool: int, password: str, seed: int) -> Context:
+    """Log in a pool of seeded users and collect the ids the mix needs."""
+    rng = random.Random(seed)
+    # The root of the seeded tree is a manager and the last user is an admin.
+    indices = {0, employees - 1, *rng.sample(range(employees), min(pool, employees))}
+
+    actors = []
+    for index in sorted(indices):
+        email = f"user{index:06d}@{EMAIL_DOMAIN}"
+        status, payload, _ = transport.request("POST", "/api/auth/login/", {"email": email, "password": password})
+        if status != 200:
+            raise SystemExit(
+                f"Login failed for {email} (HTTP {status}). Seed the target with "
+                f"`manage.py seed_org --employees {employees} --seed {seed} --password ...`."
+            )
+        data = payload["data"]
+        actors.append(Actor(email=email, token=data["tokens"]["access"], role=data["user"]["role"]))
+
+    for actor in actors:
+        _, payload, _ = transport.request("GET", "/api/reviews/", token=actor.token)
+        actor.review_ids = [item["id"] for item in _items(payload)]
+
+    context = Context(password=password, actors=actors)
+    _, payload, _ = transport.request("GET", "/api/wellbeing/surveys/", token=actors[0].token)
+    for survey in _items(payload):
+        if survey.get("is_active") and survey.get("questions"):
+            context.survey_id = survey["id"]
+            context.questions = [(question["id"], question["type"]) for question in survey["questions"]]
+            break
+    return context
+
+
+def _answer(question_type: str, rng: random.Random) -> str:
+    if question_type == "SCALE_1_5":
+        return str(rng.randint(1, 5))
+    if question_type == "YES_NO":
+        return rng.choice(["yes", "no"])
+    return rng.choice(["All good", "Too many meetings", "Feeling tired lately"])
+
+
+def _op_login(context, rng):
+    actor = rng.choice(context.actors)
+    return "POST", "/api/auth/login/", {"email": actor.email, "password": context.password}, None
+
+
+def _op_me(context, rng):
+    return "GET", "/api/auth/me/", None, rng.choice(context.actors).token
+
+
+def _op_employee_me(context, rng):
+    return "GET", "/api/hr/employees/me/", None, rng.choice(context.actors).token
+
+
+def _op_my_team(context, rng):
+    return "GET", "/api/hr/employees/my-team/", None, rng.choice(context.managers).token
+
+
+def _op_reviews_list(context, rng):
+    return "GET", "/api/reviews/", None, rng.choice(context.actors).token
+
+
+def _op_review_detail(context, rng):
+    actor = rng.choice(context.reviewers)
+    return "GET", f"/api/reviews/{rng.choice(actor.review_ids)}/", None, actor.token
+
+
+def _op_survey_submit(context, rng):
+    answers = {str(question_id): _answer(question_type, rng) for question_id, question_type in context.questions}
+    path = f"/api/wellbeing/surveys/{context.survey_id}/submit/"
+    return "POST", path, {"answers": answers}, rng.choice(context.actors).token
+
+
+def _op_survey_detail(context, rng):
+    return "GET", f"/api/wellbeing/surveys/{context.survey_id}/", None, rng.choice(context.actors).token
+
+
+def _op_survey_stats(context, rng):
+    return "GET", f"/api/wellbeing/surveys/{context.survey_id}/stats/", None, rng.choice(context.hr_actors).token
+
+
+OPERATIONS = {
+    "login": (_op_login, lambda context: bool(context.actors)),
+    "me": (_op_me, lambda context: bool(context.actors)),
+    "employee_me": (_op_employee_me, lambda context: bool(context.actors)),
+    "my_team": (_op_my_team, lambda context: bool(context.managers)),
+    "reviews_list": (_op_reviews_list, lambda context: bool(context.actors)),
+    "review_detail": (_op_review_detail, lambda context: bool(context.reviewers)),
+    "survey_submit": (_op_survey_submit, lambda context: context.survey_id is not None),
+    "survey_detail": (_op_survey_detail, lambda context: context.survey_id is not None),
+    "survey_stats": (_op_survey_stats, lambda context: context.survey_id is not None and bool(context.hr_actors)),
+}
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples: list[tuple], wall_seconds: float) -> dict:
+    """``samples`` are ``(operation, status, seconds, queries)`` tuples."""
+    latencies = sorted(sample[2] * 1000 for sample in samples)
+    queries = [sample[3] for sample in samples if sample[3] is not None]
+    summary: dict[str, int | float | dict | None] = {
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if sample[1] >= 400),
+        "throughput_rps": round(len(samples) / wall_seconds, 2) if wall_seconds else None,
+        "latency_ms": None,
+        "queries_per_request": None,
+    }
+    if latencies:
+        summary["latency_ms"] = {
+            "p50": round(_percentile(latencies, 50), 2),
+            "p95": round(_percentile(latencies, 95), 2),
+            "p99": round(_percentile(latencies, 99), 2),
+            "mean": round(sum(latencies) / len(latencies), 2),
+            "max": round(latencies[-1], 2),
+        }
+    if queries:
+        summary["queries_per_request"] = {
+            "mean": round(sum(queries) / len(queries), 2),
+            "max": max(queries),
+        }
+    return summary
+
+
+def benchmark(
+    transport_factory,
+    context: Context,
+    mix: dict[str, int],
+    *,
+    requests: int | None,
+    duration: float | None,
+    concurrency: int = 1,
+    warmup: int = 0,
+    seed: int = 0,
+) -> dict:
+    """Run the weighted mix and return ``{"overall": ..., "endpoints": {...}, "skipped": [...]}``."""
+    available = {name: weight for name, weight in mix.items() if weight > 0 and OPERATIONS[name][1](context)}
+    skipped = sorted(name for name, weight in mix.items() if weight > 0 and name not in available)
+    if not available:
+        raise SystemExit("No operation of the mix can run against this dataset.")
+    names = list(available)
+    weights = [available[name] for name in names]
+
+    def issue(transport, rng):
+        name = rng.choices(names, weights)[0]
+        method, path, body, token = OPERATIONS[name][0](context, rng)
+        started = time.perf_counter()
+        status, _, queries = transport.request(method, path, body, token)
+        return name, status, time.perf_counter() - started, queries
+
+    warm_rng = random.Random(seed - 1)
+    warm_transport = transport_factory()
+    for _ in range(warmup):
+        issue(warm_transport, warm_rng)
+
+    lock = threading.Lock()
+    remaining = [requests]
+    deadline = time.perf_counter() + duration if duration else None
+
+    def claim() -> bool:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if remaining[0] is None:
+            return True
+        with lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def worker(index: int) -> list[tuple]:
+        transport = warm_transport if concurrency == 1 else transport_factory()
+        rng = random.Random(seed + index)
+        samples = []
+        while claim():
+            samples.append(issue(transport, rng))
+        return samples
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        # Stay on the calling thread: the in-process transport must share its DB connection.
+        results = [worker(0)]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(worker, range(concurrency)))
+    wall = time.perf_counter() - started
+
+    samples = [sample for worker_samples in results for sample in worker_samples]
+    return {
+        "wall_seconds": round(wall, 3),
+        "overall": summarize(samples, wall),
+        "endpoints": {
+            name: summarize([sample for sample in samples if sample[0] == name], wall) for name in names
+        },
+        "skipped": skipped,
+    }
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+
+
+def parse_mix(value: str | None) -> dict[str, int]:
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, (value or "").split(",")):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS or not weight.strip().isdigit():
+            raise argparse.ArgumentTypeError(f"invalid mix entry {item!r} (operations: {', '.join(OPERATIONS)})")
+        mix[name] = int(weight)
+    return mix
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_table(result: dict, stream) -> None:
+    stream.write(f"{'operation':<15}{'requests':>9}{'errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>9}{'q/req':>7}\n")
+    rows = [*result["endpoints"].items(), ("overall", result["overall"])]
+    for name, summary in rows:
+        latency = summary["latency_ms"] or {}
+        queries = summary["queries_per_request"] or {}
+        stream.write(
+            f"{name:<15}{summary['requests']:>9}{summary['errors']:>8}"
+            f"{latency.get('p50', '-'):>9}{latency.get('p95', '-'):>9}{latency.get('p99', '-'):>9}"
+            f"{summary['throughput_rps'] or '-':>9}{queries.get('mean', '-'):>7}\n"
+        )
+
+
+def _run_in_process(args, mix) -> tuple[dict, dict]:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "smarthr360_backend.config.local")
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        call_command(
+            "seed_org",
+            employees=args.employees,
+            seed=args.seed,
+            password=args.password,
+            stdout=sys.stderr,
+        )
+        transport = InProcessTransport()
+        context = prepare(transport, employees=args.employees, pool=args.pool, password=args.password, seed=args.seed)
+        result = benchmark(
+            lambda: transport,
+            context,
+            mix,
+            requests=args.requests,
+            duration=args.duration,
+            warmup=args.warmup,
+            seed=args.seed,
+        )
+        meta = {"target": "in-process", "settings": settings.SETTINGS_MODULE, "database": connection.vendor}
+        return result, meta
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def _run_http(args, mix) -> tuple[dict, dict]:
+    def factory():
+        return HttpTransport(args.url, args.timeout)
+
+    context = prepare(factory(), employees=args.employees, pool=args.pool, password=args.password, seed=args.seed)
+    result = benchmark(
+        factory,
+        context,
+        mix,
+        requests=args.requests,
+        duration=args.duration,
+        concurrency=args.concurrency,
+        warmup=args.warmup,
+        seed=args.seed,
+    )
+    return result, {"target": args.url}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.api_mix",
+        description="Weighted API traffic mix: latency percentiles, throughput and queries per request as JSON.",
+    )
+    parser.add_argument("--url", help="Base URL of a running server. Default: in-process test client.")
+    parser.add_argument("--concurrency", type=int, default=1, help="Client threads (HTTP mode only).")
+    stop = parser.add_mutually_exclusive_group()
+    stop.add_argument("--requests", type=int, default=None, help="Requests to measure (default: 1000).")
+    stop.add_argument("--duration", type=float, default=None, help="Seconds to run instead of a request count.")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests before the run (default: 20).")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX), help="Weights, e.g. 'login=0,me=50'.")
+    parser.add_argument("--employees", type=int, default=1000, help="Size of the seeded organization (default: 1000).")
+    parser.add_argument("--seed", type=int, default=42, help="seed_org seed and mix RNG seed (default: 42).")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password of the seeded users.")
+    parser.add_argument("--pool", type=int, default=20, help="Seeded users logged in and reused (default: 20).")
+    parser.add_argument("--timeout", type=float, default=30.0, help="HTTP timeout in seconds (default: 30).")
+    parser.add_argument("--label", default="", help="Free-form label stored in the results (e.g. 'w4t2').")
+    parser.add_argument("--output", help="Write JSON here instead of stdout.")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.requests is None and args.duration is None:
+        args.requests = 1000
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if not args.url and args.concurrency != 1:
+        parser.error("in-process mode is single-threaded; use --url for --concurrency > 1")
+
+    runner = _run_http if args.url else _run_in_process
+    result, meta = runner(args, args.mix)
+
+    output = {
+        "meta": {
+            **meta,
+            "label": args.label,
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "concurrency": args.concurrency,
+            "employees": args.employees,
+            "seed": args.seed,
+            "warmup": args.warmup,
+            "mix": args.mix,
+            "skipped": result.pop("skipped"),
+            "wall_seconds": result.pop("wall_seconds"),
+        },
+        **result,
+    }
+
+    _print_table(output, sys.stderr)
+    text = json.dumps(output, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Compare two ``benchmarks.api_mix`` result files.
+
+    python -m benchmarks.compare before.json after.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+
+def _change(before, after) -> str:
+    if before in (None, 0) or after is None:
+        return "-"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def _row(name: str, before: dict, after: dict) -> str:
+    cells = [f"{name:<15}"]
+    for key in ("p50", "p95", "p99"):
+        old = (before.get("latency_ms") or {}).get(key)
+        new = (after.get("latency_ms") or {}).get(key)
+        cells.append(f"{old!s:>9} → {new!s:<9}{_change(old, new):>8}")
+    old_rps, new_rps = before.get("throughput_rps"), after.get("throughput_rps")
+    cells.append(f"{old_rps!s:>8} → {new_rps!s:<8}{_change(old_rps, new_rps):>8}")
+    old_q = (before.get("queries_per_request") or {}).get("mean")
+    new_q = (after.get("queries_per_request") or {}).get("mean")
+    cells.append(f"{old_q!s:>6} → {new_q!s:<6}")
+    return " ".join(cells)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args(argv)
+
+    with open(args.before, encoding="utf-8") as handle:
+        before = json.load(handle)
+    with open(args.after, encoding="utf-8") as handle:
+        after = json.load(handle)
+
+    for label, result in (("before", before), ("after", after)):
+        meta = result["meta"]
+        sys.stdout.write(
+            f"{label}: {meta.get('commit')} {meta.get('label') or ''} target={meta.get('target')} "
+            f"concurrency={meta.get('concurrency')}\n"
+        )
+    sys.stdout.write(
+        f"{'operation':<15} {'p50 ms':^28} {'p95 ms':^28} {'p99 ms':^28} {'req/s':^26} {'queries':^15}\n"
+    )
+    names = [*before["endpoints"], *(name for name in after["endpoints"] if name not in before["endpoints"])]
+    for name in names:
+        sys.stdout.write(_row(name, before["endpoints"].get(name, {}), after["endpoints"].get(name, {})) + "\n")
+    sys.stdout.write(_row("overall", before["overall"], after["overall"]) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
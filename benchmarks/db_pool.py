@@ -0,0 +1,219 @@
+"""
+PostgreSQL connections and latency with and without the connection pool.
+
+For each ``--mode`` (gthread or uvicorn workers, see ``benchmarks.server_modes``)
+the benchmark starts gunicorn twice, with ``DATABASE_POOL`` off and on, and
+sends the read mix at each ``--concurrency`` level for ``--duration`` seconds.
+Alongside latency and throughput it records, from PostgreSQL itself:
+
+- ``connections_peak``: most client connections open on the database at once
+  (``pg_stat_activity``, sampled every 100 ms);
+- ``connections_opened``: sessions started during the level
+  (``pg_stat_database.sessions``, PostgreSQL 14+).
+
+With the pool on it also reads the per-worker counters of
+``/api/ops/db-pool/`` (as the seeded admin) and reports the mean wait for a
+pooled connection and the number of timeouts.
+
+``DATABASE_URL`` must point at the seeded PostgreSQL database; pool sizes come
+from the ``DATABASE_POOL_*`` variables as for the server.
+
+    python -m benchmarks.db_pool --workers 2 --concurrency 8,32 --duration 20 --output db-pool.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+from datetime import datetime, timezone
+
+import psycopg
+
+from . import api_mix, server_modes
+
+ACTIVE_CONNECTIONS_SQL = """
+    SELECT count(*) FROM pg_stat_activity
+    WHERE datname = current_database() AND backend_type = 'client backend' AND pid <> pg_backend_pid()
+"""
+SESSIONS_SQL = "SELECT sessions FROM pg_stat_database WHERE datname = current_database()"
+
+
+class ConnectionSampler(threading.Thread):
+    """Peak number of client connections on the database while running."""
+
+    def __init__(self, database_url: str, interval: float = 0.1):
+        super().__init__(daemon=True)
+        self.connection = psycopg.connect(database_url, autocommit=True)
+        self.interval = interval
+        self.peak = 0
+        self._stop_event = threading.Event()
+
+    def _count(self, sql: str) -> int:
+        row = self.connection.execute(sql).fetchone()
+        assert row is not None  # both queries return one row for the current database
+        return row[0]
+
+    def sessions(self) -> int:
+        return self._count(SESSIONS_SQL)
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            self.peak = max(self.peak, self._count(ACTIVE_CONNECTIONS_SQL))
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> int:
+        self._stop_event.set()
+        self.join()
+        return self.peak
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def pool_counters(url: str, token: str, workers: int, timeout: float) -> dict[int, dict]:
+    """``{pid: stats}`` of every worker, asking on new connections until each one answered."""
+    counters = {}
+    for _ in range(workers * 10):
+        status, payload, _ = api_mix.HttpTransport(url, timeout).request("GET", "/api/ops/db-pool/", token=token)
+        if status == 200 and payload["data"]["stats"] is not None:
+            counters[payload["data"]["pid"]] = payload["data"]["stats"]
+        if len(counters) == workers:
+            break
+    return counters
+
+
+def pool_delta(before: dict[int, dict], after: dict[int, dict]) -> dict:
+    requests = wait_ms = timed_out = 0
+    for pid, stats in after.items():
+        previous = before.get(pid, {})
+        requests += stats["requests"] - previous.get("requests", 0)
+        wait_ms += stats["wait_ms_total"] - previous.get("wait_ms_total", 0)
+        timed_out += stats["requests_timed_out"] - previous.get("requests_timed_out", 0)
+    return {
+        "workers_seen": len(after),
+        "requests": requests,
+        "wait_ms_mean": round(wait_ms / requests, 2) if requests else None,
+        "timed_out": timed_out,
+    }
+
+
+def run_case(mode: str, pooled: bool, args) -> dict:
+    server = server_modes.start_server(mode, args, env={"DATABASE_POOL": str(pooled)})
+    url = f"http://127.0.0.1:{args.port}"
+    try:
+        def factory():
+            return api_mix.HttpTransport(url, args.timeout)
+
+        context = api_mix.prepare(
+            factory(), employees=args.employees, pool=args.pool, password=args.password, seed=args.seed
+        )
+        admin = next(actor for actor in context.actors if actor.role == "ADMIN")
+        api_mix.benchmark(
+            factory, context, server_modes.READ_MIX, requests=args.workers * 50, duration=None, seed=args.seed
+        )
+
+        levels = {}
+        for concurrency in args.concurrency:
+            before = pool_counters(url, admin.token, args.workers, args.timeout) if pooled else {}
+            sampler = ConnectionSampler(args.database_url)
+            sessions_before = sampler.sessions()
+            sampler.start()
+            result = api_mix.benchmark(
+                factory, context, server_modes.READ_MIX, requests=None, duration=args.duration,
+                concurrency=concurrency, seed=args.seed,
+            )
+            peak = sampler.stop()
+            opened = sampler.sessions() - sessions_before
+            sampler.close()
+            level = {
+                "overall": result["overall"],
+                "endpoints": result["endpoints"],
+                "connections_peak": peak,
+                "connections_opened": opened,
+            }
+            if pooled:
+                level["pool"] = pool_delta(before, pool_counters(url, admin.token, args.workers, args.timeout))
+            levels[str(concurrency)] = level
+        return {"levels": levels}
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def _print_table(output: dict, stream) -> None:
+    stream.write(
+        f"{'case':<11}{'conc':>6}{'rps':>9}{'p50':>9}{'p99':>9}{'errors':>8}"
+        f"{'conns':>7}{'opened':>8}{'wait ms':>9}\n"
+    )
+    for case, result in output["cases"].items():
+        for concurrency, level in result["levels"].items():
+            overall = level["overall"]
+            latency = overall["latency_ms"] or {}
+            wait = (level.get("pool") or {}).get("wait_ms_mean")
+            stream.write(
+                f"{case:<11}{concurrency:>6}{overall['throughput_rps'] or '-':>9}"
+                f"{latency.get('p50', '-'):>9}{latency.get('p99', '-'):>9}{overall['errors']:>8}"
+                f"{level['connections_peak']:>7}{level['connections_opened']:>8}"
+                f"{wait if wait is not None else '-':>9}\n"
+            )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = server_modes.build_parser()
+    parser.prog = "python -m benchmarks.db_pool"
+    parser.description = "PostgreSQL connections and latency with DATABASE_POOL off and on, as JSON."
+    parser.add_argument(
+        "--database-url", default=os.environ.get("DATABASE_URL"),
+        help="PostgreSQL URL of the server's database (default: $DATABASE_URL).",
+    )
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.database_url or not args.database_url.startswith(("postgres://", "postgresql://")):
+        parser.error("--database-url (or DATABASE_URL) must be a PostgreSQL URL")
+    modes = args.mode or ["wsgi", "asgi"]
+
+    cases = {}
+    for mode in modes:
+        for pooled in (False, True):
+            cases[f"{mode}-{'pool' if pooled else 'direct'}"] = run_case(mode, pooled, args)
+
+    output = {
+        "meta": {
+            "label": args.label,
+            "commit": api_mix._git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "workers": args.workers,
+            "threads": args.threads,
+            "duration": args.duration,
+            "employees": args.employees,
+            "pool": {
+                name: os.environ.get(f"DATABASE_POOL_{name.upper()}")
+                for name in ("min_size", "max_size", "timeout")
+            },
+            "mix": server_modes.READ_MIX,
+        },
+        "cases": cases,
+    }
+
+    _print_table(output, sys.stderr)
+    text = json.dumps(output, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Tail latency of non-auth endpoints during a login storm.
+
+Against a running server (``--url``, seeded like ``benchmarks.api_mix``):
+
+1. baseline: ``--probes`` threads send the probe mix (me, my-team, reviews) for
+   ``--duration`` seconds;
+2. storm: the same probes run again while ``--storm`` threads post logins
+   back to back.
+
+The JSON output holds both probe summaries, the login summary of the storm
+phase (503s from a full hashing pool are counted as ``busy``), and the p99
+ratio storm / baseline per probe operation. Run it with ``PASSWORD_HASH_POOL``
+on and off to see what hashing off the request thread buys.
+
+    python -m benchmarks.login_storm --url http://127.0.0.1:8000 --storm 16 --probes 4 --duration 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from . import api_mix
+
+PROBE_MIX = {"me": 40, "my_team": 15, "reviews_list": 25, "review_detail": 20}
+
+
+def _storm(transport_factory, context: api_mix.Context, stop: threading.Event, samples: list, seed: int) -> None:
+    transport = transport_factory()
+    rng = random.Random(seed)
+    make_login = api_mix.OPERATIONS["login"][0]
+    while not stop.is_set():
+        method, path, body, token = make_login(context, rng)
+        started = time.perf_counter()
+        status, _, queries = transport.request(method, path, body, token)
+        samples.append(("login", status, time.perf_counter() - started, queries))
+
+
+def run(transport_factory, context: api_mix.Context, *, storm: int, probes: int, duration: float, seed: int) -> dict:
+    """Return ``{"baseline": ..., "storm": ..., "logins": ...}``."""
+    baseline = api_mix.benchmark(
+        transport_factory, context, PROBE_MIX, requests=None, duration=duration, concurrency=probes, seed=seed
+    )
+
+    stop = threading.Event()
+    samples: list[tuple] = []
+    threads = [
+        threading.Thread(target=_storm, args=(transport_factory, context, stop, samples, seed + 1000 + index))
+        for index in range(storm)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    try:
+        under_storm = api_mix.benchmark(
+            transport_factory, context, PROBE_MIX, requests=None, duration=duration, concurrency=probes, seed=seed
+        )
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    wall = time.perf_counter() - started
+
+    logins = api_mix.summarize(samples, wall)
+    logins["busy"] = sum(1 for sample in samples if sample[1] == 503)
+    return {"baseline": baseline, "storm": under_storm, "logins": logins}
+
+
+def p99_ratios(result: dict) -> dict[str, float | None]:
+    ratios = {}
+    for name, summary in result["storm"]["endpoints"].items():
+        before = (result["baseline"]["endpoints"].get(name, {}).get("latency_ms") or {}).get("p99")
+        after = (summary["latency_ms"] or {}).get("p99")
+        ratios[name] = round(after / before, 2) if before and after else None
+    return ratios
+
+
+def _print_table(output: dict, stream) -> None:
+    stream.write(f"{'operation':<15}{'base p50':>10}{'base p99':>10}{'storm p50':>11}{'storm p99':>11}{'x p99':>7}\n")
+    for name, ratio in output["p99_ratio"].items():
+        base = output["baseline"]["endpoints"][name]["latency_ms"] or {}
+        under = output["storm"]["endpoints"][name]["latency_ms"] or {}
+        stream.write(
+            f"{name:<15}{base.get('p50', '-'):>10}{base.get('p99', '-'):>10}"
+            f"{under.get('p50', '-'):>11}{under.get('p99', '-'):>11}{ratio or '-':>7}\n"
+        )
+    logins = output["logins"]
+    latency = logins["latency_ms"] or {}
+    stream.write(
+        f"logins: {logins['requests']} ({logins['throughput_rps']} req/s, {logins['busy']} busy), "
+        f"p50 {latency.get('p50', '-')} ms, p99 {latency.get('p99', '-')} ms\n"
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.login_storm",
+        description="Latency of non-auth endpoints with and without concurrent logins, as JSON.",
+    )
+    parser.add_argument("--url", required=True, help="Base URL of a running server.")
+    parser.add_argument("--storm", type=int, default=16, help="Threads posting logins (default: 16).")
+    parser.add_argument("--probes", type=int, default=4, help="Threads sending the probe mix (default: 4).")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per phase (default: 30).")
+    parser.add_argument("--employees", type=int, default=1000, help="Size of the seeded organization (default: 1000).")
+    parser.add_argument("--seed", type=int, default=42, help="seed_org seed and RNG seed (default: 42).")
+    parser.add_argument("--password", default=api_mix.DEFAULT_PASSWORD, help="Password of the seeded users.")
+    parser.add_argument("--pool", type=int, default=20, help="Seeded users logged in and reused (default: 20).")
+    parser.add_argument("--timeout", type=float, default=30.0, help="HTTP timeout in seconds (default: 30).")
+    parser.add_argument("--label", default="", help="Free-form label stored in the results (e.g. 'pool-on').")
+    parser.add_argument("--output", help="Write JSON here instead of stdout.")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.storm < 1 or args.probes < 1:
+        parser.error("--storm and --probes must be at least 1")
+
+    def factory():
+        return api_mix.HttpTransport(args.url, args.timeout)
+
+    context = api_mix.prepare(
+        factory(), employees=args.employees, pool=args.pool, password=args.password, seed=args.seed
+    )
+    result = run(factory, context, storm=args.storm, probes=args.probes, duration=args.duration, seed=args.seed)
+
+    output = {
+        "meta": {
+            "target": args.url,
+            "label": args.label,
+            "commit": api_mix._git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "storm": args.storm,
+            "probes": args.probes,
+            "duration": args.duration,
+            "employees": args.employees,
+            "seed": args.seed,
+            "mix": PROBE_MIX,
+        },
+        **result,
+        "p99_ratio": p99_ratios(result),
+    }
+
+    _print_table(output, sys.stderr)
+    text = json.dumps(output, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Per-request cost of the middleware chain, before and after path scoping.
+
+``before`` is MIDDLEWARE with ``PathScopedMiddleware`` replaced by the
+SESSION_MIDDLEWARE it runs (every request goes through sessions,
+authentication, django-axes and messages, as it did without the
+dispatcher); ``after`` is MIDDLEWARE as configured. Both are WSGI handlers in
+this process, called directly (no server, no network) on a fresh test database
+seeded like ``benchmarks.api_mix``.
+
+Cases:
+
+- ``api_noop`` / ``admin_noop``: a view returning an empty response under
+  ``/api/`` and ``/admin/``: the chain and the handler alone;
+- ``me``, ``departments``: real API requests with a JWT.
+
+Each of ``--rounds`` rounds sends ``--requests`` requests per case to each
+handler in turn; the result is the median over rounds of the median request
+time, in microseconds.
+
+    python -m benchmarks.middleware_overhead --rounds 5 --requests 2000
+    DJANGO_SETTINGS_MODULE=smarthr360_backend.config.production python -m benchmarks.middleware_overhead
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+from django.http import HttpResponse
+from django.urls import path
+
+from . import api_mix
+
+DISPATCHER = "smarthr360_backend.middleware.PathScopedMiddleware"
+
+# (name, path, with the benchmark URLconf, authenticated)
+CASES = [
+    ("api_noop", "/api/noop/", True, False),
+    ("admin_noop", "/admin/noop/", True, False),
+    ("me", "/api/auth/me/", False, True),
+    ("departments", "/api/hr/departments/", False, True),
+]
+
+
+def noop(request):
+    return HttpResponse()
+
+
+urlpatterns = [path("api/noop/", noop), path("admin/noop/", noop)]
+
+
+def flat_middleware(settings) -> list[str]:
+    """MIDDLEWARE with the dispatcher replaced by the middleware it runs."""
+    flat: list[str] = []
+    for entry in settings.MIDDLEWARE:
+        flat.extend(settings.SESSION_MIDDLEWARE if entry == DISPATCHER else [entry])
+    return flat
+
+
+def build_handler(middleware: list[str]):
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test import override_settings
+
+    with override_settings(MIDDLEWARE=middleware):
+        return WSGIHandler()
+
+
+def time_requests(handler, environ_factory, requests: int) -> float:
+    """Median microseconds per request."""
+    timings = []
+    for _ in range(requests):
+        environ = environ_factory()
+        start = time.perf_counter_ns()
+        response = handler(environ, lambda status, headers, exc_info=None: None)
+        b"".join(response)
+        response.close()
+        timings.append((time.perf_counter_ns() - start) / 1000)
+        if not 200 <= response.status_code < 300:
+            raise SystemExit(f"{environ['PATH_INFO']} answered HTTP {response.status_code}")
+    return statistics.median(timings)
+
+
+def run(args) -> tuple[dict, dict]:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "smarthr360_backend.config.local")
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import RequestFactory, override_settings
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from accounts.models import User
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        call_command("seed_org", employees=args.employees, seed=args.seed, password=args.password, stdout=sys.stderr)
+        token = str(AccessToken.for_user(User.objects.filter(role=User.Role.HR).first()))
+        factory = RequestFactory()
+        handlers = {"before": build_handler(flat_middleware(settings)), "after": build_handler(settings.MIDDLEWARE)}
+
+        rounds: dict[tuple[str, str], list[float]] = {(name, variant): [] for name, *_ in CASES for variant in handlers}
+        for _ in range(args.rounds):
+            for name, request_path, own_urlconf, authenticated in CASES:
+                headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if authenticated else {}
+
+                def environ_factory(request_path=request_path, headers=headers):
+                    return factory.get(request_path, **headers).environ
+
+                with override_settings(ROOT_URLCONF=__name__ if own_urlconf else settings.ROOT_URLCONF):
+                    for variant, handler in handlers.items():
+                        time_requests(handler, environ_factory, args.warmup)
+                        rounds[name, variant].append(time_requests(handler, environ_factory, args.requests))
+
+        cases = {}
+        for name, *_ in CASES:
+            before = statistics.median(rounds[name, "before"])
+            after = statistics.median(rounds[name, "after"])
+            cases[name] = {
+                "before_us": round(before, 1),
+                "after_us": round(after, 1),
+                "saved_us": round(before - after, 1),
+                "saved_pct": round((before - after) / before * 100, 1),
+            }
+        meta = {
+            "settings": settings.SETTINGS_MODULE,
+            "database": connection.vendor,
+            "before": flat_middleware(settings),
+            "after": list(settings.MIDDLEWARE),
+        }
+        return cases, meta
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def _print_table(output: dict, stream) -> None:
+    stream.write(f"{'case':<14}{'before us':>11}{'after us':>10}{'saved us':>10}{'saved %':>9}\n")
+    for name, case in output["cases"].items():
+        stream.write(
+            f"{name:<14}{case['before_us']:>11}{case['after_us']:>10}{case['saved_us']:>10}{case['saved_pct']:>9}\n"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.middleware_overhead",
+        description="Middleware chain cost per request with and without path scoping, as JSON.",
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="Timed requests per case and round (default: 2000).")
+    parser.add_argument("--warmup", type=int, default=200, help="Untimed requests before each timing (default: 200).")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds; the median is reported (default: 5).")
+    parser.add_argument("--employees", type=int, default=50, help="Size of the seeded organization (default: 50).")
+    parser.add_argument("--seed", type=int, default=42, help="seed_org seed (default: 42).")
+    parser.add_argument("--password", default=api_mix.DEFAULT_PASSWORD, help="Password of the seeded users.")
+    parser.add_argument("--label", default="", help="Free-form label stored in the results.")
+    parser.add_argument("--output", help="Write JSON here instead of stdout.")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    cases, meta = run(args)
+    output = {
+        "meta": {
+            "label": args.label,
+            "commit": api_mix._git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "rounds": args.rounds,
+            **meta,
+        },
+        "cases": cases,
+    }
+
+    _print_table(output, sys.stderr)
+    text = json.dumps(output, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
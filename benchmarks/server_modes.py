@@ -0,0 +1,231 @@
+"""
+WSGI (gthread workers) vs ASGI (uvicorn workers) under gunicorn.
+
+For each ``--mode`` the benchmark starts gunicorn itself on ``--port``, waits
+until it accepts connections, then sends the read mix (the endpoints with
+async views: me, employee me, my-team, survey detail) at each
+``--concurrency`` level for ``--duration`` seconds. It records latency and
+throughput from ``benchmarks.api_mix`` and the resident memory of the
+gunicorn process tree, read from /proc (Linux), at idle and at peak. Memory
+per connection is ``(peak - idle) / concurrency``.
+
+The server uses the current environment (``DATABASE_URL``, ``SECRET_KEY``,
+``DJANGO_SETTINGS_MODULE``...). Seed its database like ``benchmarks.api_mix``
+first. ASGI mode needs ``uvicorn`` and ``uvicorn-worker``.
+
+    python -m benchmarks.server_modes --concurrency 8,32,128 --duration 20 --output modes.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from . import api_mix
+
+READ_MIX = {"me": 35, "employee_me": 25, "my_team": 15, "survey_detail": 25}
+
+MODES = {
+    "wsgi": lambda args: [
+        "smarthr360_backend.wsgi:application",
+        "--worker-class", "gthread",
+        "--threads", str(args.threads),
+    ],
+    "asgi": lambda args: [
+        "smarthr360_backend.asgi:application",
+        "--worker-class", "uvicorn_worker.UvicornWorker",
+    ],
+}
+
+
+def _children(pid: int) -> list[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", encoding="ascii") as handle:
+            return [int(child) for child in handle.read().split()]
+    except OSError:
+        return []
+
+
+def tree_rss_kb(pid: int) -> int:
+    """Resident memory of ``pid`` and all its descendants, in KiB."""
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status", encoding="ascii") as handle:
+                for line in handle:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+        pending.extend(_children(current))
+    return total
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, pid: int, interval: float = 0.25):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak_kb = 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            self.peak_kb = max(self.peak_kb, tree_rss_kb(self.pid))
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> int:
+        self._stop_event.set()
+        self.join()
+        return self.peak_kb
+
+
+def start_server(mode: str, args, env: dict | None = None, extra_args=()) -> subprocess.Popen:
+    """Start gunicorn in ``mode`` with ``env`` added to this process' environment."""
+    command = [
+        sys.executable, "-m", "gunicorn", *MODES[mode](args),
+        "--bind", f"127.0.0.1:{args.port}",
+        "--workers", str(args.workers),
+        "--timeout", "120",
+        "--log-level", "warning",
+        *extra_args,
+    ]
+    server = subprocess.Popen(
+        command, stdout=subprocess.DEVNULL, stderr=sys.stderr, env={**os.environ, **(env or {})}
+    )
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"{mode} server exited with code {server.returncode}: {' '.join(command)}")
+        try:
+            socket.create_connection(("127.0.0.1", args.port), timeout=0.5).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit(f"{mode} server did not start within {args.startup_timeout} s")
+
+
+def run_mode(mode: str, args) -> dict:
+    server = start_server(mode, args)
+    url = f"http://127.0.0.1:{args.port}"
+    try:
+        def factory():
+            return api_mix.HttpTransport(url, args.timeout)
+
+        context = api_mix.prepare(
+            factory(), employees=args.employees, pool=args.pool, password=args.password, seed=args.seed
+        )
+        # Load every worker's code paths once before measuring memory.
+        api_mix.benchmark(factory, context, READ_MIX, requests=args.workers * 50, duration=None, seed=args.seed)
+        idle_kb = tree_rss_kb(server.pid)
+
+        levels = {}
+        for concurrency in args.concurrency:
+            sampler = RssSampler(server.pid)
+            sampler.start()
+            result = api_mix.benchmark(
+                factory, context, READ_MIX, requests=None, duration=args.duration,
+                concurrency=concurrency, seed=args.seed,
+            )
+            peak_kb = sampler.stop()
+            levels[str(concurrency)] = {
+                "overall": result["overall"],
+                "endpoints": result["endpoints"],
+                "rss_peak_mb": round(peak_kb / 1024, 1),
+                "kb_per_connection": round(max(0, peak_kb - idle_kb) / concurrency, 1),
+            }
+        return {"rss_idle_mb": round(idle_kb / 1024, 1), "levels": levels}
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def _print_table(output: dict, stream) -> None:
+    stream.write(f"{'mode':<6}{'conc':>6}{'rps':>9}{'p50':>9}{'p99':>9}{'errors':>8}{'rss MB':>9}{'KB/conn':>9}\n")
+    for mode, result in output["modes"].items():
+        for concurrency, level in result["levels"].items():
+            overall = level["overall"]
+            latency = overall["latency_ms"] or {}
+            stream.write(
+                f"{mode:<6}{concurrency:>6}{overall['throughput_rps'] or '-':>9}"
+                f"{latency.get('p50', '-'):>9}{latency.get('p99', '-'):>9}{overall['errors']:>8}"
+                f"{level['rss_peak_mb']:>9}{level['kb_per_connection']:>9}\n"
+            )
+
+
+def _levels(value: str) -> list[int]:
+    try:
+        levels = [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid concurrency list {value!r}") from None
+    if not levels or min(levels) < 1:
+        raise argparse.ArgumentTypeError("concurrency levels must be positive integers")
+    return levels
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.server_modes",
+        description="Throughput, latency and memory of WSGI vs ASGI gunicorn workers, as JSON.",
+    )
+    parser.add_argument("--mode", action="append", choices=sorted(MODES), help="Repeatable (default: both).")
+    parser.add_argument("--workers", type=int, default=1, help="Gunicorn workers (default: 1).")
+    parser.add_argument("--threads", type=int, default=8, help="Threads per WSGI worker (default: 8).")
+    parser.add_argument("--concurrency", type=_levels, default=[8, 32, 128], help="Client threads per level.")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per level (default: 20).")
+    parser.add_argument("--port", type=int, default=8765, help="Port the server binds on (default: 8765).")
+    parser.add_argument("--startup-timeout", type=float, default=30.0, help="Seconds to wait for the server.")
+    parser.add_argument("--employees", type=int, default=1000, help="Size of the seeded organization (default: 1000).")
+    parser.add_argument("--seed", type=int, default=42, help="seed_org seed and RNG seed (default: 42).")
+    parser.add_argument("--password", default=api_mix.DEFAULT_PASSWORD, help="Password of the seeded users.")
+    parser.add_argument("--pool", type=int, default=20, help="Seeded users logged in and reused (default: 20).")
+    parser.add_argument("--timeout", type=float, default=30.0, help="HTTP timeout in seconds (default: 30).")
+    parser.add_argument("--label", default="", help="Free-form label stored in the results.")
+    parser.add_argument("--output", help="Write JSON here instead of stdout.")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    modes = args.mode or ["wsgi", "asgi"]
+
+    output = {
+        "meta": {
+            "label": args.label,
+            "commit": api_mix._git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "workers": args.workers,
+            "threads": args.threads,
+            "duration": args.duration,
+            "employees": args.employees,
+            "mix": READ_MIX,
+        },
+        "modes": {mode: run_mode(mode, args) for mode in modes},
+    }
+
+    _print_table(output, sys.stderr)
+    text = json.dumps(output, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+First requests of a new gunicorn worker, with and without warm-up.
+
+Cases (``--case``, repeatable):
+
+- ``cold``: ``WORKER_WARMUP`` off;
+- ``warm``: ``WORKER_WARMUP`` on, each worker warms up in ``post_worker_init``;
+- ``preload``: ``WORKER_WARMUP`` on and ``--preload``: the master loads the
+  application and warms the URL resolver and serializers before forking.
+
+Each of ``--repeat`` rounds starts gunicorn twice:
+
+1. it sends ``GET /api/auth/me/`` as soon as the port accepts connections and
+   records the time from launch to the response (``ready_ms``): boot, warm-up
+   and that first request;
+2. it waits ``--settle`` seconds (the worker has booted and warmed up), then
+   sends ``FIRST_REQUESTS`` once (``first``) and a second time (``second``).
+
+Results are medians over the rounds. Access tokens come from a throwaway
+server started before the cases, so the measured workers serve nothing else.
+Seed the database like ``benchmarks.api_mix`` first.
+
+    python -m benchmarks.warmup --repeat 5 --output warmup.json
+    PASSWORD_HASH_POOL=True DATABASE_POOL=True python -m benchmarks.warmup --mode asgi
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+from . import api_mix, server_modes
+
+CASES = {
+    "cold": ({"WORKER_WARMUP": "False"}, ()),
+    "warm": ({"WORKER_WARMUP": "True"}, ()),
+    "preload": ({"WORKER_WARMUP": "True"}, ("--preload",)),
+}
+
+# (name, method, path, role of the caller); "login" posts the caller's credentials.
+FIRST_REQUESTS = [
+    ("me", "GET", "/api/auth/me/", "EMPLOYEE"),
+    ("departments", "GET", "/api/hr/departments/", "EMPLOYEE"),
+    ("review_cycles", "GET", "/api/reviews/cycles/", "EMPLOYEE"),
+    ("surveys", "GET", "/api/wellbeing/surveys/", "EMPLOYEE"),
+    ("employees", "GET", "/api/hr/employees/", "ADMIN"),
+    ("reviews", "GET", "/api/reviews/", "MANAGER"),
+    ("login", "POST", "/api/auth/login/", "EMPLOYEE"),
+]
+
+
+def _actors(context) -> dict[str, api_mix.Actor]:
+    actors: dict[str, api_mix.Actor] = {}
+    for actor in context.actors:
+        actors.setdefault(actor.role, actor)
+    missing = {role for *_, role in FIRST_REQUESTS} - set(actors)
+    if missing:
+        raise SystemExit(f"No seeded user with role {', '.join(sorted(missing))}: raise --pool.")
+    return actors
+
+
+def _send_sequence(transport, actors, password: str) -> dict[str, float]:
+    timings = {}
+    for name, method, path, role in FIRST_REQUESTS:
+        actor = actors[role]
+        if name == "login":
+            body, token = {"email": actor.email, "password": password}, None
+        else:
+            body, token = None, actor.token
+        start = time.perf_counter()
+        status, _, _ = transport.request(method, path, body, token=token)
+        timings[name] = (time.perf_counter() - start) * 1000
+        if status != 200:
+            raise SystemExit(f"{method} {path} answered HTTP {status}")
+    return timings
+
+
+def _stop(server) -> None:
+    server.terminate()
+    server.wait(timeout=30)
+
+
+def run_round(case: str, args, actors) -> dict:
+    env, extra_args = CASES[case]
+    url = f"http://127.0.0.1:{args.port}"
+
+    launched = time.perf_counter()
+    server = server_modes.start_server(args.mode, args, env=env, extra_args=extra_args)
+    try:
+        status, _, _ = api_mix.HttpTransport(url, args.timeout).request(
+            "GET", "/api/auth/me/", token=actors["EMPLOYEE"].token
+        )
+        ready_ms = (time.perf_counter() - launched) * 1000
+        if status != 200:
+            raise SystemExit(f"GET /api/auth/me/ answered HTTP {status}")
+    finally:
+        _stop(server)
+
+    server = server_modes.start_server(args.mode, args, env=env, extra_args=extra_args)
+    try:
+        time.sleep(args.settle)
+        transport = api_mix.HttpTransport(url, args.timeout)
+        first = _send_sequence(transport, actors, args.password)
+        second = _send_sequence(transport, actors, args.password)
+    finally:
+        _stop(server)
+    return {"ready_ms": ready_ms, "first": first, "second": second}
+
+
+def _median(rounds: list[dict], key: str) -> dict[str, float]:
+    return {
+        name: round(statistics.median(result[key][name] for result in rounds), 1)
+        for name, *_ in FIRST_REQUESTS
+    }
+
+
+def run_case(case: str, args, actors) -> dict:
+    rounds = [run_round(case, args, actors) for _ in range(args.repeat)]
+    first = _median(rounds, "first")
+    second = _median(rounds, "second")
+    return {
+        "ready_ms": round(statistics.median(result["ready_ms"] for result in rounds), 1),
+        "first": first,
+        "second": second,
+        "first_total_ms": round(sum(first.values()), 1),
+        "second_total_ms": round(sum(second.values()), 1),
+    }
+
+
+def _print_table(output: dict, stream) -> None:
+    cases = output["cases"]
+    stream.write(f"{'first request ms':<18}" + "".join(f"{case:>10}" for case in cases) + f"{'(steady)':>10}\n")
+    steady = next(iter(cases.values()))["second"]
+    for name, *_ in FIRST_REQUESTS:
+        row = "".join(f"{result['first'][name]:>10}" for result in cases.values())
+        stream.write(f"{name:<18}{row}{steady[name]:>10}\n")
+    stream.write(f"{'total':<18}" + "".join(f"{result['first_total_ms']:>10}" for result in cases.values()))
+    stream.write(f"{next(iter(cases.values()))['second_total_ms']:>10}\n")
+    stream.write(f"{'launch to 1st resp':<18}" + "".join(f"{result['ready_ms']:>10}" for result in cases.values()))
+    stream.write("\n")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = server_modes.build_parser()
+    parser.prog = "python -m benchmarks.warmup"
+    parser.description = "First-request latency of new gunicorn workers with and without warm-up, as JSON."
+    parser.set_defaults(pool=4)
+    parser.add_argument("--case", action="append", choices=list(CASES), help="Repeatable (default: all).")
+    parser.add_argument("--repeat", type=int, default=3, help="Server starts per case (default: 3).")
+    parser.add_argument("--settle", type=float, default=5.0, help="Seconds between start and first request.")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    # One mode per run; --mode is repeatable in server_modes.
+    args.mode = (args.mode or ["wsgi"])[0]
+
+    server = server_modes.start_server(args.mode, args, env=CASES["cold"][0])
+    try:
+        context = api_mix.prepare(
+            api_mix.HttpTransport(f"http://127.0.0.1:{args.port}", args.timeout),
+            employees=args.employees, pool=args.pool, password=args.password, seed=args.seed,
+        )
+    finally:
+        _stop(server)
+    actors = _actors(context)
+
+    cases = {case: run_case(case, args, actors) for case in (args.case or list(CASES))}
+    output = {
+        "meta": {
+            "label": args.label,
+            "commit": api_mix._git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "mode": args.mode,
+            "workers": args.workers,
+            "threads": args.threads,
+            "repeat": args.repeat,
+            "settle": args.settle,
+            "env": {
+                name: os.environ.get(name)
+                for name in ("DJANGO_SETTINGS_MODULE", "DATABASE_POOL", "PASSWORD_HASH_POOL", "RESPONSE_CACHE_TTL")
+            },
+        },
+        "cases": cases,
+    }
+
+    _print_table(output, sys.stderr)
+    text = json.dumps(output, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
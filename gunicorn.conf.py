@@ -0,0 +1,24 @@
+"""
+Gunicorn hooks. Gunicorn loads this file from the working directory (the
+project root in the Procfile, /app in the Docker image); settings given on the
+command line still apply.
+
+With WORKER_WARMUP on (default in production), workers warm up before they
+accept connections (see smarthr360_backend.warmup). Start gunicorn with
+``--preload`` to load the application once in the master: the workers are
+forked with the URL resolver and serializers already warm, and share that
+memory copy-on-write.
+"""
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from smarthr360_backend import warmup
+
+        warmup.warm_up_master()
+
+
+def post_worker_init(worker):
+    from smarthr360_backend import warmup
+
+    warmup.warm_up_worker()
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class HrConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hr'
+
+    def ready(self):
+        from smarthr360_backend.versioning import track_versions
+
+        from .models import Department, FutureCompetency, Skill
+
+        track_versions(Department, FutureCompetency, Skill)
@@ -0,0 +1,566 @@
+"""
+Generate a synthetic organization for local performance work.
+
+Creates departments, users with a realistic role / group mix, a multi-level
+EmployeeProfile.manager tree, skills and evaluations, review cycles with items,
+goals and wellbeing surveys with responses. Output is deterministic for a given
+--seed and --employees.
+
+Rows are written with batched ``bulk_create``, which skips the per-row
+``post_save`` handlers on User: login attempts and group links are inserted
+here directly, and resource version counters are bumped once at the end.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import uuid
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+
+from accounts.grouping import (
+    AUDITOR_GROUPS,
+    DEFAULT_GROUPS,
+    ROLE_TO_BASE_GROUP,
+    SECURITY_ADMIN_GROUPS,
+    SUPPORT_GROUPS,
+)
+from accounts.models import LoginAttempt
+from hr.models import Department, EmployeeProfile, EmployeeSkill, FutureCompetency, Skill
+from reviews.models import Goal, PerformanceReview, ReviewCycle, ReviewItem
+from smarthr360_backend.versioning import bump_model_version
+from wellbeing.models import SurveyQuestion, SurveyResponse, WellbeingSurvey
+
+# Fixed reference date so a given seed always yields the same rows.
+ANCHOR_DATE = date(2025, 1, 1)
+CODE_PREFIX = "SEED-"
+
+FIRST_NAMES = [
+    "Adam", "Amina", "Camille", "Chloé", "David", "Emma", "Farah", "Hugo", "Inès", "Jules",
+    "Karim", "Léa", "Louis", "Manon", "Mehdi", "Nora", "Omar", "Paul", "Sarah", "Yanis",
+]
+LAST_NAMES = [
+    "Bernard", "Benali", "Dubois", "Durand", "Fournier", "Garcia", "Girard", "Haddad", "Lambert", "Laurent",
+    "Lefebvre", "Martin", "Mercier", "Moreau", "Petit", "Richard", "Robert", "Roux", "Simon", "Thomas",
+]
+DEPARTMENT_NAMES = [
+    "Engineering", "Finance", "Human Resources", "Marketing", "Operations", "Sales", "Legal",
+    "Customer Support", "Product", "Data", "Security", "Procurement", "Logistics", "Research",
+]
+SKILL_CATEGORIES = ["Technical", "Management", "Communication", "Domain", "Tooling"]
+JOB_TITLES = {
+    "EMPLOYEE": ["Analyst", "Engineer", "Specialist", "Coordinator", "Associate"],
+    "MANAGER": ["Team Lead", "Manager", "Head of Unit", "Director"],
+    "HR": ["HR Partner", "Recruiter", "HR Specialist"],
+    "ADMIN": ["Administrator"],
+}
+REVIEW_CRITERIA = ["Technical Skills", "Communication", "Ownership", "Teamwork", "Delivery"]
+GOAL_TITLES = ["Ship project milestone", "Improve test coverage", "Mentor a colleague", "Complete certification"]
+SURVEY_QUESTIONS = [
+    ("How would you rate your stress level this month?", SurveyQuestion.QuestionType.SCALE_1_5),
+    ("How satisfied are you with your workload?", SurveyQuestion.QuestionType.SCALE_1_5),
+    ("Do you feel supported by your manager?", SurveyQuestion.QuestionType.YES_NO),
+    ("How would you rate your work-life balance?", SurveyQuestion.QuestionType.SCALE_1_5),
+    ("Did you take time off in the last quarter?", SurveyQuestion.QuestionType.YES_NO),
+    ("Anything you would like to share?", SurveyQuestion.QuestionType.TEXT),
+]
+TEXT_ANSWERS = ["", "", "Feeling tired lately", "All good", "Too many meetings"]
+
+
+def _aware(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, dt_time(9, 0)))
+
+
+def _chunks(start: int, stop: int, size: int):
+    for lo in range(start, stop, size):
+        yield range(lo, min(lo + size, stop))
+
+
+class Command(BaseCommand):
+    help = "Generate a deterministic synthetic organization (users, HR, reviews, wellbeing) for load tests."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=1000, help="Number of employees (default: 1000).")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42).")
+        parser.add_argument(
+            "--span",
+            type=int,
+            default=8,
+            help="Direct reports per manager in the EmployeeProfile.manager tree (default: 8).",
+        )
+        parser.add_argument(
+            "--departments",
+            type=int,
+            default=None,
+            help="Number of departments (default: one per 500 employees, at least 5).",
+        )
+        parser.add_argument("--skills", type=int, default=60, help="Size of the skill catalog (default: 60).")
+        parser.add_argument(
+            "--skills-per-employee",
+            type=int,
+            default=4,
+            help="Average skill evaluations per employee (default: 4).",
+        )
+        parser.add_argument("--cycles", type=int, default=2, help="Review cycles with reviews (default: 2).")
+        parser.add_argument(
+            "--goals-per-employee",
+            type=int,
+            default=2,
+            help="Maximum goals per employee in the latest cycle (default: 2).",
+        )
+        parser.add_argument("--surveys", type=int, default=2, help="Wellbeing surveys (default: 2).")
+        parser.add_argument(
+            "--response-rate",
+            type=float,
+            default=0.6,
+            help="Share of employees answering each survey (default: 0.6).",
+        )
+        parser.add_argument(
+            "--password",
+            default=None,
+            help="Password for every generated user (hashed once). Default: unusable passwords.",
+        )
+        parser.add_argument(
+            "--email-domain",
+            default="seed.smarthr360.local",
+            help="Domain of generated email addresses (default: seed.smarthr360.local).",
+        )
+        parser.add_argument("--batch-size", type=int, default=2000, help="bulk_create batch size (default: 2000).")
+
+    def handle(self, *args, **options):
+        self.employees = options["employees"]
+        self.span = options["span"]
+        self.batch_size = options["batch_size"]
+        self.domain = options["email_domain"]
+        if self.employees < 1:
+            raise CommandError("--employees must be at least 1.")
+        if self.span < 2:
+            raise CommandError("--span must be at least 2.")
+        if self.batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if not 0 <= options["response_rate"] <= 1:
+            raise CommandError("--response-rate must be between 0 and 1.")
+
+        User = get_user_model()
+        if (
+            User.objects.filter(email__endswith=f"@{self.domain}").exists()
+            or Department.objects.filter(code__startswith=CODE_PREFIX).exists()
+        ):
+            raise CommandError("Seed data is already present. Run seed_org against an empty database.")
+
+        self.rng = random.Random(options["seed"])
+        self.started = time.monotonic()
+        self.totals: dict[str, int] = {}
+
+        with transaction.atomic():
+            departments = self._create_departments(options["departments"])
+            self._plan_people(departments)
+            self._create_users(options["password"])
+            self._create_profiles()
+            skills = self._create_skills(options["skills"], departments)
+            self._create_employee_skills(skills, options["skills_per_employee"])
+            cycles = self._create_review_cycles(options["cycles"])
+            self._create_reviews(cycles)
+            self._create_goals(cycles, options["goals_per_employee"])
+            self._create_surveys(options["surveys"], options["response_rate"])
+
+            for model in (Department, Skill, FutureCompetency, ReviewCycle, WellbeingSurvey, SurveyQuestion):
+                bump_model_version(model)
+
+        self._print_summary()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _bulk_create(self, model, objs) -> list:
+        created = model.objects.bulk_create(objs, batch_size=self.batch_size)
+        label = model._meta.label
+        self.totals[label] = self.totals.get(label, 0) + len(created)
+        return created
+
+    def _progress(self, message: str) -> None:
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(f"[{elapsed:7.1f}s] {message}")
+
+    def _print_summary(self) -> None:
+        self.stdout.write(self.style.MIGRATE_HEADING("Seed summary"))
+        for label, count in self.totals.items():
+            self.stdout.write(f"- {label}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.monotonic() - self.started:.1f}s."))
+
+    # ------------------------------------------------------------------
+    # Organization
+    # ------------------------------------------------------------------
+
+    def _create_departments(self, count: int | None) -> list[Department]:
+        count = count or max(5, self.employees // 500)
+        departments = []
+        for index in range(count):
+            base = DEPARTMENT_NAMES[index % len(DEPARTMENT_NAMES)]
+            suffix = f" {index // len(DEPARTMENT_NAMES) + 1}" if index >= len(DEPARTMENT_NAMES) else ""
+            departments.append(
+                Department(
+                    name=f"{base}{suffix}",
+                    code=f"{CODE_PREFIX}D{index + 1:04d}",
+                    description=f"Synthetic {base.lower()} department",
+                )
+            )
+        departments = self._bulk_create(Department, departments)
+        self._progress(f"{len(departments)} departments")
+        return departments
+
+    def _plan_people(self, departments: list[Department]) -> None:
+        """
+        Lay out the manager tree and roles before touching the database.
+
+        Employee ``i`` reports to ``(i - 1) // span``, so every level of the tree
+        is a contiguous index range and managers always precede their reports.
+        Departments are assigned to the first two levels below the root and
+        inherited further down.
+        """
+        rng = self.rng
+        n = self.employees
+        self.manager_of = [None] + [(i - 1) // self.span for i in range(1, n)]
+        self.depth = [0] * n
+        self.department_of = [departments[0].pk] * n
+        for i in range(1, n):
+            parent = self.manager_of[i]
+            self.depth[i] = self.depth[parent] + 1
+            if self.depth[i] <= 2:
+                self.department_of[i] = departments[i % len(departments)].pk
+            else:
+                self.department_of[i] = self.department_of[parent]
+
+        has_reports = [False] * n
+        for parent in self.manager_of[1:]:
+            has_reports[parent] = True
+
+        admins = max(1, n // 20000)
+        self.roles = []
+        for i in range(n):
+            if has_reports[i]:
+                role = "MANAGER"
+            elif i >= n - admins:
+                role = "ADMIN"
+            elif rng.random() < 0.02:
+                role = "HR"
+            else:
+                role = "EMPLOYEE"
+            self.roles.append(role)
+
+        self.extra_groups = []
+        for role in self.roles:
+            extra = []
+            draw = rng.random()
+            if role == "HR" and draw < 0.2:
+                extra.append("HR_ADMIN")
+            elif role == "MANAGER" and draw < 0.05:
+                extra.append("MANAGER_ADMIN")
+            elif draw < 0.005:
+                extra.extend(AUDITOR_GROUPS)
+            elif draw < 0.007:
+                extra.extend(SECURITY_ADMIN_GROUPS)
+            elif draw < 0.012:
+                extra.extend(SUPPORT_GROUPS)
+            self.extra_groups.append(extra)
+
+        self.hire_dates = [ANCHOR_DATE - timedelta(days=rng.randint(30, 365 * 15)) for _ in range(n)]
+        self._progress(f"planned {n} people, tree depth {max(self.depth)}")
+
+    def _create_users(self, password: str | None) -> None:
+        User = get_user_model()
+        rng = self.rng
+        shared_hash = make_password(password) if password else None
+
+        self.user_ids: list[int] = []
+        for batch in _chunks(0, self.employees, self.batch_size):
+            users = []
+            for i in batch:
+                email = f"user{i:06d}@{self.domain}"
+                joined = _aware(self.hire_dates[i])
+                users.append(
+                    User(
+                        email=email,
+                        username=email,
+                        first_name=rng.choice(FIRST_NAMES),
+                        last_name=rng.choice(LAST_NAMES),
+                        role=self.roles[i],
+                        is_staff=self.roles[i] == "ADMIN",
+                        password=shared_hash or make_password(None),
+                        date_joined=joined,
+                        is_email_verified=True,
+                        email_verified_at=joined,
+                    )
+                )
+            self.user_ids.extend(user.pk for user in self._bulk_create(User, users))
+
+        # What the User post_save handlers would have done row by row.
+        self._bulk_create(LoginAttempt, (LoginAttempt(user_id=user_id) for user_id in self.user_ids))
+
+        for name in DEFAULT_GROUPS:
+            Group.objects.get_or_create(name=name)
+        group_ids = dict(Group.objects.filter(name__in=DEFAULT_GROUPS).values_list("name", "id"))
+        through = User.groups.through
+        links: list[models.Model] = []
+        for i, user_id in enumerate(self.user_ids):
+            names = list(self.extra_groups[i])
+            base = ROLE_TO_BASE_GROUP.get(self.roles[i])
+            if base and self.roles[i] != "ADMIN":
+                names.append(base)
+            links.extend(through(user_id=user_id, group_id=group_ids[name]) for name in names)
+        self._bulk_create(through, links)
+        self._progress(f"{len(self.user_ids)} users with login attempts and {len(links)} group links")
+
+    def _create_profiles(self) -> None:
+        rng = self.rng
+        types = EmployeeProfile.EmploymentType
+        self.profile_ids: list[int] = [0] * self.employees
+
+        # Insert level by level so every manager already has a primary key.
+        level_start = 0
+        while level_start < self.employees:
+            level_stop = level_start + 1
+            while level_stop < self.employees and self.depth[level_stop] == self.depth[level_start]:
+                level_stop += 1
+            for batch in _chunks(level_start, level_stop, self.batch_size):
+                profiles = []
+                for i in batch:
+                    parent = self.manager_of[i]
+                    profiles.append(
+                        EmployeeProfile(
+                            user_id=self.user_ids[i],
+                            department_id=self.department_of[i],
+                            manager_id=self.profile_ids[parent] if parent is not None else None,
+                            job_title=rng.choice(JOB_TITLES[self.roles[i]]),
+                            employment_type=rng.choices(
+                                [types.FULL_TIME, types.PART_TIME, types.INTERN, types.CONTRACTOR],
+                                weights=[85, 7, 3, 5],
+                            )[0],
+                            hire_date=self.hire_dates[i],
+                            date_of_birth=self.hire_dates[i] - timedelta(days=rng.randint(22 * 365, 45 * 365)),
+                            phone_number=f"+33 6 {rng.randint(10000000, 99999999)}",
+                        )
+                    )
+                for i, profile in zip(batch, self._bulk_create(EmployeeProfile, profiles), strict=True):
+                    self.profile_ids[i] = profile.pk
+            level_start = level_stop
+        self._progress(f"{self.employees} employee profiles")
+
+    # ------------------------------------------------------------------
+    # Skills
+    # ------------------------------------------------------------------
+
+    def _hr_user_id(self) -> int:
+        for i, role in enumerate(self.roles):
+            if role in ("HR", "ADMIN"):
+                return self.user_ids[i]
+        return self.user_ids[0]
+
+    def _create_skills(self, count: int, departments: list[Department]) -> list[Skill]:
+        rng = self.rng
+        creator = self._hr_user_id()
+        skills = self._bulk_create(
+            Skill,
+            [
+                Skill(
+                    name=f"Skill {index + 1:03d}",
+                    code=f"{CODE_PREFIX}S{index + 1:04d}",
+                    category=SKILL_CATEGORIES[index % len(SKILL_CATEGORIES)],
+                    description="Synthetic skill",
+                    created_by_id=creator,
+                )
+                for index in range(count)
+            ],
+        )
+        competencies = []
+        for department in departments:
+            for skill in rng.sample(skills, min(3, len(skills))):
+                competencies.append(
+                    FutureCompetency(
+                        skill=skill,
+                        department=department,
+                        timeframe=rng.choice(["SHORT", "MEDIUM", "LONG"]),
+                        importance=rng.randint(1, 5),
+                        created_by_id=creator,
+                    )
+                )
+        self._bulk_create(FutureCompetency, competencies)
+        self._progress(f"{len(skills)} skills, {len(competencies)} future competencies")
+        return skills
+
+    def _create_employee_skills(self, skills: list[Skill], per_employee: int) -> None:
+        if not skills or per_employee < 1:
+            return
+        rng = self.rng
+        evaluated_at = _aware(ANCHOR_DATE - timedelta(days=30))
+        total = 0
+        for batch in _chunks(0, self.employees, self.batch_size):
+            rows = []
+            for i in batch:
+                parent = self.manager_of[i]
+                evaluator = self.user_ids[parent] if parent is not None else None
+                k = min(len(skills), rng.randint(max(1, per_employee - 2), per_employee + 2))
+                for skill in rng.sample(skills, k):
+                    level = rng.randint(1, 4)
+                    rows.append(
+                        EmployeeSkill(
+                            employee_id=self.profile_ids[i],
+                            skill_id=skill.pk,
+                            level=level,
+                            target_level=min(4, level + rng.randint(0, 1)),
+                            last_evaluated_by_id=evaluator,
+                            last_evaluated_at=evaluated_at if evaluator else None,
+                        )
+                    )
+            total += len(self._bulk_create(EmployeeSkill, rows))
+        self._progress(f"{total} skill evaluations")
+
+    # ------------------------------------------------------------------
+    # Reviews
+    # ------------------------------------------------------------------
+
+    def _create_review_cycles(self, count: int) -> list[ReviewCycle]:
+        cycles = []
+        for index in range(count):
+            # Half-year cycles walking back from the anchor; only the latest is active.
+            end = ANCHOR_DATE - timedelta(days=182 * index)
+            start = end - timedelta(days=181)
+            cycles.append(
+                ReviewCycle(
+                    name=f"H{2 - index % 2} {start.year} (seed)",
+                    start_date=start,
+                    end_date=end,
+                    is_active=index == 0,
+                )
+            )
+        cycles = self._bulk_create(ReviewCycle, cycles)
+        self._progress(f"{len(cycles)} review cycles")
+        return cycles
+
+    def _create_reviews(self, cycles: list[ReviewCycle]) -> None:
+        rng = self.rng
+        statuses = PerformanceReview.Status
+        reviews_total = items_total = 0
+        for cycle_index, cycle in enumerate(cycles):
+            for batch in _chunks(1, self.employees, self.batch_size):
+                reviews, scores = [], []
+                for i in batch:
+                    item_scores = [rng.randint(1, 5) for _ in range(rng.randint(2, len(REVIEW_CRITERIA)))]
+                    if cycle_index == 0:
+                        status = rng.choice([statuses.DRAFT, statuses.SUBMITTED, statuses.COMPLETED])
+                    else:
+                        status = statuses.COMPLETED
+                    reviews.append(
+                        PerformanceReview(
+                            employee_id=self.profile_ids[i],
+                            manager_id=self.profile_ids[self.manager_of[i]],
+                            cycle_id=cycle.pk,
+                            status=status,
+                            overall_score=Decimal(sum(item_scores) / len(item_scores)).quantize(Decimal("0.01")),
+                            manager_comment="Synthetic review",
+                        )
+                    )
+                    scores.append(item_scores)
+                reviews = self._bulk_create(PerformanceReview, reviews)
+                items = [
+                    ReviewItem(review_id=review.pk, criteria=REVIEW_CRITERIA[n], score=score)
+                    for review, item_scores in zip(reviews, scores, strict=True)
+                    for n, score in enumerate(item_scores)
+                ]
+                reviews_total += len(reviews)
+                items_total += len(self._bulk_create(ReviewItem, items))
+        self._progress(f"{reviews_total} reviews, {items_total} review items")
+
+    def _create_goals(self, cycles: list[ReviewCycle], per_employee: int) -> None:
+        if per_employee < 1:
+            return
+        rng = self.rng
+        cycle_id = cycles[0].pk if cycles else None
+        statuses = [Goal.Status.NOT_STARTED, Goal.Status.IN_PROGRESS, Goal.Status.DONE]
+        total = 0
+        for batch in _chunks(0, self.employees, self.batch_size):
+            goals = []
+            for i in batch:
+                parent = self.manager_of[i]
+                creator = self.user_ids[parent] if parent is not None else self.user_ids[i]
+                for _ in range(rng.randint(0, per_employee)):
+                    status = rng.choice(statuses)
+                    progress = {Goal.Status.NOT_STARTED: 0, Goal.Status.DONE: 100}.get(status, rng.randint(5, 95))
+                    goals.append(
+                        Goal(
+                            employee_id=self.profile_ids[i],
+                            cycle_id=cycle_id,
+                            title=rng.choice(GOAL_TITLES),
+                            status=status,
+                            progress_percent=progress,
+                            created_by_id=creator,
+                        )
+                    )
+            total += len(self._bulk_create(Goal, goals))
+        self._progress(f"{total} goals")
+
+    # ------------------------------------------------------------------
+    # Wellbeing
+    # ------------------------------------------------------------------
+
+    def _create_surveys(self, count: int, response_rate: float) -> None:
+        rng = self.rng
+        creator = self._hr_user_id()
+        surveys = self._bulk_create(
+            WellbeingSurvey,
+            [
+                WellbeingSurvey(
+                    title=f"Wellbeing pulse {index + 1} (seed)",
+                    description="Synthetic survey",
+                    is_active=index == 0,
+                    created_by_id=creator,
+                )
+                for index in range(count)
+            ],
+        )
+        questions = self._bulk_create(
+            SurveyQuestion,
+            [
+                SurveyQuestion(survey_id=survey.pk, text=text, type=qtype, order=order)
+                for survey in surveys
+                for order, (text, qtype) in enumerate(SURVEY_QUESTIONS, start=1)
+            ],
+        )
+        by_survey: dict[int, list[SurveyQuestion]] = {}
+        for question in questions:
+            by_survey.setdefault(question.survey_id, []).append(question)
+
+        total = 0
+        for survey in surveys:
+            for batch in _chunks(0, self.employees, self.batch_size):
+                responses = []
+                for i in batch:
+                    if rng.random() >= response_rate:
+                        continue
+                    answers = {}
+                    for question in by_survey[survey.pk]:
+                        if question.type == SurveyQuestion.QuestionType.SCALE_1_5:
+                            answers[str(question.pk)] = rng.randint(1, 5)
+                        elif question.type == SurveyQuestion.QuestionType.YES_NO:
+                            answers[str(question.pk)] = rng.choice(["yes", "no"])
+                        else:
+                            answers[str(question.pk)] = rng.choice(TEXT_ANSWERS)
+                    responses.append(
+                        SurveyResponse(
+                            survey_id=survey.pk,
+                            response_id=uuid.UUID(int=rng.getrandbits(128), version=4),
+                            answers=answers,
+                            department_id=self.department_of[i],
+                        )
+                    )
+                total += len(self._bulk_create(SurveyResponse, responses))
+        self._progress(f"{len(surveys)} surveys, {len(questions)} questions, {total} responses")
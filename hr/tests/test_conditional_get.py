@@ -0,0 +1,126 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from accounts.tests.helpers import authenticate
+from hr.models import Department, Skill
+
+
+@override_settings(CACHE_SHARED=True)
+class ConditionalGetTests(APITestCase):
+    """
+    ETag handling on reference-data endpoints.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.departments_url = "/api/hr/departments/"
+
+        self.hr_user = User.objects.create_user(
+            email="hr@example.com",
+            password="HrPass123!",
+            role=User.Role.HR,
+        )
+        self.emp_user = User.objects.create_user(
+            email="emp@example.com",
+            password="EmpPass123!",
+            role=User.Role.EMPLOYEE,
+        )
+        self.department = Department.objects.create(name="IT", code="IT")
+
+    def test_list_returns_validators_and_304_on_match(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+
+        first = self.client.get(self.departments_url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", first)
+        self.assertNotIn("Last-Modified", first)
+        self.assertIn("Authorization", first["Vary"])
+
+        second = self.client.get(self.departments_url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_304_skips_the_queryset(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        etag = self.client.get(self.departments_url)["ETag"]
+
+        # Authentication + the access-scope lookup only; no department query.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.departments_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_write_changes_collection_etag(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        etag = self.client.get(self.departments_url)["ETag"]
+
+        Department.objects.create(name="Finance", code="FIN")
+
+        response = self.client.get(self.departments_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_query_params_are_part_of_the_etag(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        etag = self.client.get(self.departments_url)["ETag"]
+
+        response = self.client.get(f"{self.departments_url}?page_size=1", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_collection_etag_depends_on_access_scope(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        emp_etag = self.client.get(self.departments_url)["ETag"]
+
+        authenticate(self.client, "hr@example.com", "HrPass123!")
+        response = self.client.get(self.departments_url, HTTP_IF_NONE_MATCH=emp_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], emp_etag)
+
+    def test_detail_etag_follows_the_object(self):
+        authenticate(self.client, "hr@example.com", "HrPass123!")
+        detail_url = f"{self.departments_url}{self.department.id}/"
+        other = Department.objects.create(name="Sales", code="SAL")
+
+        etag = self.client.get(detail_url)["ETag"]
+
+        # Updating another row leaves this object's ETag alone.
+        other.description = "Updated"
+        other.save()
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        patch = self.client.patch(detail_url, {"description": "Platform"}, format="json")
+        self.assertEqual(patch.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["description"], "Platform")
+
+    def test_related_model_change_invalidates_dependent_collection(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        url = "/api/hr/future-competencies/"
+        etag = self.client.get(url)["ETag"]
+
+        Skill.objects.create(name="Python", code="PY")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_modified_since_alone_is_ignored(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        self.client.get(self.departments_url)
+
+        response = self.client.get(self.departments_url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(CACHE_SHARED=False)
+    def test_off_without_a_shared_cache(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+
+        first = self.client.get(self.departments_url)
+        self.assertNotIn("ETag", first)
+
+        response = self.client.get(self.departments_url, HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,124 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from accounts.tests.helpers import authenticate
+from hr.models import Department
+from smarthr360_backend import response_cache
+
+
+@override_settings(CACHE_SHARED=True)
+class ResponseCacheTests(APITestCase):
+    """
+    Role-scoped response cache on reference-data list endpoints.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.departments_url = "/api/hr/departments/"
+
+        self.admin_user = User.objects.create_user(
+            email="admin@example.com",
+            password="AdminPass123!",
+            role=User.Role.ADMIN,
+        )
+        self.emp_user = User.objects.create_user(
+            email="emp@example.com",
+            password="EmpPass123!",
+            role=User.Role.EMPLOYEE,
+        )
+        Department.objects.create(name="IT", code="IT")
+
+    def _stats(self):
+        return response_cache.get_stats()["DepartmentListCreateView"]
+
+    def test_second_request_is_served_from_cache(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+
+        first = self.client.get(self.departments_url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        # Authentication + access scope only: neither count nor page query.
+        with self.assertNumQueries(2):
+            second = self.client.get(self.departments_url)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(self._stats()["hits"], 1)
+        self.assertEqual(self._stats()["misses"], 1)
+
+    def test_model_signal_invalidates_entry(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        self.client.get(self.departments_url)
+
+        Department.objects.create(name="Finance", code="FIN")
+
+        response = self.client.get(self.departments_url)
+        codes = {dep["code"] for dep in response.data["data"]["results"]}
+        self.assertEqual(codes, {"IT", "FIN"})
+        self.assertEqual(self._stats()["misses"], 2)
+
+    def test_query_params_are_normalized(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        self.client.get(f"{self.departments_url}?page=1&page_size=5")
+        self.client.get(f"{self.departments_url}?page_size=5&page=1")
+
+        self.assertEqual(self._stats()["hits"], 1)
+
+    @override_settings(ALLOWED_HOSTS=["testserver", "api.example.com", "hr.example.org"])
+    def test_pagination_links_follow_the_host(self):
+        Department.objects.create(name="Finance", code="FIN")
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        url = f"{self.departments_url}?page_size=1"
+        first = self.client.get(url, HTTP_HOST="api.example.com")
+
+        second = self.client.get(url, HTTP_HOST="hr.example.org")
+
+        self.assertEqual(first.data["data"]["next"], f"http://api.example.com{self.departments_url}?page=2&page_size=1")
+        self.assertEqual(second.data["data"]["next"], f"http://hr.example.org{self.departments_url}?page=2&page_size=1")
+        self.assertEqual(self._stats()["hits"], 1)
+
+    def test_entries_are_scoped_by_role(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        self.client.get(self.departments_url)
+
+        authenticate(self.client, "admin@example.com", "AdminPass123!")
+        self.client.get(self.departments_url)
+
+        self.assertEqual(self._stats()["hits"], 0)
+        self.assertEqual(self._stats()["misses"], 2)
+
+    @override_settings(RESPONSE_CACHE_TTL=0)
+    def test_zero_ttl_disables_cache(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        self.client.get(self.departments_url)
+        self.client.get(self.departments_url)
+
+        self.assertEqual(self._stats(), {"hits": 0, "misses": 0, "hit_ratio": None})
+
+    @override_settings(CACHE_SHARED=False)
+    def test_off_without_a_shared_cache(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        self.client.get(self.departments_url)
+        self.client.get(self.departments_url)
+
+        self.assertEqual(self._stats(), {"hits": 0, "misses": 0, "hit_ratio": None})
+
+    def test_stats_endpoint_is_admin_only(self):
+        authenticate(self.client, "emp@example.com", "EmpPass123!")
+        self.client.get(self.departments_url)
+        denied = self.client.get("/api/ops/response-cache/")
+        self.assertEqual(denied.status_code, status.HTTP_403_FORBIDDEN)
+
+        authenticate(self.client, "admin@example.com", "AdminPass123!")
+        response = self.client.get("/api/ops/response-cache/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["data"]["enabled"])
+        views = response.data["data"]["views"]
+        self.assertEqual(views["DepartmentListCreateView"]["misses"], 1)
+
+        reset = self.client.delete("/api/ops/response-cache/")
+        self.assertEqual(reset.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self._stats()["misses"], 0)
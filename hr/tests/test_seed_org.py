@@ -0,0 +1,86 @@
+from io import StringIO
+
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from accounts.models import LoginAttempt, User
+from hr.models import Department, EmployeeProfile, EmployeeSkill, Skill
+from reviews.models import PerformanceReview, ReviewCycle, ReviewItem
+from smarthr360_backend.versioning import get_versions
+from wellbeing.models import SurveyResponse, WellbeingSurvey
+
+
+def seed(**options):
+    options.setdefault("employees", 60)
+    options.setdefault("span", 4)
+    call_command("seed_org", stdout=StringIO(), **options)
+
+
+def snapshot():
+    return list(
+        EmployeeProfile.objects.order_by("user__email").values_list(
+            "user__email", "user__role", "manager__user__email", "department__code", "job_title"
+        )
+    )
+
+
+class SeedOrgCommandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_generates_a_consistent_organization(self):
+        seed()
+
+        self.assertEqual(User.objects.count(), 60)
+        self.assertEqual(EmployeeProfile.objects.count(), 60)
+        self.assertEqual(LoginAttempt.objects.count(), 60)
+        self.assertTrue(EmployeeSkill.objects.exists())
+        self.assertTrue(ReviewItem.objects.exists())
+        self.assertTrue(SurveyResponse.objects.exists())
+
+        # Multi-level tree with a single root; everyone with reports is a manager.
+        root = EmployeeProfile.objects.get(manager__isnull=True)
+        self.assertEqual(root.user.role, User.Role.MANAGER)
+        deepest = EmployeeProfile.objects.filter(manager__manager__manager__isnull=False)
+        self.assertTrue(deepest.exists())
+        managers = EmployeeProfile.objects.filter(team_members__isnull=False).distinct()
+        self.assertFalse(managers.exclude(user__role=User.Role.MANAGER).exists())
+
+        # Each review targets the employee's own manager.
+        review = PerformanceReview.objects.select_related("employee").first()
+        self.assertEqual(review.manager_id, review.employee.manager_id)
+
+    def test_role_groups_match_the_post_save_sync(self):
+        seed()
+
+        for role in (User.Role.EMPLOYEE, User.Role.MANAGER):
+            group = Group.objects.get(name=role)
+            self.assertEqual(
+                set(group.user_set.values_list("id", flat=True)),
+                set(User.objects.filter(role=role).values_list("id", flat=True)),
+            )
+        admin = User.objects.filter(role=User.Role.ADMIN).first()
+        self.assertFalse(admin.groups.filter(name__in=["EMPLOYEE", "MANAGER", "HR"]).exists())
+
+    def test_same_seed_gives_same_data(self):
+        seed(seed=7)
+        first = snapshot()
+
+        for model in (User, Department, Skill, ReviewCycle, WellbeingSurvey):
+            model.objects.all().delete()
+        seed(seed=7)
+
+        self.assertEqual(snapshot(), first)
+
+    def test_bumps_resource_versions(self):
+        before = get_versions([(Department, None)])
+        seed()
+        self.assertNotEqual(get_versions([(Department, None)]), before)
+
+    def test_refuses_to_seed_twice(self):
+        seed()
+        with self.assertRaises(CommandError):
+            seed()
@@ -1,16 +1,18 @@
 from django.urls import path
 
+from smarthr360_backend.async_views import read_view
+
 from .views import (
+    AsyncEmployeeMeView,
+    AsyncMyTeamListView,
     DepartmentDetailView,
     DepartmentListCreateView,
     EmployeeDetailView,
     EmployeeListCreateView,
-    EmployeeMeView,
     EmployeeSkillDetailView,
     EmployeeSkillListCreateView,
     FutureCompetencyDetailView,
     FutureCompetencyListCreateView,
-    MyTeamListView,
     SkillDetailView,
     SkillListCreateView,
 )
@@ -21,8 +23,8 @@ urlpatterns = [
     path("departments/<int:pk>/", DepartmentDetailView.as_view(), name="hr-department-detail"),
 
     # Employees
-    path("employees/me/", EmployeeMeView.as_view(), name="hr-employee-me"),
-    path("employees/my-team/", MyTeamListView.as_view(), name="hr-employee-my-team"),
+    path("employees/me/", read_view(AsyncEmployeeMeView), name="hr-employee-me"),
+    path("employees/my-team/", read_view(AsyncMyTeamListView), name="hr-employee-my-team"),
     path("employees/", EmployeeListCreateView.as_view(), name="hr-employee-list"),
     path("employees/<int:pk>/", EmployeeDetailView.as_view(), name="hr-employee-detail"),
 
@@ -20,7 +20,9 @@ from accounts.permissions import (
     IsManagerOrAuditorReadOnly,
     IsManagerOrAbove,
 )
-from smarthr360_backend.api_mixins import ApiResponseMixin
+from smarthr360_backend.api_mixins import ApiResponseMixin, CachedListMixin, ConditionalGetMixin, ReplicaReadMixin
+from smarthr360_backend.async_views import AsyncReadView
+from smarthr360_backend.pagination import DefaultPagination
 
 from .models import Department, EmployeeProfile, EmployeeSkill, FutureCompetency, Skill
 from .serializers import (
@@ -36,7 +38,8 @@ from .serializers import (
 #   DEPARTMENTS
 # --------------------------------------------------------------------------------------
 
-class DepartmentListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
+class DepartmentListCreateView(ConditionalGetMixin, CachedListMixin, ApiResponseMixin, generics.ListCreateAPIView):
+    versioned_models = (Department,)
     queryset = Department.objects.all().order_by("name")
     serializer_class = DepartmentSerializer
 
@@ -46,7 +49,8 @@ class DepartmentListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
         return [permissions.IsAuthenticated()]
 
 
-class DepartmentDetailView(ApiResponseMixin, generics.RetrieveUpdateDestroyAPIView):
+class DepartmentDetailView(ConditionalGetMixin, ApiResponseMixin, generics.RetrieveUpdateDestroyAPIView):
+    versioned_models = (Department,)
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
 
@@ -88,11 +92,21 @@ class EmployeeMeView(ApiResponseMixin, APIView):
         )
 
 
+class AsyncEmployeeMeView(AsyncReadView):
+    sync_view = EmployeeMeView
+
+    async def read(self, request):
+        profile, _ = await EmployeeProfile.objects.select_related("user", "department").aget_or_create(
+            user=request.user
+        )
+        return self.success_response(EmployeeProfileSerializer(profile).data)
+
+
 # --------------------------------------------------------------------------------------
 #   EMPLOYEE LIST + FILTERS ADDED HERE
 # --------------------------------------------------------------------------------------
 
-class EmployeeListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
+class EmployeeListCreateView(ReplicaReadMixin, ApiResponseMixin, generics.ListCreateAPIView):
     serializer_class = EmployeeProfileSerializer
     permission_classes = [IsHROrAuditorReadOnly]
 
@@ -166,11 +180,39 @@ class MyTeamListView(ApiResponseMixin, generics.ListAPIView):
         return EmployeeProfile.objects.none()
 
 
+class AsyncMyTeamListView(AsyncReadView):
+    sync_view = MyTeamListView
+    permission_classes = (IsManagerOrAuditorReadOnly,)
+
+    def get_queryset(self, user):
+        queryset = EmployeeProfile.objects.select_related("user", "department")
+        if has_hr_access(user) or is_auditor(user):
+            return queryset.all()
+        # Same rows as the sync view's manager=user.employee_profile, without
+        # fetching the profile first (no profile: no team).
+        return queryset.filter(manager__user=user)
+
+    async def read(self, request):
+        drf_request = self.drf_request(request)
+        paginator = DefaultPagination()
+        page = await paginator.apaginate_queryset(self.get_queryset(request.user), drf_request)
+        payload = {
+            "count": paginator.page.paginator.count,
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+            "results": EmployeeProfileSerializer(page, many=True).data,
+        }
+        return self.success_response(
+            payload, meta={"page": paginator.page.number, "page_size": paginator.get_page_size(drf_request)}
+        )
+
+
 # --------------------------------------------------------------------------------------
 #   SKILLS
 # --------------------------------------------------------------------------------------
 
-class SkillListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
+class SkillListCreateView(ConditionalGetMixin, CachedListMixin, ApiResponseMixin, generics.ListCreateAPIView):
+    versioned_models = (Skill,)
     queryset = Skill.objects.filter(is_active=True).order_by("name")
     serializer_class = SkillSerializer
 
@@ -187,7 +229,8 @@ class SkillListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
             serializer.save(created_by=self.request.user)
 
 
-class SkillDetailView(ApiResponseMixin, generics.RetrieveUpdateDestroyAPIView):
+class SkillDetailView(ConditionalGetMixin, ApiResponseMixin, generics.RetrieveUpdateDestroyAPIView):
+    versioned_models = (Skill,)
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
 
@@ -234,7 +277,7 @@ class EmployeeSkillListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
     def get_queryset(self):
         user = self.request.user
         qs = EmployeeSkill.objects.select_related(
-            "employee__user", "employee__department", "skill"
+            "employee__user", "employee__department", "skill", "last_evaluated_by"
         )
 
         if has_hr_access(user) or is_auditor(user):
@@ -281,7 +324,7 @@ class EmployeeSkillDetailView(ApiResponseMixin, generics.RetrieveUpdateAPIView):
     def get_queryset(self):
         user = self.request.user
         qs = EmployeeSkill.objects.select_related(
-            "employee__user", "employee__department", "skill"
+            "employee__user", "employee__department", "skill", "last_evaluated_by"
         )
 
         if has_hr_access(user) or is_auditor(user):
@@ -310,7 +353,10 @@ class EmployeeSkillDetailView(ApiResponseMixin, generics.RetrieveUpdateAPIView):
 #   FUTURE COMPETENCIES
 # --------------------------------------------------------------------------------------
 
-class FutureCompetencyListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
+class FutureCompetencyListCreateView(
+    ConditionalGetMixin, CachedListMixin, ApiResponseMixin, generics.ListCreateAPIView
+):
+    versioned_models = (FutureCompetency, Skill, Department)
     queryset = FutureCompetency.objects.select_related("skill", "department")
     serializer_class = FutureCompetencySerializer
 
@@ -340,7 +386,8 @@ class FutureCompetencyListCreateView(ApiResponseMixin, generics.ListCreateAPIVie
         )
 
 
-class FutureCompetencyDetailView(ApiResponseMixin, generics.RetrieveUpdateDestroyAPIView):
+class FutureCompetencyDetailView(ConditionalGetMixin, ApiResponseMixin, generics.RetrieveUpdateDestroyAPIView):
+    versioned_models = (FutureCompetency, Skill, Department)
     queryset = FutureCompetency.objects.select_related("skill", "department")
     serializer_class = FutureCompetencySerializer
 
@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import OutgoingEmail
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "created_at", "sent_at", "next_attempt_at")
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    readonly_fields = (
+        "subject",
+        "body",
+        "from_email",
+        "to",
+        "attempts",
+        "last_error",
+        "created_at",
+        "sent_at",
+    )
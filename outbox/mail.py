@@ -0,0 +1,60 @@
+"""
+Queue transactional e-mail instead of sending it inside the request.
+
+``queue_mail()`` writes an ``OutgoingEmail`` row in the caller's transaction,
+so the e-mail exists only if the request's writes commit. The ``send_outbox``
+worker delivers it (see ``outbox.sender``).
+
+``queue_mass_mail()`` does the same for many e-mails with one INSERT.
+
+With ``EMAIL_OUTBOX_ENABLED`` off (the default: turn it on only where a
+``send_outbox`` process runs) the e-mail is sent immediately with
+``send_mail``, as before.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.mail import send_mail, send_mass_mail
+
+from .models import OutgoingEmail
+
+
+def queue_mail(subject: str, message: str, recipient_list: list[str], from_email: str | None = None):
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    if not settings.EMAIL_OUTBOX_ENABLED:
+        send_mail(
+            subject=subject,
+            message=message,
+            from_email=from_email,
+            recipient_list=recipient_list,
+            fail_silently=True,
+        )
+        return None
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email,
+        to=list(recipient_list),
+    )
+
+
+def queue_mass_mail(datatuple) -> int:
+    """
+    Queue many e-mails at once.
+
+    ``datatuple`` holds ``(subject, message, from_email, recipient_list)``
+    tuples, as for ``send_mass_mail``; ``from_email`` may be None.
+    """
+    messages = [
+        (subject, message, from_email or settings.DEFAULT_FROM_EMAIL, list(recipient_list))
+        for subject, message, from_email, recipient_list in datatuple
+    ]
+    if not settings.EMAIL_OUTBOX_ENABLED:
+        # One connection for all of them.
+        return send_mass_mail(messages, fail_silently=True)
+    OutgoingEmail.objects.bulk_create(
+        OutgoingEmail(subject=subject, body=message, from_email=from_email, to=recipient_list)
+        for subject, message, from_email, recipient_list in messages
+    )
+    return len(messages)
@@ -0,0 +1,67 @@
+"""
+Deliver queued e-mail (see ``outbox.sender``).
+
+    manage.py send_outbox            # run until SIGTERM / Ctrl-C
+    manage.py send_outbox --once     # drain what is due now, then exit (cron)
+"""
+
+from __future__ import annotations
+
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from outbox.sender import drain
+
+
+class Command(BaseCommand):
+    help = "Send queued transactional e-mail in batches over one SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Send everything due now, then exit.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help="E-mails sent per SMTP connection (default: EMAIL_OUTBOX_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait when the outbox is empty (default: 2).",
+        )
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+
+        batch_size = options["batch_size"]
+        totals = {"sent": 0, "retried": 0, "failed": 0}
+        try:
+            while not self._stopping:
+                close_old_connections()
+                result = drain(batch_size=batch_size)
+                for key in totals:
+                    totals[key] += getattr(result, key)
+                if result.claimed and options["verbosity"] > 1:
+                    self.stdout.write(f"sent={result.sent} retried={result.retried} failed={result.failed}")
+                if result.claimed == batch_size:
+                    continue  # More may be due: no pause.
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Outbox: {totals['sent']} sent, {totals['retried']} to retry, {totals['failed']} failed."
+            )
+        )
+
+    def _stop(self, signum, frame):
+        self._stopping = True
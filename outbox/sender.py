@@ -0,0 +1,133 @@
+"""
+Deliver queued ``OutgoingEmail`` rows.
+
+``drain()`` claims up to ``batch_size`` due e-mails, sends them over one SMTP
+connection (or whatever ``EMAIL_BACKEND`` is configured) and records the
+outcome. A failed send is retried with exponential backoff, starting at
+``EMAIL_OUTBOX_RETRY_DELAY`` seconds. After ``EMAIL_OUTBOX_MAX_ATTEMPTS``
+attempts the e-mail is marked FAILED.
+
+The claim is a lease: ``next_attempt_at`` moves ``EMAIL_OUTBOX_LEASE_SECONDS``
+ahead and commits before anything is sent, so no row lock or transaction is
+held while talking to the mail server. Each outcome is then saved on its own.
+Rows are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database
+supports it, else with one conditional UPDATE per row, so several workers can
+drain the same outbox. Delivery is at-least-once: the e-mails of a worker
+killed in the middle of a batch are due again when the lease ends, and those
+it had sent without recording it are sent again.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 3600
+UPDATE_FIELDS = ["status", "attempts", "next_attempt_at", "last_error", "sent_at"]
+
+
+@dataclass
+class DrainResult:
+    claimed: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+def _claim(batch_size: int, now) -> list[OutgoingEmail]:
+    """Lease up to ``batch_size`` due e-mails; the lease is committed on return."""
+    lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+    due = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.Status.PENDING,
+        next_attempt_at__lte=now,
+    ).order_by("next_attempt_at", "id")
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            batch = list(due.select_for_update(skip_locked=True)[:batch_size])
+            OutgoingEmail.objects.filter(pk__in=[email.pk for email in batch]).update(next_attempt_at=lease_until)
+        return batch
+
+    batch = []
+    for email in due[:batch_size]:
+        claimed = OutgoingEmail.objects.filter(
+            pk=email.pk,
+            status=OutgoingEmail.Status.PENDING,
+            next_attempt_at=email.next_attempt_at,
+        ).update(next_attempt_at=lease_until)
+        if claimed:
+            batch.append(email)
+    return batch
+
+
+def _record_failure(email: OutgoingEmail, exc: Exception, now, max_attempts: int, result: DrainResult) -> None:
+    email.attempts += 1
+    email.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+    if email.attempts >= max_attempts:
+        email.status = OutgoingEmail.Status.FAILED
+        result.failed += 1
+        logger.error("Giving up on outgoing email %s after %d attempts: %s", email.pk, email.attempts, exc)
+    else:
+        delay = min(settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1), MAX_RETRY_DELAY)
+        email.next_attempt_at = now + timedelta(seconds=delay)
+        result.retried += 1
+        logger.warning(
+            "Outgoing email %s failed (attempt %d), retrying in %ss: %s", email.pk, email.attempts, delay, exc
+        )
+
+
+def drain(*, batch_size: int | None = None, max_attempts: int | None = None) -> DrainResult:
+    """Send one batch of due e-mails."""
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    result = DrainResult()
+    now = timezone.now()
+
+    batch = _claim(batch_size, now)
+    result.claimed = len(batch)
+    if not batch:
+        return result
+
+    mail_connection = get_connection(fail_silently=False)
+    try:
+        mail_connection.open()
+    except Exception as exc:
+        # Server unreachable: the whole batch waits for the next attempt.
+        for email in batch:
+            _record_failure(email, exc, now, max_attempts, result)
+        OutgoingEmail.objects.bulk_update(batch, UPDATE_FIELDS)
+        return result
+
+    try:
+        for email in batch:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=email.to,
+                connection=mail_connection,
+            )
+            try:
+                message.send()
+            except Exception as exc:
+                _record_failure(email, exc, now, max_attempts, result)
+            else:
+                email.attempts += 1
+                email.status = OutgoingEmail.Status.SENT
+                email.sent_at = timezone.now()
+                email.last_error = ""
+                result.sent += 1
+            email.save(update_fields=UPDATE_FIELDS)
+    finally:
+        mail_connection.close()
+    return result
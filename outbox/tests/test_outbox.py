@@ -0,0 +1,184 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import EmailVerificationToken, User
+from outbox.mail import queue_mail
+from outbox.models import OutgoingEmail
+from outbox.sender import drain
+
+
+class WorkerKilled(BaseException):
+    pass
+
+
+def kill_worker():
+    raise WorkerKilled
+
+
+class RecordingBackend(locmem.EmailBackend):
+    """locmem backend that counts connections and refuses some recipients."""
+
+    opened = 0
+    refused: set[str] = set()
+    unreachable = False
+    on_send = None
+
+    def open(self):
+        if RecordingBackend.unreachable:
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        RecordingBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        if RecordingBackend.on_send:
+            RecordingBackend.on_send()
+        for message in messages:
+            if set(message.to) & RecordingBackend.refused:
+                raise SMTPRecipientsRefused({address: (550, b"No such user") for address in message.to})
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_OUTBOX_ENABLED=True,
+    EMAIL_BACKEND="outbox.tests.test_outbox.RecordingBackend",
+    EMAIL_OUTBOX_MAX_ATTEMPTS=3,
+    EMAIL_OUTBOX_RETRY_DELAY=30,
+)
+class OutboxTests(TestCase):
+    def setUp(self):
+        RecordingBackend.opened = 0
+        RecordingBackend.refused = set()
+        RecordingBackend.unreachable = False
+        RecordingBackend.on_send = None
+
+    def _queue(self, to="someone@example.com"):
+        return queue_mail("Hello", "Body", [to])
+
+    def test_register_queues_instead_of_sending(self):
+        response = APIClient().post(
+            "/api/auth/register/",
+            {"email": "new@example.com", "username": "new", "password": "StrongPass123!"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(mail.outbox, [])
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.to, ["new@example.com"])
+        self.assertIn("verify-email?token=", email.body)
+
+    def test_register_rolls_back_without_its_email(self):
+        with mock.patch("accounts.serializers.queue_mail", side_effect=DatabaseError("outbox down")):
+            with self.assertRaises(DatabaseError):
+                APIClient().post(
+                    "/api/auth/register/",
+                    {"email": "new@example.com", "username": "new", "password": "StrongPass123!"},
+                    format="json",
+                )
+
+        self.assertFalse(User.objects.filter(email="new@example.com").exists())
+        self.assertFalse(EmailVerificationToken.objects.exists())
+
+    def test_rolled_back_request_queues_nothing(self):
+        with transaction.atomic():
+            self._queue()
+            transaction.set_rollback(True)
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+    def test_batch_is_sent_over_one_connection(self):
+        for index in range(3):
+            self._queue(f"user{index}@example.com")
+
+        result = drain()
+
+        self.assertEqual((result.claimed, result.sent), (3, 3))
+        self.assertEqual(RecordingBackend.opened, 1)
+        self.assertEqual([message.to for message in mail.outbox], [[f"user{i}@example.com"] for i in range(3)])
+        self.assertEqual(OutgoingEmail.objects.filter(status=OutgoingEmail.Status.SENT).count(), 3)
+        self.assertEqual(drain().claimed, 0)
+
+    def test_claimed_batch_is_leased_while_sending(self):
+        self._queue("first@example.com")
+        self._queue("second@example.com")
+        # A second worker draining meanwhile finds nothing due.
+        concurrent = []
+        RecordingBackend.on_send = lambda: concurrent.append(drain().claimed)
+
+        result = drain()
+
+        self.assertEqual(result.sent, 2)
+        self.assertEqual(concurrent, [0, 0])
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_lease_of_a_dead_worker_expires(self):
+        self._queue()
+        RecordingBackend.on_send = kill_worker
+
+        with self.assertRaises(WorkerKilled):
+            drain()
+        self.assertEqual(drain().claimed, 0)
+
+        RecordingBackend.on_send = None
+        email = OutgoingEmail.objects.get()
+        self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=250))
+        OutgoingEmail.objects.update(next_attempt_at=email.next_attempt_at - timedelta(seconds=300))
+        self.assertEqual(drain().sent, 1)
+
+    def test_failed_send_is_retried_with_backoff_then_abandoned(self):
+        RecordingBackend.refused = {"bad@example.com"}
+        email = self._queue("bad@example.com")
+        self._queue("good@example.com")
+
+        result = drain()
+        self.assertEqual((result.sent, result.retried), (1, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("SMTPRecipientsRefused", email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=25))
+
+        # Not due yet.
+        self.assertEqual(drain().claimed, 0)
+
+        for expected_attempts in (2, 3):
+            OutgoingEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+            drain()
+            email.refresh_from_db()
+            self.assertEqual(email.attempts, expected_attempts)
+        self.assertEqual(email.status, OutgoingEmail.Status.FAILED)
+
+    def test_unreachable_server_postpones_the_batch(self):
+        RecordingBackend.unreachable = True
+        self._queue()
+        self._queue()
+
+        result = drain()
+
+        self.assertEqual(result.retried, 2)
+        self.assertEqual(OutgoingEmail.objects.filter(status=OutgoingEmail.Status.PENDING, attempts=1).count(), 2)
+
+    def test_command_once(self):
+        self._queue()
+        out = StringIO()
+        call_command("send_outbox", "--once", stdout=out)
+
+        self.assertIn("1 sent", out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+
+
+@override_settings(EMAIL_OUTBOX_ENABLED=False)
+class InlineFallbackTests(TestCase):
+    def test_disabled_outbox_sends_immediately(self):
+        self.assertIsNone(queue_mail("Hello", "Body", ["someone@example.com"]))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(OutgoingEmail.objects.exists())
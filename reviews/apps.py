@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
+
+    def ready(self):
+        from smarthr360_backend.versioning import track_versions
+
+        from .models import ReviewCycle
+
+        track_versions(ReviewCycle)
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import Avg
 
 
 class ReviewCycle(models.Model):
@@ -85,12 +86,7 @@ class PerformanceReview(models.Model):
         """
         Recompute overall_score as the average of all ReviewItem scores.
         """
-        items = self.items.all()
-        if not items.exists():
-            self.overall_score = None
-        else:
-            total = sum(i.score for i in items)
-            self.overall_score = total / items.count()
+        self.overall_score = self.items.aggregate(average=Avg("score"))["average"]
         self.save(update_fields=["overall_score"])
 
 class ReviewItem(models.Model):
@@ -0,0 +1,11 @@
+from tasks.registry import task
+
+from .models import PerformanceReview
+
+
+@task(max_attempts=5, retry_delay=5)
+def recalculate_review_score(review_id):
+    """Refresh a review's overall_score after its items changed."""
+    review = PerformanceReview.objects.filter(pk=review_id).first()
+    if review is not None:
+        review.recalculate_overall_score()
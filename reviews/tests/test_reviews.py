@@ -1,10 +1,12 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework import status
 
 from accounts.models import User
 from accounts.tests.helpers import authenticate
 from hr.models import Department, EmployeeProfile
 from reviews.models import PerformanceReview, ReviewCycle
+from tasks.models import Task
+from tasks.worker import Worker
 
 
 class ReviewsModuleTests(TestCase):
@@ -190,6 +192,32 @@ class ReviewsModuleTests(TestCase):
             PerformanceReview.Status.COMPLETED,
         )
 
+    @override_settings(TASKS_RUN_INLINE=False)
+    def test_item_changes_queue_the_overall_score_recalculation(self):
+        review = PerformanceReview.objects.create(
+            employee=self.emp1_profile,
+            manager=self.manager_profile,
+            cycle=self.cycle,
+        )
+        self.auth_as(self.manager_user)
+        for score in (3, 4):
+            resp = self.client.post(
+                f"/api/reviews/{review.id}/items/",
+                {"criteria": f"Criteria {score}", "score": score},
+                format="json",
+            )
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+        review.refresh_from_db()
+        self.assertIsNone(review.overall_score)
+        self.assertEqual(Task.objects.filter(name="reviews.tasks.recalculate_review_score").count(), 2)
+
+        worker = Worker()
+        while worker.run_one():
+            pass
+        review.refresh_from_db()
+        self.assertEqual(float(review.overall_score), 3.5)
+
     def test_employee_can_see_only_own_reviews(self):
         # Manager creates one review for emp1
         self.auth_as(self.manager_user)
@@ -7,7 +7,7 @@ from rest_framework.views import APIView
 
 from accounts.access import has_hr_access, has_manager_access, is_auditor, is_manager
 from hr.models import EmployeeProfile
-from smarthr360_backend.api_mixins import ApiResponseMixin
+from smarthr360_backend.api_mixins import ApiResponseMixin, CachedListMixin, ConditionalGetMixin, ReplicaReadMixin
 
 from .models import Goal, PerformanceReview, ReviewCycle, ReviewItem
 from .serializers import (
@@ -16,13 +16,15 @@ from .serializers import (
     ReviewCycleSerializer,
     ReviewItemSerializer,
 )
+from .tasks import recalculate_review_score
 
 
-class ReviewCycleListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
+class ReviewCycleListCreateView(ConditionalGetMixin, CachedListMixin, ApiResponseMixin, generics.ListCreateAPIView):
     """
     GET  /api/reviews/cycles/   → list all cycles (any authenticated)
     POST /api/reviews/cycles/   → create cycle (HR or ADMIN)
     """
+    versioned_models = (ReviewCycle,)
     queryset = ReviewCycle.objects.all()
     serializer_class = ReviewCycleSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -34,11 +36,12 @@ class ReviewCycleListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
         serializer.save()
 
 
-class ReviewCycleDetailView(ApiResponseMixin, generics.RetrieveUpdateAPIView):
+class ReviewCycleDetailView(ConditionalGetMixin, ApiResponseMixin, generics.RetrieveUpdateAPIView):
     """
     GET   /api/reviews/cycles/<id>/
     PATCH /api/reviews/cycles/<id>/   → HR or ADMIN
     """
+    versioned_models = (ReviewCycle,)
     queryset = ReviewCycle.objects.all()
     serializer_class = ReviewCycleSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -73,7 +76,7 @@ def _reviews_queryset_for_user(user):
     return qs.none()
 
 
-class PerformanceReviewListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
+class PerformanceReviewListCreateView(ReplicaReadMixin, ApiResponseMixin, generics.ListCreateAPIView):
     """
     GET  /api/reviews/
         HR/Admin → all
@@ -330,7 +333,7 @@ class ReviewItemListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
                 raise PermissionDenied("You cannot add items to this review.")
 
         item = serializer.save(review=review)
-        review.recalculate_overall_score()
+        recalculate_review_score.enqueue(review.pk)
         return item
 
 
@@ -369,7 +372,7 @@ class ReviewItemDetailView(ApiResponseMixin, generics.RetrieveUpdateDestroyAPIVi
                 raise PermissionDenied("You cannot edit this item.")
 
         serializer.save()
-        review.recalculate_overall_score()
+        recalculate_review_score.enqueue(review.pk)
 
     def perform_destroy(self, instance):
         review = instance.review
@@ -387,7 +390,7 @@ class ReviewItemDetailView(ApiResponseMixin, generics.RetrieveUpdateDestroyAPIVi
                 raise PermissionDenied("You cannot delete this item.")
 
         super().perform_destroy(instance)
-        review.recalculate_overall_score()
+        recalculate_review_score.enqueue(review.pk)
 
 
 def _goals_queryset_for_user(user):
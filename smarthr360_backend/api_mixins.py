@@ -1,6 +1,20 @@
+import hashlib
+from contextlib import ExitStack
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
 from rest_framework import status as drf_status
 from rest_framework.response import Response
 
+from accounts.access import access_scope
+
+from . import db_router, response_cache
+from .versioning import get_versions
+
 
 class ApiResponseMixin:
     def success_response(self, data, status=drf_status.HTTP_200_OK, headers=None, meta=None):
@@ -38,7 +52,8 @@ class ApiResponseMixin:
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             # Build the paginated payload
-            count = getattr(self.paginator.page.paginator, "count", None)
+            # Cursor pagination has no page object and no total count.
+            count = getattr(getattr(getattr(self.paginator, "page", None), "paginator", None), "count", None)
             next_link = self.paginator.get_next_link()
             prev_link = self.paginator.get_previous_link()
             page_number = getattr(getattr(self.paginator, "page", None), "number", None)
@@ -84,3 +99,157 @@ class ApiResponseMixin:
                 response._is_rendered = False
 
         return response
+
+
+# The mixins below are documented with comments: drf-spectacular publishes the
+# first class docstring of a view's MRO as its operation description.
+
+
+class VersionedResourceMixin:
+    # Shared plumbing for views whose responses are keyed on resource versions.
+    #
+    # ``versioned_models`` lists every model whose changes alter the response:
+    # the view's own model first, then related models it serializes. Detail
+    # requests use the row counter of the first model
+    # (see smarthr360_backend.versioning).
+
+    versioned_models: tuple = ()
+
+    # Provided by the view class (GenericAPIView or AsyncReadView).
+    kwargs: dict[str, Any]
+    lookup_field: str
+    lookup_url_kwarg: str | None
+
+    def get_access_scope(self, request) -> str:
+        if not hasattr(self, "_access_scope"):
+            self._access_scope = access_scope(request.user)
+        return self._access_scope
+
+    def get_resource_versions(self) -> list[int]:
+        if not hasattr(self, "_resource_versions"):
+            primary, *related = self.versioned_models
+            pk = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+            specs = [(primary, pk)] + [(model, None) for model in related]
+            self._resource_versions = get_versions(specs)
+        return self._resource_versions
+
+
+class ConditionalGetMixin(VersionedResourceMixin):
+    # Conditional GET (ETag) for list and detail endpoints.
+    #
+    # The ETag is built from resource version counters, the full request path and
+    # the caller's access scope, so a matching If-None-Match is answered with 304
+    # before the view's queryset runs. No Last-Modified: two writes within the
+    # same second would share it, and If-Modified-Since would then answer 304 for
+    # a stale copy.
+    #
+    # Off unless settings.CACHE_SHARED: with a per-process cache, a write only
+    # bumps the counters of the worker that handled it.
+
+    def conditional_get_enabled(self) -> bool:
+        return getattr(settings, "CACHE_SHARED", False)
+
+    def get_etag(self, request) -> str:
+        parts = [request.get_full_path(), self.get_access_scope(request)]
+        parts.extend(str(version) for version in self.get_resource_versions())
+        digest = hashlib.md5("|".join(parts).encode(), usedforsecurity=False).hexdigest()
+        return quote_etag(digest)
+
+    def _set_validators(self, response, etag):
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Authorization",))
+        return response
+
+    def get(self, request, *args, **kwargs):
+        if not self.conditional_get_enabled():
+            return super().get(request, *args, **kwargs)
+
+        etag = self.get_etag(request)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return self._set_validators(not_modified, etag)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == drf_status.HTTP_200_OK:
+            self._set_validators(response, etag)
+        return response
+
+
+class CachedListMixin(VersionedResourceMixin):
+    # Serve list responses from the shared response cache.
+    #
+    # Entries are keyed by view, path, normalized query params, access scope and
+    # resource versions (see smarthr360_backend.response_cache), so model signals
+    # invalidate them implicitly. Set ``response_cache_ttl`` to override
+    # settings.RESPONSE_CACHE_TTL for one view; 0 disables caching. Pagination
+    # links are stored host-relative, so every host the API answers on shares
+    # one entry and gets links to itself.
+    #
+    # Off unless settings.CACHE_SHARED: with a per-process cache, a write would
+    # not change the versions, hence the keys, seen by the other workers.
+
+    response_cache_ttl: int | None = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        response_cache.register_view(cls.__name__)
+
+    def get_response_cache_ttl(self) -> int:
+        if not getattr(settings, "CACHE_SHARED", False):
+            return 0
+        if self.response_cache_ttl is not None:
+            return self.response_cache_ttl
+        return getattr(settings, "RESPONSE_CACHE_TTL", 0)
+
+    def get_response_cache_key(self, request) -> str:
+        return response_cache.make_key(
+            type(self).__name__,
+            request.path,
+            request.query_params,
+            self.get_access_scope(request),
+            self.get_resource_versions(),
+        )
+
+    def list(self, request, *args, **kwargs):
+        ttl = self.get_response_cache_ttl()
+        if ttl <= 0:
+            return super().list(request, *args, **kwargs)
+
+        view_name = type(self).__name__
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            response_cache.record(view_name, hit=True)
+            return Response(response_cache.absolute_links(data, request))
+
+        response_cache.record(view_name, hit=False)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == drf_status.HTTP_200_OK:
+            cache.set(key, response_cache.relative_links(response.data), ttl)
+        return response
+
+
+class ReplicaReadMixin:
+    # Read from the replica database for GET/HEAD requests when one is configured
+    # (see smarthr360_backend.db_router).
+    #
+    # Authentication and permission checks still read the primary; the handler's
+    # queries go to the replica unless the caller wrote within the sticky window.
+    # Replicas lag, so this is for views whose responses are neither cached nor
+    # validated against resource versions: a stale read would be stored under a
+    # fresh version.
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if issubclass(cls, VersionedResourceMixin):
+            raise ImproperlyConfigured(f"{cls.__name__}: ReplicaReadMixin cannot serve versioned responses.")
+
+    def dispatch(self, request, *args, **kwargs):
+        with ExitStack() as self._db_routing:
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if db_router.should_use_replica(request):
+            self._db_routing.enter_context(db_router.use_replica())
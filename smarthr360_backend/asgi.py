@@ -12,5 +12,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'smarthr360_backend.config.production')
+# Served by an event loop: route the hot read endpoints to their async views.
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
+# Requests do not share threads: a persistent connection per thread would stay
+# open long after its request.
+os.environ.setdefault('DATABASE_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -0,0 +1,166 @@
+"""
+Async read endpoints for the ASGI profile.
+
+DRF views are sync only. Under ASGI each of them takes a thread for the whole
+request, so a worker serves as many requests at once as it has threads. The
+hottest read endpoints have async twins built on ``AsyncReadView``:
+
+- GET and HEAD run on the event loop. The view authenticates the bearer
+  token with ``AsyncJWTAuthentication``, loads the user's group names once
+  (``accounts.access.aload_group_names``) so the role helpers and DRF
+  permission classes answer without a query, and reads with the async ORM.
+- The other methods (PATCH, PUT, OPTIONS) are passed to ``sync_view``, the
+  DRF view the async one mirrors, in a worker thread.
+
+Responses use the same envelope, status codes and error bodies as the DRF
+views. ``read_view()`` picks the async view when ``ASYNC_READ_VIEWS`` is on
+(the default under ``asgi.py``) and the DRF view otherwise; the OpenAPI schema
+always describes the DRF view.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import ClassVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied as DjangoPermissionDenied
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, permissions, status as drf_status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from accounts.access import aload_group_names
+from accounts.authentication import AsyncJWTAuthentication
+
+from .api_mixins import ConditionalGetMixin, VersionedResourceMixin
+
+
+class AsyncReadView(ABC, View):
+    sync_view: ClassVar[type[APIView] | None] = None  # DRF view class this view mirrors
+    permission_classes = (permissions.IsAuthenticated,)
+    authentication_class = AsyncJWTAuthentication
+    renderer = JSONRenderer()
+
+    # Set by as_view(): the sync view function serving the other methods.
+    sync_view_func = None
+
+    @classmethod
+    def get_sync_view(cls) -> type[APIView]:
+        if cls.sync_view is None:
+            raise ImproperlyConfigured(f"{cls.__name__} does not set sync_view.")
+        return cls.sync_view
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        if cls.__abstractmethods__:
+            # Fail when the URL conf loads, not on the first request.
+            raise TypeError(f"{cls.__name__} does not implement {', '.join(sorted(cls.__abstractmethods__))}().")
+        sync_view = cls.get_sync_view()
+        view = super().as_view(sync_view_func=sync_to_async(sync_view.as_view()), **initkwargs)
+        # Schema generators only look at DRF views: describe the sync twin.
+        view.cls = sync_view
+        view.initkwargs = {}
+        return csrf_exempt(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return await self.sync_view_func(request, *args, **kwargs)
+        try:
+            await self.initial(request)
+            return await self.get(request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(request, exc)
+
+    async def initial(self, request) -> None:
+        authenticator = self.authentication_class()
+        result = await authenticator.aauthenticate(request)
+        self.authenticated = result is not None
+        request.user, request.auth = result if result is not None else (AnonymousUser(), None)
+        await aload_group_names(request.user)
+        for permission in self.get_permissions():
+            if not permission.has_permission(request, self):
+                if not self.authenticated:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
+
+    async def get(self, request, *args, **kwargs):
+        return await self.read(request, *args, **kwargs)
+
+    @abstractmethod
+    async def read(self, request, *args, **kwargs) -> HttpResponse:
+        """Answer an authenticated, permitted GET or HEAD."""
+
+    def render(self, data, status=drf_status.HTTP_200_OK) -> HttpResponse:
+        return HttpResponse(self.renderer.render(data), status=status, content_type="application/json")
+
+    def success_response(self, data, meta=None) -> HttpResponse:
+        """The ``{"data": ..., "meta": {"success": true, ...}}`` envelope of ApiResponseMixin."""
+        return self.render({"data": data, "meta": {"success": True, **(meta or {})}})
+
+    def handle_exception(self, request, exc) -> HttpResponse:
+        """Error responses as rest_framework.views.exception_handler builds them."""
+        if isinstance(exc, Http404):
+            exc = exceptions.NotFound(*exc.args)
+        elif isinstance(exc, DjangoPermissionDenied):
+            exc = exceptions.PermissionDenied(*exc.args)
+        if not isinstance(exc, exceptions.APIException):
+            raise exc
+
+        headers = {}
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            headers["WWW-Authenticate"] = self.authentication_class().authenticate_header(request)
+        if getattr(exc, "wait", None):
+            headers["Retry-After"] = str(int(exc.wait))
+
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        response = self.render(data, status=exc.status_code)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def drf_request(self, request) -> Request:
+        """A DRF wrapper for helpers that read ``query_params`` (pagination links)."""
+        return Request(request)
+
+
+class AsyncConditionalGetMixin(VersionedResourceMixin):
+    """``ConditionalGetMixin`` for ``AsyncReadView`` subclasses."""
+
+    lookup_field = "pk"
+    lookup_url_kwarg = None
+
+    conditional_get_enabled = ConditionalGetMixin.conditional_get_enabled
+    get_etag = ConditionalGetMixin.get_etag
+    _set_validators = ConditionalGetMixin._set_validators
+
+    async def get(self, request, *args, **kwargs):
+        if not self.conditional_get_enabled():
+            return await super().get(request, *args, **kwargs)
+
+        # Version counters live in the cache, which may be a network round trip.
+        etag = await sync_to_async(self.get_etag)(request)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return self._set_validators(not_modified, etag)
+
+        response = await super().get(request, *args, **kwargs)
+        if response.status_code == drf_status.HTTP_200_OK:
+            self._set_validators(response, etag)
+        return response
+
+
+def read_view(view_class: type[AsyncReadView]):
+    """``view_class.as_view()`` with ``ASYNC_READ_VIEWS`` on, else its DRF ``sync_view``."""
+    if settings.ASYNC_READ_VIEWS:
+        return view_class.as_view()
+    return view_class.get_sync_view().as_view()
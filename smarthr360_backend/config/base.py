@@ -38,21 +38,40 @@ INSTALLED_APPS = [
     'hr',
     'reviews',
     'wellbeing',
+    'outbox',
+    'tasks',
+    'smarthr360_backend',  # Project-wide management commands
 ]
 
 MIDDLEWARE = [
+    'smarthr360_backend.middleware.HealthCheckMiddleware',  # Outermost: probes skip the rest of the chain
+    'smarthr360_backend.middleware.QueryInstrumentationMiddleware',  # Sees every query of the other requests
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Serve static files (after SecurityMiddleware)
     'corsheaders.middleware.CorsMiddleware',  # Must be before CommonMiddleware
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'smarthr360_backend.middleware.PathScopedMiddleware',  # Runs SESSION_MIDDLEWARE outside the API
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'smarthr360_backend.middleware.AdminIPWhitelistMiddleware',  # Admin IP restriction
+    'smarthr360_backend.middleware.ReplicaStickinessMiddleware',  # Read-your-writes (replica only)
+]
+
+# Session-based middleware, run in this order by PathScopedMiddleware. The API
+# authenticates with JWT only: requests under SESSIONLESS_PATH_PREFIXES skip
+# it, except the password login (django-axes lockout responses).
+SESSION_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'axes.middleware.AxesMiddleware',  # Login protection - after AuthenticationMiddleware
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'smarthr360_backend.middleware.AdminIPWhitelistMiddleware',  # Admin IP restriction
 ]
+SESSIONLESS_PATH_PREFIXES = ['/api/']
+SESSIONLESS_PATH_EXCEPTIONS = ['/api/auth/login/']
+
+# The admin and axes look for their middleware in MIDDLEWARE only; they are in
+# SESSION_MIDDLEWARE.
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410', 'axes.W002']
 
 ROOT_URLCONF = 'smarthr360_backend.urls'
 
@@ -79,14 +98,80 @@ AUTHENTICATION_BACKENDS = [
 ]
 
 # Database
+# DATABASE_CONN_MAX_AGE: seconds a thread keeps its connection open (0 = close at
+# the end of each request). Under ASGI every request runs in a new thread, so
+# asgi.py defaults it to 0; use DATABASE_POOL to reuse connections there.
 DATABASES = {
     'default': dj_database_url.config(
         default=config('DATABASE_URL', default='sqlite:///' + str(BASE_DIR / 'db.sqlite3')),
-        conn_max_age=600,
+        conn_max_age=config('DATABASE_CONN_MAX_AGE', default=600, cast=int),
+        conn_health_checks=True,
+    )
+}
+
+# Read replica (optional). GET/HEAD requests to the views using ReplicaReadMixin
+# (stats and large lists) read from DATABASE_REPLICA_URL. After a write request,
+# a user's reads stay on the primary for DATABASE_REPLICA_STICKY_SECONDS so they
+# see their own changes despite replication lag. Those pins live in the default
+# cache, so a replica requires a shared CACHE_BACKEND (CACHE_SHARED) with several
+# workers. Tests use the default database.
+DATABASE_REPLICA_URL = config('DATABASE_REPLICA_URL', default='')
+DATABASE_REPLICA_STICKY_SECONDS = config('DATABASE_REPLICA_STICKY_SECONDS', default=10, cast=int)
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=DATABASES['default']['CONN_MAX_AGE'],
         conn_health_checks=True,
     )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['smarthr360_backend.db_router.ReplicaRouter']
+
+# Connection pool (PostgreSQL with psycopg 3 only). Each process keeps a pool of
+# DATABASE_POOL_MIN_SIZE..DATABASE_POOL_MAX_SIZE connections; requests borrow one
+# and give it back when they end instead of each thread holding its own. A request
+# waits up to DATABASE_POOL_TIMEOUT seconds for a free connection.
+DATABASE_POOL = config('DATABASE_POOL', default=False, cast=bool)
+for _database in DATABASES.values():
+    if DATABASE_POOL and _database['ENGINE'] == 'django.db.backends.postgresql':
+        # Pooled connections cannot be persistent.
+        _database['CONN_MAX_AGE'] = 0
+        _database.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': config('DATABASE_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DATABASE_POOL_MAX_SIZE', default=4, cast=int),
+            'timeout': config('DATABASE_POOL_TIMEOUT', default=10.0, cast=float),
+        }
+
+# Cache
+# LocMemCache is per-process: fine for dev/tests, but production with several
+# gunicorn workers should point CACHE_BACKEND/CACHE_LOCATION at a shared backend
+# (e.g. django.core.cache.backends.redis.RedisCache) so resource versions and
+# cached responses stay consistent across workers.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='smarthr360-default'),
+        'TIMEOUT': config('CACHE_DEFAULT_TIMEOUT', default=300, cast=int),
+    }
 }
 
+# Whether every process serving requests sees the same default cache.
+# Conditional GET and the response cache are off when it does not. The
+# development server is a single process, so LocMemCache is shared here;
+# production.py decides from CACHE_BACKEND.
+CACHE_SHARED = True
+
+# Response cache for reference-data list endpoints (seconds; 0 disables)
+RESPONSE_CACHE_TTL = config('RESPONSE_CACHE_TTL', default=300, cast=int)
+
+# Warm each gunicorn worker up before it takes traffic (see gunicorn.conf.py and
+# smarthr360_backend.warmup): URL resolver, serializers, database, reference-data
+# caches, password-hashing pool.
+WORKER_WARMUP = config('WORKER_WARMUP', default=False, cast=bool)
+
+# /health/ready/ (see smarthr360_backend.health) checks the databases and
+# migrations at most once per HEALTH_READINESS_TTL seconds per process.
+HEALTH_READINESS_TTL = config('HEALTH_READINESS_TTL', default=5, cast=float)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -102,6 +187,24 @@ AUTH_PASSWORD_VALIDATORS = [
         'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
     },
 ]
+# Hash and verify passwords in a per-worker process pool (see accounts/hashing.py)
+PASSWORD_HASH_POOL = config('PASSWORD_HASH_POOL', default=False, cast=bool)
+# Processes of the pool; 0 = one per CPU
+PASSWORD_HASH_WORKERS = config('PASSWORD_HASH_WORKERS', default=0, cast=int)
+# Jobs queued or running in the pool at once; 0 = 4 per pool process
+PASSWORD_HASH_MAX_PENDING = config('PASSWORD_HASH_MAX_PENDING', default=0, cast=int)
+# Seconds a request waits for a free slot before getting a 503
+PASSWORD_HASH_QUEUE_TIMEOUT = config('PASSWORD_HASH_QUEUE_TIMEOUT', default=5.0, cast=float)
+
+# Bulk user provisioning (POST /api/auth/users/bulk/, see accounts/provisioning.py)
+PROVISIONING_MAX_USERS = config('PROVISIONING_MAX_USERS', default=5000, cast=int)
+# Users given a password per request (each one is hashed); the others get invitations
+PROVISIONING_MAX_PASSWORDS = config('PROVISIONING_MAX_PASSWORDS', default=200, cast=int)
+PROVISIONING_INVITE_EXPIRATION_HOURS = config('PROVISIONING_INVITE_EXPIRATION_HOURS', default=72, cast=int)
+
+# Serve the async twins of the hottest read endpoints (smarthr360_backend/async_views.py);
+# asgi.py turns this on unless the environment says otherwise
+ASYNC_READ_VIEWS = config('ASYNC_READ_VIEWS', default=False, cast=bool)
 
 # Internationalization
 LANGUAGE_CODE = 'en-us'
@@ -165,8 +268,14 @@ SIMPLE_JWT = {
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
     "TOKEN_TYPE_CLAIM": "token_type",
     "JTI_CLAIM": "jti",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.TokenRefreshSerializer",
 }
 
+# Per-process filter of revoked refresh tokens (see accounts/revocation.py):
+# refreshes skip the blacklist lookup; the filter is synced from the table.
+JWT_REVOCATION_FILTER = config('JWT_REVOCATION_FILTER', default=False, cast=bool)
+JWT_REVOCATION_FILTER_SYNC_SECONDS = config('JWT_REVOCATION_FILTER_SYNC_SECONDS', default=5.0, cast=float)
+
 # Email configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
@@ -175,6 +284,20 @@ EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@smarthr360.com')
+# Transactional e-mail outbox (see outbox/): queue in the request, deliver with
+# `manage.py send_outbox`. Off: send inline with send_mail.
+EMAIL_OUTBOX_ENABLED = config('EMAIL_OUTBOX_ENABLED', default=False, cast=bool)
+EMAIL_OUTBOX_BATCH_SIZE = config('EMAIL_OUTBOX_BATCH_SIZE', default=50, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_OUTBOX_RETRY_DELAY = config('EMAIL_OUTBOX_RETRY_DELAY', default=30, cast=int)
+EMAIL_OUTBOX_LEASE_SECONDS = config('EMAIL_OUTBOX_LEASE_SECONDS', default=300, cast=int)
+
+# Background tasks (see tasks/): queued in the database, run by `manage.py run_worker`.
+# Inline: run inside enqueue() instead, without a worker.
+TASKS_RUN_INLINE = config('TASKS_RUN_INLINE', default=True, cast=bool)
+TASKS_CONCURRENCY = config('TASKS_CONCURRENCY', default=2, cast=int)
+TASKS_POLL_INTERVAL = config('TASKS_POLL_INTERVAL', default=1.0, cast=float)
+TASKS_LEASE_SECONDS = config('TASKS_LEASE_SECONDS', default=600, cast=int)
 
 # CORS configuration
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', default='', cast=Csv())
@@ -205,6 +328,20 @@ X_FRAME_OPTIONS = 'DENY'
 # Login lockout configuration (aligned with django-axes)
 LOGIN_MAX_ATTEMPTS = config('LOGIN_MAX_ATTEMPTS', default=5, cast=int)
 LOGIN_LOCKOUT_MINUTES = config('LOGIN_LOCKOUT_MINUTES', default=30, cast=int)
+# Where failures are counted until a lock begins (see accounts/lockout.py):
+# - accounts.lockout.DatabaseLockoutBackend: every failure since the last success
+# - accounts.lockout.CacheLockoutBackend: the same count, kept in the cache; needs
+#   CACHE_SHARED
+LOGIN_LOCKOUT_BACKEND = config('LOGIN_LOCKOUT_BACKEND', default='accounts.lockout.DatabaseLockoutBackend')
+
+# LoginActivity audit records (see accounts/audit.py): inserted one by one in the
+# request (default), or queued per worker and written in batches by a thread.
+LOGIN_ACTIVITY_ASYNC = config('LOGIN_ACTIVITY_ASYNC', default=False, cast=bool)
+LOGIN_ACTIVITY_BATCH_SIZE = config('LOGIN_ACTIVITY_BATCH_SIZE', default=100, cast=int)
+LOGIN_ACTIVITY_FLUSH_INTERVAL = config('LOGIN_ACTIVITY_FLUSH_INTERVAL', default=2.0, cast=float)
+LOGIN_ACTIVITY_MAX_QUEUE = config('LOGIN_ACTIVITY_MAX_QUEUE', default=5000, cast=int)
+# Days of LoginActivity kept by the purge_login_activity command
+LOGIN_ACTIVITY_RETENTION_DAYS = config('LOGIN_ACTIVITY_RETENTION_DAYS', default=365, cast=int)
 
 # Django Axes configuration (login protection)
 AXES_ENABLED = config('AXES_ENABLED', default=True, cast=bool)
@@ -214,10 +351,43 @@ AXES_LOCK_OUT_PARAMETERS = ["username", "ip_address"]
 AXES_USERNAME_FORM_FIELD = "email"
 AXES_RESET_ON_SUCCESS = True
 
+# Per-request SQL instrumentation (Server-Timing header + structured log line)
+QUERY_INSTRUMENTATION_ENABLED = config('QUERY_INSTRUMENTATION_ENABLED', default=True, cast=bool)
+QUERY_INSTRUMENTATION_REPEAT_THRESHOLD = config('QUERY_INSTRUMENTATION_REPEAT_THRESHOLD', default=10, cast=int)
+
+# Logging
+# smarthr360.requests emits one JSON line per request at INFO and flags likely
+# N+1 patterns at WARNING.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'smarthr360.requests': {
+            'handlers': ['console'],
+            'level': config('REQUEST_LOG_LEVEL', default='WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
 # Admin panel security
 ADMIN_ENABLED = config('ADMIN_ENABLED', default=True, cast=bool)
 ADMIN_IP_WHITELIST = config('ADMIN_IP_WHITELIST', default='', cast=Csv())
 
+# OpenAPI schema served from OPENAPI_SCHEMA_FILE (built by `manage.py openapi_schema`)
+# instead of being introspected on every request; generated once per process when
+# the file is missing. Swagger UI and ReDoc load it from /api/schema/.
+OPENAPI_SCHEMA_PRECOMPUTED = config('OPENAPI_SCHEMA_PRECOMPUTED', default=False, cast=bool)
+OPENAPI_SCHEMA_FILE = config('OPENAPI_SCHEMA_FILE', default=str(BASE_DIR / 'schema.yml'))
+# Import the schemas.py decorators and the drf-spectacular views on first use
+# (schema generation, /api/schema/, /docs/, /redoc/) instead of at startup.
+OPENAPI_DEFER_IMPORTS = config('OPENAPI_DEFER_IMPORTS', default=False, cast=bool)
+
 # DRF Spectacular configuration for API documentation
 SPECTACULAR_SETTINGS = {
     "TITLE": "SmartHR360 API",
@@ -228,6 +398,7 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
     "SCHEMA_PATH_PREFIX": "/api/",
+    "PREPROCESSING_HOOKS": ["smarthr360_backend.docs.apply_deferred_schemas"],
     "SWAGGER_UI_SETTINGS": {
         "deepLinking": True,
         "persistAuthorization": True,
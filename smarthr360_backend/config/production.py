@@ -11,3 +11,24 @@ CSRF_COOKIE_SECURE = config('CSRF_COOKIE_SECURE', default=False, cast=bool)  # n
 SECURE_HSTS_SECONDS = config('SECURE_HSTS_SECONDS', default=0, cast=int)  # noqa: F405
 SECURE_HSTS_INCLUDE_SUBDOMAINS = config('SECURE_HSTS_INCLUDE_SUBDOMAINS', default=False, cast=bool)  # noqa: F405
 SECURE_HSTS_PRELOAD = config('SECURE_HSTS_PRELOAD', default=False, cast=bool)  # noqa: F405
+
+# Several gunicorn workers: a per-process cache is not shared between them
+CACHE_SHARED = CACHES['default']['BACKEND'] not in (  # noqa: F405
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Batch LoginActivity inserts off the request path
+LOGIN_ACTIVITY_ASYNC = config('LOGIN_ACTIVITY_ASYNC', default=True, cast=bool)  # noqa: F405
+
+# Hash and verify passwords in a bounded process pool per web worker
+PASSWORD_HASH_POOL = config('PASSWORD_HASH_POOL', default=True, cast=bool)  # noqa: F405
+
+# Serve the committed OpenAPI schema file instead of introspecting the API
+OPENAPI_SCHEMA_PRECOMPUTED = config('OPENAPI_SCHEMA_PRECOMPUTED', default=True, cast=bool)  # noqa: F405
+
+# Import API docs code on first use, not in every worker at startup
+OPENAPI_DEFER_IMPORTS = config('OPENAPI_DEFER_IMPORTS', default=True, cast=bool)  # noqa: F405
+
+# Warm workers up (caches, connections, hashing pool) before they take traffic
+WORKER_WARMUP = config('WORKER_WARMUP', default=True, cast=bool)  # noqa: F405
@@ -0,0 +1,85 @@
+"""
+Health and metrics of the PostgreSQL connection pool.
+
+With ``DATABASE_POOL`` on, Django's PostgreSQL backend keeps one psycopg 3
+``ConnectionPool`` per process and alias: a request borrows a connection on
+its first query and returns it when the request ends. psycopg_pool counts the
+requests for a connection and the time they waited; the helpers below expose
+those counters for the current process (one gunicorn worker).
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def get_pool(alias: str = DEFAULT_DB_ALIAS):
+    """The ``psycopg_pool.ConnectionPool`` of ``alias``, or ``None`` without pooling."""
+    return getattr(connections[alias], "pool", None)
+
+
+def get_stats(alias: str = DEFAULT_DB_ALIAS) -> dict | None:
+    """Pool size and wait-time counters since the start (or the last reset)."""
+    pool = get_pool(alias)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    requests = stats.get("requests_num", 0)
+    wait_ms = stats.get("requests_wait_ms", 0)
+    return {
+        "min_size": pool.min_size,
+        "max_size": pool.max_size,
+        "timeout": pool.timeout,
+        "size": stats.get("pool_size", 0),
+        "available": stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": requests,
+        "requests_queued": stats.get("requests_queued", 0),
+        "requests_timed_out": stats.get("requests_errors", 0),
+        "wait_ms_total": wait_ms,
+        "wait_ms_mean": round(wait_ms / requests, 2) if requests else 0.0,
+        "connections_opened": stats.get("connections_num", 0),
+        "connection_errors": stats.get("connections_errors", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+        "bad_returns": stats.get("returns_bad", 0),
+    }
+
+
+def reset_stats(alias: str = DEFAULT_DB_ALIAS) -> None:
+    pool = get_pool(alias)
+    if pool is not None:
+        pool.pop_stats()
+
+
+def check_health(alias: str = DEFAULT_DB_ALIAS, timeout: float = 2.0) -> dict:
+    """
+    Borrow a connection and run ``SELECT 1``.
+
+    With pooling the connection comes from the pool, waiting at most
+    ``timeout`` seconds: a pool that is exhausted or cannot reach the server
+    is reported unhealthy. Without pooling the check uses the thread's
+    connection.
+    """
+    pool = get_pool(alias)
+    error: str | None = None
+    start = time.perf_counter()
+    try:
+        if pool is None:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+        else:
+            pool.open()
+            with pool.connection(timeout=timeout) as connection:
+                connection.execute("SELECT 1")
+    except Exception as exc:
+        healthy, error = False, f"{type(exc).__name__}: {exc}"
+    else:
+        healthy = True
+    return {
+        "pooled": pool is not None,
+        "healthy": healthy,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        "error": error,
+    }
@@ -0,0 +1,82 @@
+"""
+Read-replica routing.
+
+With ``DATABASE_REPLICA_URL`` set, the settings add a ``replica`` database and
+``ReplicaRouter``. Reads still go to ``default`` unless the code runs inside
+``use_replica()``: ``ReplicaReadMixin`` enters it for GET/HEAD requests to the
+views that opt in, after authentication and permission checks. Reads inside a
+transaction on ``default`` and all writes go to ``default``.
+
+Read-your-writes: ``ReplicaStickinessMiddleware`` pins a user to the primary
+for ``DATABASE_REPLICA_STICKY_SECONDS`` after each successful write request.
+The pin lives in the default cache, so the middleware refuses to run unless
+``CACHE_SHARED``: with a per-process cache, it would only hold in the worker
+that served the write.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = "replica"
+STICKY_KEY_PREFIX = "replica-sticky"
+
+_read_alias: ContextVar[str | None] = ContextVar("read_alias", default=None)
+
+
+def replica_enabled() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def use_replica():
+    """Send the reads made in this block (and this context) to the replica."""
+    token = _read_alias.set(REPLICA_ALIAS)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def _sticky_key(user) -> str:
+    return f"{STICKY_KEY_PREFIX}:{user.pk}"
+
+
+def pin_to_primary(user) -> None:
+    seconds = getattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 10)
+    if seconds > 0:
+        cache.set(_sticky_key(user), 1, seconds)
+
+
+def is_pinned(user) -> bool:
+    return bool(user.is_authenticated and cache.get(_sticky_key(user)))
+
+
+def should_use_replica(request) -> bool:
+    """GET/HEAD by a caller who has not written within the sticky window."""
+    return replica_enabled() and request.method in ("GET", "HEAD") and not is_pinned(request.user)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        # Inside a transaction on the primary, read its uncommitted writes. This
+        # also keeps TestCase, which wraps each test in one, on the test database.
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same rows.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS
@@ -0,0 +1,66 @@
+"""
+API documentation wiring that does not import drf-spectacular.
+
+With ``OPENAPI_DEFER_IMPORTS`` on (the production default), the ``extend_schema``
+decorators of the apps' ``schemas.py`` and the views behind ``/api/schema/``,
+``/docs/`` and ``/redoc/`` are imported on first use instead of at startup:
+
+- ``@schema("accounts.schemas.login_schema")`` records the view class, and
+  ``apply_deferred_schemas()``, a drf-spectacular preprocessing hook, applies
+  the decorators before any view is inspected.
+- ``docs_view("drf_spectacular.views.SpectacularSwaggerView", ...)`` imports
+  the view class on the first request to its URL.
+
+With the setting off, both import at once, as the plain decorator or
+``as_view()`` would.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
+
+_lock = threading.Lock()
+_deferred: list[tuple[type, str]] = []
+
+
+def schema(path: str):
+    """Class decorator applying the ``extend_schema`` decorator at ``path``."""
+
+    def decorator(view):
+        if not settings.OPENAPI_DEFER_IMPORTS:
+            return import_string(path)(view)
+        with _lock:
+            _deferred.append((view, path))
+        return view
+
+    return decorator
+
+
+def apply_deferred_schemas(endpoints=None):
+    """Apply the recorded decorators, in declaration order, once."""
+    with _lock:
+        while _deferred:
+            view, path = _deferred.pop(0)
+            import_string(path)(view)
+    return endpoints
+
+
+def docs_view(path: str, **initkwargs):
+    """``as_view(**initkwargs)`` of the view class at ``path``."""
+    if not settings.OPENAPI_DEFER_IMPORTS:
+        return import_string(path).as_view(**initkwargs)
+
+    view = None
+
+    @csrf_exempt
+    def deferred_view(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return deferred_view
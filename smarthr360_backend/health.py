@@ -0,0 +1,100 @@
+"""
+Liveness and readiness probes.
+
+``HealthCheckMiddleware`` answers the probe paths before the rest of the
+middleware chain runs: no session, CSRF, authentication, axes or URL
+resolution.
+
+- ``/health/live/``: the process answers requests. No I/O.
+- ``/health/ready/``: every database answers ``SELECT 1`` and the default one
+  has no unapplied migration. The report is kept for ``HEALTH_READINESS_TTL``
+  seconds per process, so frequent probes cost a lookup; one probe runs the
+  checks while concurrent ones wait for its result.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from . import db_pool
+
+logger = logging.getLogger(__name__)
+
+LIVENESS_PATH = "/health/live/"
+READINESS_PATH = "/health/ready/"
+
+_lock = threading.Lock()
+_cached: tuple[float, dict] | None = None
+
+
+def liveness() -> dict:
+    return {"status": "alive"}
+
+
+def check_databases() -> dict[str, bool]:
+    """``{alias: healthy}``, through the connection pool when there is one."""
+    healthy = {}
+    for alias in connections:
+        health = db_pool.check_health(alias)
+        if not health["healthy"]:
+            logger.warning("Readiness: database %r unavailable: %s", alias, health["error"])
+        healthy[alias] = health["healthy"]
+    return healthy
+
+
+def pending_migrations(alias: str = DEFAULT_DB_ALIAS) -> int:
+    """Number of migrations on disk not applied to ``alias``."""
+    from django.db.migrations.executor import MigrationExecutor
+
+    executor = MigrationExecutor(connections[alias])
+    return len(executor.migration_plan(executor.loader.graph.leaf_nodes()))
+
+
+def check_readiness() -> dict:
+    """Run the checks now."""
+    databases = check_databases()
+    pending = None
+    if databases.get(DEFAULT_DB_ALIAS):
+        try:
+            pending = pending_migrations()
+        except Exception:
+            logger.warning("Readiness: migration check failed", exc_info=True)
+    ready = all(databases.values()) and pending == 0
+    return {
+        "status": "ready" if ready else "unavailable",
+        "databases": databases,
+        "pending_migrations": pending,
+    }
+
+
+def get_cached_readiness() -> dict | None:
+    """The last report while it is fresh, else ``None``."""
+    cached = _cached
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    return None
+
+
+def readiness() -> dict:
+    """The cached report, or a new one once it is ``HEALTH_READINESS_TTL`` seconds old."""
+    global _cached
+    report = get_cached_readiness()
+    if report is not None:
+        return report
+    with _lock:
+        report = get_cached_readiness()
+        if report is None:
+            report = check_readiness()
+            _cached = (time.monotonic() + getattr(settings, "HEALTH_READINESS_TTL", 5), report)
+    return report
+
+
+def reset() -> None:
+    """Forget the cached report (tests)."""
+    global _cached
+    _cached = None
@@ -0,0 +1,35 @@
+"""
+Build the OpenAPI schema file served with OPENAPI_SCHEMA_PRECOMPUTED.
+
+    python manage.py openapi_schema            # write OPENAPI_SCHEMA_FILE
+    python manage.py openapi_schema --check    # exit 1 when the file is stale
+"""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from smarthr360_backend import openapi
+
+
+class Command(BaseCommand):
+    help = "Write the OpenAPI schema to OPENAPI_SCHEMA_FILE, or check that the file matches the code."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", help="Schema file (default: settings.OPENAPI_SCHEMA_FILE).")
+        parser.add_argument(
+            "--check", action="store_true", help="Do not write; fail when the file is missing or out of date."
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["file"]) if options["file"] else openapi.schema_file()
+
+        if options["check"]:
+            if openapi.is_stale(path):
+                raise CommandError(f"{path} is out of date: run `python manage.py openapi_schema`.")
+            self.stdout.write(f"{path} is up to date.")
+            return
+
+        _, content = openapi.generate()
+        path.write_bytes(content)
+        self.stdout.write(f"Wrote {path} ({len(content)} bytes).")
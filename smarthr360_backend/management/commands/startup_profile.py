@@ -0,0 +1,116 @@
+"""
+Profile worker cold start: what a gunicorn/uvicorn worker imports and builds
+before it can answer its first request.
+
+    python manage.py startup_profile                  # WSGI, top 25 packages
+    python manage.py startup_profile --app asgi --by module --top 40
+    OPENAPI_DEFER_IMPORTS=False python manage.py startup_profile   # compare
+
+Each run is a fresh interpreter with the current settings module: it imports
+the WSGI/ASGI application and loads the URLconf (done by the first request).
+Wall time and resident memory are the best of ``--repeat`` plain runs; the
+per-module breakdown comes from one extra run under ``python -X importtime``
+(self time: the module's own code, cumulative: including what it imports).
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+APPLICATIONS = {"wsgi": "smarthr360_backend.wsgi", "asgi": "smarthr360_backend.asgi"}
+
+STARTUP_SCRIPT = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+from django.urls import get_resolver
+get_resolver().url_patterns
+ready = time.perf_counter() - start
+rss_kb = 0
+try:
+    with open("/proc/self/status") as status:
+        rss_kb = next(int(line.split()[1]) for line in status if line.startswith("VmRSS:"))
+except OSError:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1 if sys.platform != "darwin" else 1024)
+print(json.dumps({"ready_ms": ready * 1000, "rss_kb": rss_kb, "modules": len(sys.modules)}))
+"""
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def parse_importtime(stderr):
+    """``(module, self_us, cumulative_us, depth)`` per line of ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Report worker cold-start time, memory and import time per package or module."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--app", choices=sorted(APPLICATIONS), default="wsgi")
+        parser.add_argument("--by", choices=["package", "module"], default="package",
+                            help="Group import time by top-level package (default) or list modules.")
+        parser.add_argument("--top", type=int, default=25)
+        parser.add_argument("--repeat", type=int, default=3, help="Plain runs for wall time and memory.")
+
+    def handle(self, *args, **options):
+        module = APPLICATIONS[options["app"]]
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+
+        runs = [self._run(module, env) for _ in range(max(options["repeat"], 1))]
+        best = min(runs, key=lambda run: run["process_ms"])
+        rss_mb = min(run["rss_kb"] for run in runs) / 1024
+        self.stdout.write(
+            f"{module} ({settings.SETTINGS_MODULE}), best of {len(runs)}: "
+            f"process {best['process_ms']:.0f} ms, import + URLconf {best['ready_ms']:.0f} ms, "
+            f"RSS {rss_mb:.1f} MB, {best['modules']} modules"
+        )
+
+        profiled = self._run(module, env, importtime=True)
+        rows = parse_importtime(profiled["stderr"])
+        import_ms = sum(row[1] for row in rows) / 1000
+        self.stdout.write(f"Import time (-X importtime): {import_ms:.0f} ms in {len(rows)} modules")
+        if options["by"] == "package":
+            self._write_packages(rows, options["top"])
+        else:
+            self._write_modules(rows, options["top"])
+
+    def _run(self, module, env, importtime=False):
+        command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", STARTUP_SCRIPT, module]
+        start = time.perf_counter()
+        result = subprocess.run(command, env=env, capture_output=True, text=True)
+        process_ms = (time.perf_counter() - start) * 1000
+        if result.returncode:
+            raise CommandError(f"{module} failed to start:\n{result.stderr[-2000:]}")
+        return {**json.loads(result.stdout.strip().splitlines()[-1]), "process_ms": process_ms,
+                "stderr": result.stderr}
+
+    def _write_packages(self, rows, top):
+        self_us = defaultdict(int)
+        count = defaultdict(int)
+        for module, module_self_us, _, _ in rows:
+            package = module.split(".")[0]
+            self_us[package] += module_self_us
+            count[package] += 1
+        self.stdout.write(f"{'self ms':>9} {'modules':>8}  package")
+        for package in sorted(self_us, key=self_us.get, reverse=True)[:top]:
+            self.stdout.write(f"{self_us[package] / 1000:9.1f} {count[package]:8d}  {package}")
+
+    def _write_modules(self, rows, top):
+        self.stdout.write(f"{'self ms':>9} {'cum ms':>9}  module")
+        for module, module_self_us, cumulative_us, _ in sorted(rows, key=lambda r: r[2], reverse=True)[:top]:
+            self.stdout.write(f"{module_self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {module}")
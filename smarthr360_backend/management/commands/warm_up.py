@@ -0,0 +1,29 @@
+"""
+Run the worker warm-up steps in this process and print their timings.
+
+    python manage.py warm_up
+    python manage.py warm_up --step url_resolver --step serializers
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from smarthr360_backend import warmup
+
+
+class Command(BaseCommand):
+    help = "Run the worker warm-up (URL resolver, serializers, databases, caches, hashing pool) and time each step."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--step", action="append", choices=list(warmup.STEPS), help="Repeatable (default: every step)."
+        )
+
+    def handle(self, *args, **options):
+        report = warmup.warm_up(options["step"] or warmup.WORKER_STEPS)
+        for name, step in report.items():
+            outcome = step.get("error") or step["result"]
+            self.stdout.write(f"{name:<18}{step['ms']:>9.1f} ms  {outcome}")
+        self.stdout.write(f"{'total':<18}{sum(step['ms'] for step in report.values()):>9.1f} ms")
+        failed = [name for name, step in report.items() if "error" in step]
+        if failed:
+            raise CommandError(f"Warm-up failed: {', '.join(failed)}")
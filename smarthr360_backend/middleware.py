@@ -1,5 +1,127 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
-from django.http import HttpResponseForbidden
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponseForbidden, HttpResponseNotAllowed, JsonResponse
+from django.utils.module_loading import import_string
+
+from . import db_router, health
+
+request_logger = logging.getLogger("smarthr360.requests")
+
+_IN_CLAUSE_RE = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+
+
+class HealthCheckMiddleware:
+    """
+    Answer liveness and readiness probes (see smarthr360_backend.health)
+    before the rest of the chain. First in MIDDLEWARE: probes skip sessions,
+    CSRF, authentication, axes, the HTTPS redirect and the request log.
+
+    GET and HEAD, with or without the trailing slash: 200 when alive/ready,
+    503 otherwise.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    probes = {
+        health.LIVENESS_PATH: health.liveness,
+        health.READINESS_PATH: health.readiness,
+    }
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        probe = self.probes.get(request.path_info.rstrip("/") + "/")
+        if self.async_mode:
+            return self._acall(request, probe)
+        if probe is None:
+            return self.get_response(request)
+        return self.respond(request, probe)
+
+    async def _acall(self, request, probe):
+        if probe is None:
+            return await self.get_response(request)
+        if probe is health.readiness and health.get_cached_readiness() is None:
+            return await sync_to_async(self.respond)(request, probe)
+        return self.respond(request, probe)
+
+    @staticmethod
+    def respond(request, probe):
+        if request.method not in ("GET", "HEAD"):
+            return HttpResponseNotAllowed(["GET", "HEAD"])
+        report = probe()
+        response = JsonResponse(report, status=503 if report["status"] == "unavailable" else 200)
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+class PathScopedMiddleware:
+    """
+    Run SESSION_MIDDLEWARE (sessions, authentication, django-axes, messages)
+    only where it is used.
+
+    Requests under SESSIONLESS_PATH_PREFIXES (the JWT-only API) skip the whole
+    block, except those under SESSIONLESS_PATH_EXCEPTIONS (the password
+    login, where django-axes turns a lockout into its response). The admin,
+    the API docs and every other path run it as if it were listed in
+    MIDDLEWARE at this position.
+
+    The block is built here rather than by Django's handler, so its
+    middleware may only use ``__call__``, ``process_request`` and
+    ``process_response``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        self.prefixes = tuple(getattr(settings, "SESSIONLESS_PATH_PREFIXES", ()))
+        self.exceptions = tuple(getattr(settings, "SESSIONLESS_PATH_EXCEPTIONS", ()))
+        self.scoped = self.build_chain(getattr(settings, "SESSION_MIDDLEWARE", ()), get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def build_chain(self, paths, get_response):
+        handler = get_response
+        for path in reversed(paths):
+            middleware = import_string(path)
+            if self.async_mode and not getattr(middleware, "async_capable", False):
+                raise ImproperlyConfigured(f"{path} is not async capable: keep it in MIDDLEWARE.")
+            if not self.async_mode and not getattr(middleware, "sync_capable", True):
+                raise ImproperlyConfigured(f"{path} is not sync capable: keep it in MIDDLEWARE.")
+            hooks = [
+                hook
+                for hook in ("process_view", "process_exception", "process_template_response")
+                if hasattr(middleware, hook)
+            ]
+            if hooks:
+                raise ImproperlyConfigured(f"{path} defines {', '.join(hooks)}: keep it in MIDDLEWARE.")
+            try:
+                handler = middleware(handler)
+            except MiddlewareNotUsed:
+                continue
+        return handler
+
+    def __call__(self, request):
+        path = request.path_info
+        if path.startswith(self.prefixes) and not path.startswith(self.exceptions):
+            return self.get_response(request)
+        return self.scoped(request)
 
 
 class AdminIPWhitelistMiddleware:
@@ -12,13 +134,29 @@ class AdminIPWhitelistMiddleware:
     
     If ADMIN_IP_WHITELIST is empty, all IPs are allowed (useful for development).
     """
-    
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
         self.whitelist = getattr(settings, 'ADMIN_IP_WHITELIST', [])
         self.admin_enabled = getattr(settings, 'ADMIN_ENABLED', True)
-    
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
     def __call__(self, request):
+        denied = self.check(request)
+        if self.async_mode:
+            return self._acall(request, denied)
+        return denied or self.get_response(request)
+
+    async def _acall(self, request, denied):
+        return denied or await self.get_response(request)
+
+    def check(self, request):
+        """Return a 403 response when the request must not reach the admin."""
         # Check if accessing admin panel
         if request.path.startswith('/admin/'):
             # Check if admin is disabled
@@ -35,9 +173,8 @@ class AdminIPWhitelistMiddleware:
                             f"({client_ip}) is not authorized to access the admin panel."
                         )
                     )
-        
-        return self.get_response(request)
-    
+        return None
+
     def get_client_ip(self, request):
         """Get the client's IP address from the request."""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -47,3 +184,171 @@ class AdminIPWhitelistMiddleware:
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
+
+
+class QueryCounter:
+    """
+    ``connection.execute_wrapper`` hook collecting query count, DB time and
+    how often each SQL template ran.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.templates = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            # Collapse "IN (%s, %s, ...)" so batches of different sizes share a template
+            self.templates[_IN_CLAUSE_RE.sub("(%s, ...)", sql)] += 1
+
+    def repeated(self, threshold):
+        return [(sql, count) for sql, count in self.templates.most_common() if count > threshold]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Count SQL queries and DB time for each request.
+
+    Under ASGI the ORM runs in the request's thread-sensitive worker thread
+    (``sync_to_async``): the query hooks are installed there.
+
+    - Adds a ``Server-Timing`` header: ``app`` (total) and ``db`` (time + query count).
+    - Logs one JSON line per request on the ``smarthr360.requests`` logger (INFO).
+    - Logs a WARNING when one SQL template runs more than
+      QUERY_INSTRUMENTATION_REPEAT_THRESHOLD times (likely N+1; 0 disables).
+
+    Configure in .env:
+    - QUERY_INSTRUMENTATION_ENABLED: Set to False to skip instrumentation entirely
+    - QUERY_INSTRUMENTATION_REPEAT_THRESHOLD: Repeat count above which a request is flagged
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "QUERY_INSTRUMENTATION_ENABLED", True)
+        self.repeat_threshold = getattr(settings, "QUERY_INSTRUMENTATION_REPEAT_THRESHOLD", 10)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self._acall(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            self._install(stack, counter)
+            response = self.get_response(request)
+        return self._finish(request, response, counter, start)
+
+    async def _acall(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        counter = QueryCounter()
+        start = time.perf_counter()
+        stack = ExitStack()
+        await sync_to_async(self._install)(stack, counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self._finish(request, response, counter, start)
+
+    @staticmethod
+    def _install(stack, counter):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+
+    def _finish(self, request, response, counter, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = counter.duration * 1000
+
+        response["Server-Timing"] = (
+            f'app;dur={total_ms:.2f}, db;dur={db_ms:.2f};desc="{counter.count} queries"'
+        )
+
+        match = getattr(request, "resolver_match", None)
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "duration_ms": round(total_ms, 2),
+            "db_queries": counter.count,
+            "db_time_ms": round(db_ms, 2),
+        }
+        request_logger.info(json.dumps(record))
+
+        if self.repeat_threshold:
+            repeated = counter.repeated(self.repeat_threshold)
+            if repeated:
+                record["repeated_queries"] = [
+                    {"sql": sql[:300], "count": count} for sql, count in repeated
+                ]
+                request_logger.warning(json.dumps(record))
+
+        return response
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Read-your-writes for the read replica.
+
+    After a successful POST/PUT/PATCH/DELETE by an authenticated user, that
+    user's reads stay on the primary for DATABASE_REPLICA_STICKY_SECONDS
+    (see smarthr360_backend.db_router). DRF stores the token's user on the
+    underlying request, so the check runs once the view has answered.
+
+    Removed from the chain when no replica is configured. Refused unless
+    CACHE_SHARED: pins live in the default cache, and a per-process cache
+    would only pin the user in the worker that served the write.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not db_router.replica_enabled():
+            raise MiddlewareNotUsed
+        if not getattr(settings, "CACHE_SHARED", False):
+            raise ImproperlyConfigured("DATABASE_REPLICA_URL needs a cache shared by all workers (CACHE_SHARED).")
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self._acall(request)
+        response = self.get_response(request)
+        if self.is_write(request, response):
+            self.pin(request)
+        return response
+
+    async def _acall(self, request):
+        response = await self.get_response(request)
+        if self.is_write(request, response):
+            await sync_to_async(self.pin)(request)
+        return response
+
+    @staticmethod
+    def is_write(request, response):
+        return request.method not in ("GET", "HEAD", "OPTIONS", "TRACE") and response.status_code < 400
+
+    @staticmethod
+    def pin(request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            db_router.pin_to_primary(user)
@@ -0,0 +1,135 @@
+"""
+Precomputed OpenAPI schema.
+
+``SpectacularAPIView`` introspects every view, serializer and ``schemas.py``
+decorator on each request. With ``OPENAPI_SCHEMA_PRECOMPUTED`` on,
+``/api/schema/`` (and so Swagger UI and ReDoc) is ``PrecomputedSchemaView``,
+which serves ``OPENAPI_SCHEMA_FILE`` instead, built by
+``manage.py openapi_schema``. When the file is missing, each process generates
+the schema once, on first use. The YAML is kept in memory
+with its ETag; the JSON representation is built on first request.
+
+``manage.py openapi_schema --check`` (and the test suite) fails when the file no
+longer matches the code.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Representation:
+    content: bytes
+    etag: str = field(init=False)
+
+    def __post_init__(self):
+        self.etag = quote_etag(hashlib.md5(self.content, usedforsecurity=False).hexdigest())
+
+
+@dataclass
+class Schema:
+    source: str  # "file" or "generated"
+    yaml: Representation
+    _data: dict | None = None
+    _json: Representation | None = None
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self._data = yaml.load(self.yaml.content, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+        return self._data
+
+    @property
+    def json(self) -> Representation:
+        if self._json is None:
+            self._json = Representation(OpenApiJsonRenderer().render(self.data, renderer_context={}))
+        return self._json
+
+
+_lock = threading.Lock()
+_schema: Schema | None = None
+
+
+def generate() -> tuple[dict, bytes]:
+    """The schema and its YAML rendering, as ``manage.py spectacular`` writes them."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    data = generator.get_schema(request=None, public=True)
+    return data, OpenApiYamlRenderer().render(data, renderer_context={})
+
+
+def schema_file() -> Path:
+    return Path(settings.OPENAPI_SCHEMA_FILE)
+
+
+def is_stale(path: Path | None = None) -> bool:
+    """True when the schema file is missing or differs from the code."""
+    path = path or schema_file()
+    if not path.exists():
+        return True
+    return path.read_bytes() != generate()[1]
+
+
+def get_schema() -> Schema:
+    global _schema
+    if _schema is None:
+        with _lock:
+            if _schema is None:
+                _schema = _load()
+    return _schema
+
+
+def reset() -> None:
+    global _schema
+    with _lock:
+        _schema = None
+
+
+def _load() -> Schema:
+    path = schema_file()
+    if path.exists():
+        return Schema("file", Representation(path.read_bytes()))
+    logger.warning("OpenAPI schema file %s not found: generating the schema in this process.", path)
+    data, content = generate()
+    return Schema("generated", Representation(content), data)
+
+
+class PrecomputedSchemaView(SpectacularAPIView):
+    """
+    GET /api/schema/  → the precomputed OpenAPI schema
+
+    YAML or JSON by content negotiation, as SpectacularAPIView, with an ETag.
+    """
+
+    def _get_schema_response(self, request):
+        schema = get_schema()
+        renderer = request.accepted_renderer
+        representation = schema.json if isinstance(renderer, JSONRenderer) else schema.yaml
+
+        response = get_conditional_response(request, etag=representation.etag)
+        if response is None:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f"{content_type}; charset={renderer.charset}"
+            response = HttpResponse(representation.content, content_type=content_type)
+            response["Content-Disposition"] = f'inline; filename="{self._get_filename(request, None)}"'
+        response["ETag"] = representation.etag
+        patch_cache_control(response, public=True, no_cache=True)
+        patch_vary_headers(response, ("Accept",))
+        return response
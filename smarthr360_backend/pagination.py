@@ -1,5 +1,7 @@
 # smarthr360_backend/pagination.py
-from rest_framework.pagination import PageNumberPagination
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 
@@ -27,3 +29,41 @@ class DefaultPagination(PageNumberPagination):
                 },
             }
         )
+
+    async def apaginate_queryset(self, queryset, request):
+        """
+        ``paginate_queryset`` with the async ORM: one COUNT and one page query.
+
+        ``request`` is a DRF ``Request``; the next/previous links work as usual.
+        """
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        # Maps last_page_strings ("?page=last") to num_pages, hence after the count.
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg) from exc
+
+        bottom = (number - 1) * page_size
+        objects = [obj async for obj in queryset[bottom : bottom + page_size]]
+        self.page = paginator._get_page(objects, number, paginator)
+        self.request = request
+        return objects
+
+
+class TimelinePagination(CursorPagination):
+    """
+    Keyset pagination for append-only timelines, newest first.
+
+    Pages are fetched with ``WHERE timestamp < <cursor>`` on an index instead of
+    an OFFSET, so deep pages cost the same as the first one and rows inserted
+    meanwhile do not shift the pages. There is no total count.
+    """
+
+    ordering = ("-timestamp", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
@@ -0,0 +1,105 @@
+"""
+Keys and hit/miss counters for the view-level response cache.
+
+Cache entries embed the resource versions of the models a view depends on
+(see smarthr360_backend.versioning). A ``post_save`` / ``post_delete`` bumps
+those versions, so outdated entries are never looked up again and simply age
+out with their TTL.
+
+Pagination links are stored relative (path and query only) and made absolute
+again for each request, so one entry serves every host the API answers on.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from urllib.parse import urlsplit, urlunsplit
+
+from django.core.cache import cache
+
+KEY_PREFIX = "response-cache"
+LINK_FIELDS = ("next", "previous")
+
+_registered_views: set[str] = set()
+
+
+def register_view(view_name: str) -> None:
+    _registered_views.add(view_name)
+
+
+def normalize_query_params(query_params) -> str:
+    """Order-independent representation of a QueryDict, ignoring blank values."""
+    items: list[str] = []
+    for key in sorted(query_params.keys()):
+        values = sorted(value for value in query_params.getlist(key) if value != "")
+        items.extend(f"{key}={value}" for value in values)
+    return "&".join(items)
+
+
+def make_key(view_name: str, path: str, query_params, scope: str, versions) -> str:
+    raw = "|".join(
+        [path, normalize_query_params(query_params), scope, *(str(version) for version in versions)]
+    )
+    digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return f"{KEY_PREFIX}:{view_name}:{digest}"
+
+
+def _with_links(data, make_link):
+    """Copy of an envelope with ``make_link`` applied to its pagination links."""
+    if not isinstance(data, dict):
+        return data
+    # ApiResponseMixin puts the links in the payload, DefaultPagination in the meta.
+    for section in ("data", "meta"):
+        part = data.get(section)
+        if isinstance(part, dict) and any(part.get(field) for field in LINK_FIELDS):
+            links = {field: make_link(part[field]) for field in LINK_FIELDS if part.get(field)}
+            data = {**data, section: {**part, **links}}
+    return data
+
+
+def relative_links(data):
+    """``data`` with its pagination links reduced to path and query, for storing."""
+    return _with_links(data, lambda link: urlunsplit(("", "", *urlsplit(link)[2:])))
+
+
+def absolute_links(data, request):
+    """Stored ``data`` with its pagination links made absolute for ``request``."""
+    return _with_links(data, request.build_absolute_uri)
+
+
+def _stats_key(view_name: str, outcome: str) -> str:
+    return f"{KEY_PREFIX}:stats:{view_name}:{outcome}"
+
+
+def record(view_name: str, *, hit: bool) -> None:
+    key = _stats_key(view_name, "hits" if hit else "misses")
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_stats() -> dict[str, dict]:
+    """Return ``{view_name: {hits, misses, hit_ratio}}`` for every cached view."""
+    views = sorted(_registered_views)
+    keys = [_stats_key(view, outcome) for view in views for outcome in ("hits", "misses")]
+    found = cache.get_many(keys)
+
+    stats = {}
+    for view in views:
+        hits = found.get(_stats_key(view, "hits"), 0)
+        misses = found.get(_stats_key(view, "misses"), 0)
+        total = hits + misses
+        stats[view] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+def reset_stats() -> None:
+    cache.delete_many(
+        [_stats_key(view, outcome) for view in _registered_views for outcome in ("hits", "misses")]
+    )
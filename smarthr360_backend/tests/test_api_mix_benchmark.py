@@ -0,0 +1,40 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from benchmarks import api_mix
+
+
+class ApiMixBenchmarkTests(TestCase):
+    """
+    The benchmark mix must keep working against the real URL conf.
+    """
+
+    def setUp(self):
+        cache.clear()
+        call_command("seed_org", employees=30, span=4, password=api_mix.DEFAULT_PASSWORD, stdout=StringIO())
+
+    def test_every_operation_runs_without_errors(self):
+        transport = api_mix.InProcessTransport()
+        context = api_mix.prepare(transport, employees=30, pool=6, password=api_mix.DEFAULT_PASSWORD, seed=1)
+        mix = dict(api_mix.DEFAULT_MIX, login=1, employee_me=1, survey_detail=1)
+
+        result = api_mix.benchmark(lambda: transport, context, mix, requests=60, duration=None, seed=1)
+
+        self.assertEqual(result["skipped"], [])
+        self.assertEqual(result["overall"]["requests"], 60)
+        for name, summary in result["endpoints"].items():
+            self.assertEqual(summary["errors"], 0, name)
+        self.assertEqual(set(result["overall"]["latency_ms"]), {"p50", "p95", "p99", "mean", "max"})
+        self.assertGreater(result["overall"]["queries_per_request"]["mean"], 0)
+
+    def test_percentiles(self):
+        samples = [("me", 200, ms / 1000, 1) for ms in range(1, 101)]
+        summary = api_mix.summarize(samples, wall_seconds=2)
+
+        self.assertEqual(summary["throughput_rps"], 50)
+        self.assertEqual(summary["latency_ms"]["p50"], 50.5)
+        self.assertEqual(summary["latency_ms"]["p99"], 99.01)
+        self.assertEqual(summary["queries_per_request"], {"mean": 1, "max": 1})
@@ -0,0 +1,151 @@
+"""
+The async read views answer exactly like the DRF views they mirror.
+
+Each case requests the same URL through the sync URL conf (DRF views, test
+client) and through this module's URL conf (async views, ASGI test client)
+and compares status codes and bodies.
+"""
+
+import json
+
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from accounts.views import AsyncMeView
+from hr.models import Department, EmployeeProfile
+from hr.views import AsyncEmployeeMeView, AsyncMyTeamListView
+from smarthr360_backend import urls as sync_urls
+from smarthr360_backend.async_views import AsyncReadView, read_view
+from wellbeing.models import SurveyQuestion, WellbeingSurvey
+from wellbeing.views import AsyncWellbeingSurveyDetailView
+
+urlpatterns = [
+    path("api/auth/me/", AsyncMeView.as_view()),
+    path("api/hr/employees/me/", AsyncEmployeeMeView.as_view()),
+    path("api/hr/employees/my-team/", AsyncMyTeamListView.as_view()),
+    path("api/wellbeing/surveys/<int:pk>/", AsyncWellbeingSurveyDetailView.as_view()),
+    path("", include(sync_urls)),
+]
+
+
+class AsyncReadViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name="Engineering", code="ENG")
+        cls.manager = User.objects.create_user(email="async-manager@example.com", role=User.Role.MANAGER)
+        cls.employee = User.objects.create_user(email="async-emp@example.com")
+        cls.hr = User.objects.create_user(email="async-hr@example.com", role=User.Role.HR)
+        manager_profile = EmployeeProfile.objects.create(user=cls.manager, department=department)
+        for index in range(25):
+            user = User.objects.create_user(email=f"async-team{index}@example.com")
+            EmployeeProfile.objects.create(user=user, department=department, manager=manager_profile)
+        cls.survey = WellbeingSurvey.objects.create(title="Pulse", created_by=cls.hr)
+        SurveyQuestion.objects.create(survey=cls.survey, text="How are you?", order=1)
+
+    def headers(self, user, headers):
+        headers = dict(headers)
+        if user is not None:
+            headers["Authorization"] = f"Bearer {AccessToken.for_user(user)}"
+        return headers
+
+    def sync_get(self, url, user=None, **headers):
+        return APIClient().get(url, headers=self.headers(user, headers))
+
+    def async_get(self, url, user=None, **headers):
+        with override_settings(ROOT_URLCONF=__name__):
+            return async_to_sync(AsyncClient().get)(url, headers=self.headers(user, headers))
+
+    def assertSameResponse(self, url, user=None, **headers):
+        expected = self.sync_get(url, user, **headers)
+        actual = self.async_get(url, user, **headers)
+        self.assertEqual(actual.status_code, expected.status_code, url)
+        self.assertEqual(json.loads(actual.content), json.loads(expected.content), url)
+        return actual
+
+    def test_me(self):
+        self.assertSameResponse("/api/auth/me/", self.employee)
+
+    def test_employee_me_existing_and_created_profile(self):
+        self.assertSameResponse("/api/hr/employees/me/", self.manager)
+        resp = self.async_get("/api/hr/employees/me/", self.hr)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(EmployeeProfile.objects.filter(user=self.hr).exists())
+        self.assertSameResponse("/api/hr/employees/me/", self.hr)
+
+    def test_my_team_pages(self):
+        self.assertSameResponse("/api/hr/employees/my-team/", self.manager)
+        self.assertSameResponse("/api/hr/employees/my-team/?page=2&page_size=10", self.manager)
+        self.assertSameResponse("/api/hr/employees/my-team/?page=last", self.hr)
+        last = self.assertSameResponse("/api/hr/employees/my-team/?page=last&page_size=10", self.manager)
+        self.assertEqual(last.json()["meta"]["page"], 3)
+        self.assertSameResponse("/api/hr/employees/my-team/?page=9", self.manager)
+
+    @override_settings(CACHE_SHARED=True)
+    def test_survey_detail_and_conditional_get(self):
+        url = f"/api/wellbeing/surveys/{self.survey.pk}/"
+        resp = self.assertSameResponse(url, self.employee)
+
+        not_modified = self.async_get(url, self.employee, **{"If-None-Match": resp["ETag"]})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertSameResponse("/api/wellbeing/surveys/999999/", self.employee)
+
+    def test_errors(self):
+        self.assertSameResponse("/api/auth/me/")
+        self.assertSameResponse("/api/auth/me/", Authorization="Bearer not-a-token")
+        self.assertSameResponse("/api/hr/employees/my-team/", self.employee)
+        resp = self.async_get("/api/auth/me/")
+        self.assertEqual(resp.status_code, 401)
+        self.assertIn("Bearer", resp["WWW-Authenticate"])
+
+    def test_reads_use_few_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.async_get("/api/hr/employees/my-team/", self.manager)
+        # user, group names, count, page
+        self.assertEqual(len(queries), 4)
+        # The instrumentation middleware sees the queries run by the async ORM.
+        self.assertIn('desc="4 queries"', resp["Server-Timing"])
+
+    def test_writes_go_to_the_sync_view(self):
+        token = AccessToken.for_user(self.employee)
+        with override_settings(ROOT_URLCONF=__name__):
+            resp = APIClient().patch(
+                "/api/hr/employees/me/",
+                {"phone_number": "+33 1 23 45 67 89"},
+                format="json",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(EmployeeProfile.objects.get(user=self.employee).phone_number, "+33 1 23 45 67 89")
+
+
+class ReadViewSelectionTests(TestCase):
+    def test_setting_selects_the_view(self):
+        with override_settings(ASYNC_READ_VIEWS=False):
+            self.assertIs(read_view(AsyncMeView).view_class, AsyncMeView.sync_view)
+        with override_settings(ASYNC_READ_VIEWS=True):
+            view = read_view(AsyncMeView)
+            self.assertIs(view.view_class, AsyncMeView)
+            # Schema generation keeps describing the DRF view.
+            self.assertIs(view.cls, AsyncMeView.sync_view)
+
+    def test_view_without_read_is_refused(self):
+        class NoReadView(AsyncReadView):
+            sync_view = AsyncMeView.sync_view
+
+        with self.assertRaisesMessage(TypeError, "NoReadView does not implement read()."):
+            NoReadView.as_view()
+
+    def test_view_without_sync_view_is_refused(self):
+        class NoSyncView(AsyncReadView):
+            async def read(self, request, *args, **kwargs):
+                return None
+
+        with self.assertRaisesMessage(ImproperlyConfigured, "NoSyncView does not set sync_view."):
+            NoSyncView.as_view()
@@ -0,0 +1,107 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase
+from psycopg_pool import ConnectionPool
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from smarthr360_backend import db_pool
+
+
+def _databases_for(**env):
+    """``DATABASES['default']`` as the settings build it from ``env``."""
+    code = (
+        "import json; from django.conf import settings; "
+        "print(json.dumps(settings.DATABASES['default'], default=str))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": "smarthr360_backend.config.base", **env},
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=settings.BASE_DIR,
+    )
+    return json.loads(result.stdout)
+
+
+class PoolSettingsTests(TestCase):
+    def test_pool_options_from_env(self):
+        database = _databases_for(
+            DATABASE_URL="postgres://app:secret@db:5432/smarthr360",
+            DATABASE_POOL="True",
+            DATABASE_POOL_MIN_SIZE="1",
+            DATABASE_POOL_MAX_SIZE="8",
+            DATABASE_POOL_TIMEOUT="2.5",
+        )
+        self.assertEqual(database["CONN_MAX_AGE"], 0)
+        self.assertEqual(database["OPTIONS"]["pool"], {"min_size": 1, "max_size": 8, "timeout": 2.5})
+
+    def test_conn_max_age_from_env(self):
+        database = _databases_for(DATABASE_URL="postgres://app:secret@db:5432/smarthr360", DATABASE_CONN_MAX_AGE="0")
+        self.assertEqual(database["CONN_MAX_AGE"], 0)
+        self.assertNotIn("pool", database.get("OPTIONS", {}))
+
+    def test_pool_is_ignored_off_postgres(self):
+        database = _databases_for(DATABASE_URL="sqlite:///pool.sqlite3", DATABASE_POOL="True")
+        self.assertEqual(database["CONN_MAX_AGE"], 600)
+        self.assertNotIn("pool", database.get("OPTIONS", {}))
+
+
+class PoolStatsTests(TestCase):
+    def test_without_pool(self):
+        with mock.patch.object(db_pool, "get_pool", return_value=None):
+            self.assertIsNone(db_pool.get_stats())
+            db_pool.reset_stats()
+            health = db_pool.check_health()
+        self.assertEqual((health["pooled"], health["healthy"], health["error"]), (False, True, None))
+
+    def test_stats_of_pool(self):
+        pool = ConnectionPool("", min_size=1, max_size=3, timeout=4, open=False)
+        counters = {
+            "pool_size": 2, "pool_available": 1, "requests_num": 4, "requests_wait_ms": 10, "requests_errors": 1,
+        }
+        with mock.patch.object(db_pool, "get_pool", return_value=pool), \
+                mock.patch.object(pool, "get_stats", return_value=counters):
+            stats = db_pool.get_stats()
+        self.assertEqual((stats["min_size"], stats["max_size"], stats["timeout"]), (1, 3, 4))
+        self.assertEqual((stats["size"], stats["available"], stats["waiting"]), (2, 1, 0))
+        self.assertEqual((stats["requests"], stats["requests_timed_out"]), (4, 1))
+        self.assertEqual((stats["wait_ms_total"], stats["wait_ms_mean"]), (10, 2.5))
+
+    def test_unreachable_pool_is_unhealthy(self):
+        pool = ConnectionPool("host=127.0.0.1 port=1 connect_timeout=1", min_size=1, open=False)
+        self.addCleanup(pool.close)
+        with mock.patch.object(db_pool, "get_pool", return_value=pool), self.assertLogs("psycopg.pool", "WARNING"):
+            health = db_pool.check_health(timeout=0.2)
+        self.assertTrue(health["pooled"])
+        self.assertFalse(health["healthy"])
+        self.assertIn("PoolTimeout", health["error"])
+
+
+class PoolStatsEndpointTests(TestCase):
+    url = "/api/ops/db-pool/"
+
+    def test_admin_only(self):
+        client = APIClient()
+        employee = User.objects.create_user(email="pool-emp@example.com")
+        admin = User.objects.create_user(email="pool-admin@example.com", role=User.Role.ADMIN)
+
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(employee)}")
+        self.assertEqual(client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin)}")
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["data"]
+        self.assertEqual(data["pid"], os.getpid())
+        self.assertTrue(data["health"]["healthy"])
+        self.assertEqual(data["health"]["pooled"], db_pool.get_pool() is not None)
+        self.assertEqual(client.delete(self.url).status_code, status.HTTP_204_NO_CONTENT)
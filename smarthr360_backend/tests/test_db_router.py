@@ -0,0 +1,117 @@
+"""
+Read-replica routing.
+
+The test settings have no replica. ``RecordingRouter`` stands in for
+``ReplicaRouter``: it records where each read would go, ignoring the
+transaction TestCase runs in, and lets every query run on the test database.
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import generics, status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from hr.models import Department, EmployeeProfile
+from smarthr360_backend import db_router
+from smarthr360_backend.api_mixins import ConditionalGetMixin, ReplicaReadMixin
+from smarthr360_backend.middleware import ReplicaStickinessMiddleware
+
+
+class RecordingRouter:
+    reads: list = []
+
+    def db_for_read(self, model, **hints):
+        self.reads.append((model, db_router._read_alias.get()))
+        return None
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def test_routing(self):
+        router = db_router.ReplicaRouter()
+        self.assertIsNone(router.db_for_read(User))
+        with db_router.use_replica():
+            self.assertEqual(router.db_for_read(User), "replica")
+        self.assertIsNone(router.db_for_read(User))
+        self.assertEqual(router.db_for_write(User), "default")
+        self.assertTrue(router.allow_migrate("default", "accounts"))
+        self.assertFalse(router.allow_migrate("replica", "accounts"))
+
+    def test_versioned_views_cannot_read_the_replica(self):
+        with self.assertRaises(ImproperlyConfigured):
+            type("View", (ReplicaReadMixin, ConditionalGetMixin, generics.ListAPIView), {})
+
+
+class ReplicaRouterTransactionTests(TestCase):
+    def test_reads_in_a_transaction_stay_on_the_primary(self):
+        with transaction.atomic(), db_router.use_replica():
+            self.assertIsNone(db_router.ReplicaRouter().db_for_read(User))
+
+
+@override_settings(
+    CACHE_SHARED=True,
+    DATABASE_ROUTERS=[f"{__name__}.RecordingRouter"],
+    DATABASE_REPLICA_STICKY_SECONDS=10,
+)
+class ReplicaReadMixinTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = User.objects.create_user(email="replica-hr@example.com", role=User.Role.HR)
+        cls.department = Department.objects.create(name="Engineering", code="ENG")
+        EmployeeProfile.objects.create(user=cls.hr, department=cls.department)
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(db_router, "replica_enabled", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        RecordingRouter.reads = []
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.hr)}")
+
+    def replica_reads(self):
+        reads = [model for model, alias in RecordingRouter.reads if alias == "replica"]
+        RecordingRouter.reads = []
+        return reads
+
+    def test_safe_requests_read_the_replica_after_authentication(self):
+        resp = self.client.get("/api/hr/employees/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIn(EmployeeProfile, self.replica_reads())
+
+        # Authentication and permission checks stay on the primary.
+        self.client.get("/api/hr/employees/")
+        self.assertEqual(RecordingRouter.reads[0], (User, None))
+
+    def test_other_views_read_the_primary(self):
+        self.client.get("/api/hr/departments/")
+        self.assertEqual(self.replica_reads(), [])
+
+    def test_writes_pin_the_user_to_the_primary(self):
+        resp = self.client.patch("/api/hr/employees/me/", {"phone_number": "0102030405"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(db_router.is_pinned(self.hr))
+
+        self.client.get("/api/hr/employees/")
+        self.assertEqual(self.replica_reads(), [])
+
+        # Other users keep reading the replica.
+        other = User.objects.create_user(email="replica-other@example.com", role=User.Role.HR)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(other)}")
+        self.client.get("/api/hr/employees/")
+        self.assertIn(EmployeeProfile, self.replica_reads())
+
+    @override_settings(CACHE_SHARED=False)
+    def test_refused_without_a_shared_cache(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "CACHE_SHARED"):
+            ReplicaStickinessMiddleware(lambda request: None)
+
+    def test_failed_writes_do_not_pin(self):
+        resp = self.client.patch("/api/hr/employees/me/", {"date_of_birth": "not-a-date"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(db_router.is_pinned(self.hr))
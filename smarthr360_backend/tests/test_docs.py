@@ -0,0 +1,93 @@
+import subprocess
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.views import View
+
+from smarthr360_backend import docs
+from smarthr360_backend.management.commands.startup_profile import parse_importtime
+
+
+def mark_schema(view):
+    view.decorated = getattr(view, "decorated", 0) + 1
+    return view
+
+
+class CountingView(View):
+    created = 0
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        cls.created += 1
+        return super().as_view(**initkwargs)
+
+    def get(self, request):
+        return HttpResponse("ok")
+
+
+class DeferredSchemaTests(SimpleTestCase):
+    def make_view(self):
+        return type("DocumentedView", (), {})
+
+    @override_settings(OPENAPI_DEFER_IMPORTS=False)
+    def test_applied_at_once(self):
+        view = docs.schema(f"{__name__}.mark_schema")(self.make_view())
+        self.assertEqual(view.decorated, 1)
+
+    @override_settings(OPENAPI_DEFER_IMPORTS=True)
+    def test_applied_before_schema_generation(self):
+        view = docs.schema(f"{__name__}.mark_schema")(self.make_view())
+        self.assertFalse(hasattr(view, "decorated"))
+
+        endpoints = [("/api/x/", "^api/x/$", "GET", view)]
+        self.assertIs(docs.apply_deferred_schemas(endpoints), endpoints)
+        docs.apply_deferred_schemas()
+        self.assertEqual(view.decorated, 1)
+
+
+class DocsViewTests(SimpleTestCase):
+    def setUp(self):
+        CountingView.created = 0
+
+    @override_settings(OPENAPI_DEFER_IMPORTS=True)
+    def test_imported_on_first_request(self):
+        view = docs.docs_view(f"{__name__}.CountingView")
+        self.assertEqual(CountingView.created, 0)
+        self.assertTrue(view.csrf_exempt)
+
+        request = RequestFactory().get("/docs/")
+        self.assertEqual(view(request).content, b"ok")
+        view(request)
+        self.assertEqual(CountingView.created, 1)
+
+    @override_settings(OPENAPI_DEFER_IMPORTS=False)
+    def test_imported_at_once(self):
+        docs.docs_view(f"{__name__}.CountingView")
+        self.assertEqual(CountingView.created, 1)
+
+
+class StartupProfileTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     encodings.aliases\n"
+            "import time:      1500 |       1620 |   encodings\n"
+            "something else\n"
+        )
+        self.assertEqual(
+            parse_importtime(stderr),
+            [("encodings.aliases", 120, 120, 2), ("encodings", 1500, 1620, 1)],
+        )
+
+    def test_command(self):
+        out = StringIO()
+        with mock.patch("subprocess.run", wraps=subprocess.run) as subprocess_run:
+            call_command("startup_profile", "--repeat", "1", "--top", "5", stdout=out)
+        self.assertEqual(subprocess_run.call_count, 2)
+        output = out.getvalue()
+        self.assertIn("smarthr360_backend.wsgi", output)
+        self.assertIn("RSS", output)
+        self.assertIn("django", output)
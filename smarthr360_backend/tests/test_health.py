@@ -0,0 +1,73 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, TestCase, override_settings
+
+from smarthr360_backend import health
+
+
+class HealthCheckTests(TestCase):
+    def setUp(self):
+        health.reset()
+        self.addCleanup(health.reset)
+
+    def test_liveness_skips_the_middleware_chain(self):
+        with self.assertNumQueries(0):
+            resp = self.client.get("/health/live/")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"status": "alive"})
+        self.assertEqual(resp["Cache-Control"], "no-store")
+        self.assertNotIn("Server-Timing", resp)
+        self.assertNotIn("X-Frame-Options", resp)
+        self.assertEqual(self.client.get("/health/live").status_code, 200)
+
+    def test_readiness_is_cached(self):
+        resp = self.client.get("/health/ready/")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.json(),
+            {"status": "ready", "databases": {"default": True}, "pending_migrations": 0},
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/health/ready/").status_code, 200)
+
+    @override_settings(HEALTH_READINESS_TTL=0)
+    def test_readiness_rechecked_after_ttl(self):
+        with mock.patch.object(health, "check_readiness", wraps=health.check_readiness) as check:
+            self.client.get("/health/ready/")
+            self.client.get("/health/ready/")
+        self.assertEqual(check.call_count, 2)
+
+    def test_database_down(self):
+        down = {"pooled": False, "healthy": False, "duration_ms": 1.0, "error": "OperationalError: refused"}
+        with mock.patch("smarthr360_backend.db_pool.check_health", return_value=down):
+            with self.assertLogs("smarthr360_backend.health", "WARNING"):
+                resp = self.client.get("/health/ready/")
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(
+            resp.json(),
+            {"status": "unavailable", "databases": {"default": False}, "pending_migrations": None},
+        )
+
+    def test_pending_migrations(self):
+        with mock.patch.object(health, "pending_migrations", return_value=2):
+            resp = self.client.get("/health/ready/")
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp.json()["pending_migrations"], 2)
+
+    def test_only_get_and_head(self):
+        self.assertEqual(self.client.head("/health/live/").status_code, 200)
+        self.assertEqual(self.client.post("/health/ready/").status_code, 405)
+
+    def test_asgi(self):
+        resp = async_to_sync(AsyncClient().get)("/health/ready/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["status"], "ready")
+
+        with self.assertNumQueries(0):
+            resp = async_to_sync(AsyncClient().get)("/health/live/")
+        self.assertEqual(resp.status_code, 200)
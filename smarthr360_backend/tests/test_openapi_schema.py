@@ -0,0 +1,88 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import path
+
+from smarthr360_backend import openapi
+from smarthr360_backend.api_mixins import (
+    CachedListMixin,
+    ConditionalGetMixin,
+    ReplicaReadMixin,
+    VersionedResourceMixin,
+)
+
+urlpatterns = [path("api/schema/", openapi.PrecomputedSchemaView.as_view(), name="schema")]
+
+SCHEMA = b"openapi: 3.0.3\ninfo:\n  title: Test\n  version: 1.0.0\npaths: {}\n"
+
+
+class SchemaFileTests(SimpleTestCase):
+    def test_committed_schema_is_current(self):
+        self.assertFalse(openapi.is_stale(), "schema.yml is out of date: run `python manage.py openapi_schema`.")
+
+    def test_command_writes_and_checks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "schema.yml"
+            with self.assertRaises(CommandError):
+                call_command("openapi_schema", "--check", file=str(target))
+
+            call_command("openapi_schema", file=str(target), stdout=StringIO())
+            call_command("openapi_schema", "--check", file=str(target), stdout=StringIO())
+
+            target.write_bytes(SCHEMA)
+            with self.assertRaises(CommandError):
+                call_command("openapi_schema", "--check", file=str(target))
+
+    def test_view_mixins_do_not_describe_operations(self):
+        # drf-spectacular would publish their docstring as the view's description.
+        for mixin in (VersionedResourceMixin, ConditionalGetMixin, CachedListMixin, ReplicaReadMixin):
+            self.assertIsNone(mixin.__doc__, mixin.__name__)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class PrecomputedSchemaViewTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.schema_file = Path(tmp.name) / "schema.yml"
+        self.schema_file.write_bytes(SCHEMA)
+        settings_override = override_settings(OPENAPI_SCHEMA_FILE=str(self.schema_file))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        openapi.reset()
+        self.addCleanup(openapi.reset)
+
+    def test_serves_the_file_with_an_etag(self):
+        resp = self.client.get("/api/schema/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, SCHEMA)
+        self.assertTrue(resp["Content-Type"].startswith("application/vnd.oai.openapi"))
+        self.assertIn("Accept", resp["Vary"])
+
+        not_modified = self.client.get("/api/schema/", headers={"If-None-Match": resp["ETag"]})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], resp["ETag"])
+
+        # Read once per process.
+        self.schema_file.write_bytes(SCHEMA.replace(b"Test", b"Changed"))
+        self.assertEqual(self.client.get("/api/schema/").content, SCHEMA)
+
+    def test_json(self):
+        yaml_etag = self.client.get("/api/schema/")["ETag"]
+        resp = self.client.get("/api/schema/", headers={"Accept": "application/vnd.oai.openapi+json"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(json.loads(resp.content)["info"]["title"], "Test")
+        self.assertNotEqual(resp["ETag"], yaml_etag)
+        self.assertEqual(self.client.get("/api/schema/?format=json").content, resp.content)
+
+    def test_generates_without_file(self):
+        self.schema_file.unlink()
+        with self.assertLogs("smarthr360_backend.openapi", "WARNING"):
+            resp = self.client.get("/api/schema/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(openapi.get_schema().source, "generated")
+        self.assertIn(b"title: SmartHR360 API", resp.content)
@@ -0,0 +1,72 @@
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from smarthr360_backend.middleware import PathScopedMiddleware
+
+
+# Render the admin without a collectstatic manifest.
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
+)
+class PathScopedMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email="root@example.com", password="RootPass123!")
+
+    def api_client(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}")
+        return client
+
+    def test_api_skips_sessions(self):
+        resp = self.api_client().get("/api/hr/departments/")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(hasattr(resp.wsgi_request, "session"))
+        self.assertFalse(hasattr(resp.wsgi_request, "_messages"))
+        self.assertNotIn("Cookie", resp.get("Vary", ""))
+        self.assertIn("Server-Timing", resp)
+
+    def test_password_login_keeps_them(self):
+        resp = self.client.post(
+            "/api/auth/login/",
+            {"email": "root@example.com", "password": "RootPass123!"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(hasattr(resp.wsgi_request, "session"))
+
+    def test_admin_keeps_them(self):
+        resp = self.client.get("/admin/login/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.wsgi_request.user.is_anonymous)
+
+        self.client.force_login(self.admin)
+        resp = self.client.get("/admin/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.wsgi_request.user, self.admin)
+
+    def test_admin_under_asgi(self):
+        client = AsyncClient()
+        async_to_sync(client.aforce_login)(self.admin)
+        resp = async_to_sync(client.get)("/admin/")
+        self.assertEqual(resp.status_code, 200)
+
+    @override_settings(SESSIONLESS_PATH_PREFIXES=[])
+    def test_no_prefixes(self):
+        resp = self.api_client().get("/api/hr/departments/")
+        self.assertTrue(hasattr(resp.wsgi_request, "session"))
+
+    @override_settings(SESSION_MIDDLEWARE=["django.middleware.csrf.CsrfViewMiddleware"])
+    def test_view_hooks_refused(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "process_view"):
+            PathScopedMiddleware(lambda request: HttpResponse())
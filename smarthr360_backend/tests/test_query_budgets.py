@@ -0,0 +1,212 @@
+"""
+Per-endpoint query budgets.
+
+Every GET endpoint registered under ``/api/`` is requested against datasets of
+increasing size. The query count must not grow with the dataset (no N+1) and
+must stay within the limit recorded in ``query_budgets.json``.
+
+After an intentional change, regenerate the budget file with:
+
+    UPDATE_QUERY_BUDGETS=1 python manage.py test smarthr360_backend.tests.test_query_budgets
+"""
+
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import LoginActivity, User
+from hr.models import Department, EmployeeProfile, EmployeeSkill, FutureCompetency, Skill
+from reviews.models import Goal, PerformanceReview, ReviewCycle, ReviewItem
+from wellbeing.models import SurveyQuestion, SurveyResponse, WellbeingSurvey
+
+BUDGET_FILE = Path(__file__).with_name("query_budgets.json")
+SIZES = (2, 5, 10)
+
+# Endpoints that never touch the database for their payload.
+EXCLUDED_URL_NAMES = {"schema"}
+
+# How to build the URL kwargs of parameterised endpoints from a seeded dataset.
+URL_KWARGS = {
+    "auth-user-activity": lambda data: {"pk": data["employee_user"].pk},
+    "hr-department-detail": lambda data: {"pk": data["department"].pk},
+    "hr-employee-detail": lambda data: {"pk": data["manager_profile"].pk},
+    "hr-skill-detail": lambda data: {"pk": data["skill"].pk},
+    "hr-employee-skill-detail": lambda data: {"pk": data["employee_skill"].pk},
+    "hr-future-competency-detail": lambda data: {"pk": data["future_competency"].pk},
+    "review-cycle-detail": lambda data: {"pk": data["cycle"].pk},
+    "review-detail": lambda data: {"pk": data["review"].pk},
+    "reviewitem-list": lambda data: {"review_id": data["review"].pk},
+    "reviewitem-detail": lambda data: {"pk": data["review_item"].pk},
+    "goal-detail": lambda data: {"pk": data["goal"].pk},
+    "wellbeing-survey-detail": lambda data: {"pk": data["survey"].pk},
+    "wellbeing-question-list": lambda data: {"survey_id": data["survey"].pk},
+    "wellbeing-question-detail": lambda data: {"pk": data["question"].pk},
+    "wellbeing-survey-stats": lambda data: {"survey_id": data["survey"].pk},
+    "wellbeing-team-stats": lambda data: {"survey_id": data["survey"].pk},
+}
+
+
+# Endpoints requested as someone other than the HR user.
+URL_ACTORS = {
+    "auth-user-activity": "admin_user",
+    "ops-response-cache": "admin_user",
+    "ops-db-pool": "admin_user",
+}
+
+
+def _iter_patterns(patterns, prefix=""):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _iter_patterns(pattern.url_patterns, prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern):
+            yield prefix + str(pattern.pattern), pattern
+
+
+def get_api_endpoints():
+    """Return ``{url_name: has_kwargs}`` for every named GET endpoint under /api/."""
+    endpoints = {}
+    for route, pattern in _iter_patterns(get_resolver().url_patterns):
+        view_class = getattr(pattern.callback, "view_class", None)
+        if not route.startswith("api/") or pattern.name in EXCLUDED_URL_NAMES:
+            continue
+        if view_class is None or not hasattr(view_class, "get"):
+            continue
+        endpoints[pattern.name] = bool(pattern.pattern.converters)
+    return endpoints
+
+
+def seed_dataset(size):
+    """
+    Create an organisation where every list endpoint returns ``size`` rows
+    (or a multiple of it) for an HR caller.
+    """
+    hr_user = User.objects.create_user(email="budget-hr@example.com", role=User.Role.HR)
+    admin_user = User.objects.create_user(email="budget-admin@example.com", role=User.Role.ADMIN)
+    manager = User.objects.create_user(email="budget-manager@example.com", role=User.Role.MANAGER)
+
+    department = Department.objects.create(name="Engineering", code="ENG")
+    manager_profile = EmployeeProfile.objects.create(user=manager, department=department)
+    EmployeeProfile.objects.create(user=hr_user, department=department)
+
+    cycle = ReviewCycle.objects.create(name="2025", start_date=date(2025, 1, 1), end_date=date(2025, 12, 31))
+    survey = WellbeingSurvey.objects.create(title="Pulse", created_by=hr_user)
+
+    data = {
+        "hr_user": hr_user,
+        "admin_user": admin_user,
+        "department": department,
+        "manager_profile": manager_profile,
+        "cycle": cycle,
+        "survey": survey,
+    }
+
+    for index in range(size):
+        Department.objects.create(name=f"Department {index}", code=f"D{index}")
+        skill = Skill.objects.create(name=f"Skill {index}", code=f"SK{index}", created_by=hr_user)
+        future = FutureCompetency.objects.create(
+            skill=skill, department=department, timeframe="SHORT", created_by=hr_user
+        )
+        ReviewCycle.objects.create(
+            name=f"Cycle {index}", start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+        )
+        extra_survey = WellbeingSurvey.objects.create(title=f"Survey {index}", created_by=hr_user)
+        SurveyQuestion.objects.create(survey=extra_survey, text="Extra", order=1)
+        question = SurveyQuestion.objects.create(survey=survey, text=f"Question {index}", order=index)
+
+        user = User.objects.create_user(email=f"budget-emp{index}@example.com")
+        profile = EmployeeProfile.objects.create(
+            user=user, department=department, manager=manager_profile, job_title="Engineer"
+        )
+        employee_skill = EmployeeSkill.objects.create(
+            employee=profile, skill=skill, level=EmployeeSkill.Level.INTERMEDIATE, last_evaluated_by=manager
+        )
+        review = PerformanceReview.objects.create(employee=profile, manager=manager_profile, cycle=cycle)
+        review_item = None
+        for criteria in ("Delivery", "Teamwork"):
+            review_item = ReviewItem.objects.create(review=review, criteria=criteria, score=3)
+        goal = Goal.objects.create(employee=profile, cycle=cycle, title=f"Goal {index}", created_by=manager)
+        SurveyResponse.objects.create(survey=survey, answers={}, department=department)
+        LoginActivity.objects.create(user=user, action=LoginActivity.Action.LOGIN)
+        # The first employee's timeline grows with the dataset.
+        timeline_user = data.setdefault("employee_user", user)
+        LoginActivity.objects.create(user=timeline_user, action=LoginActivity.Action.LOGOUT)
+
+        data.update(
+            skill=skill,
+            future_competency=future,
+            question=question,
+            employee_skill=employee_skill,
+            review=review,
+            review_item=review_item,
+            goal=goal,
+        )
+
+    for response in SurveyResponse.objects.filter(survey=survey):
+        response.answers = {str(q.id): "3" for q in survey.questions.all()}
+        response.save(update_fields=["answers"])
+
+    return data
+
+
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        self.endpoints = get_api_endpoints()
+
+    def _measure(self, size):
+        counts = {}
+        with transaction.atomic():
+            data = seed_dataset(size)
+            client = APIClient()
+
+            for name in sorted(self.endpoints):
+                actor = data[URL_ACTORS.get(name, "hr_user")]
+                token = RefreshToken.for_user(actor).access_token
+                client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+                kwargs = URL_KWARGS[name](data) if self.endpoints[name] else {}
+                url = reverse(name, kwargs=kwargs)
+                # Measure the uncached path: response cache and ETags would hide queries.
+                cache.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(url)
+                self.assertEqual(response.status_code, 200, f"{name} ({url}) -> {response.status_code}")
+                counts[name] = len(queries)
+
+            transaction.set_rollback(True)
+        return counts
+
+    def test_every_parameterised_endpoint_has_kwargs(self):
+        missing = sorted(name for name, has_kwargs in self.endpoints.items() if has_kwargs and name not in URL_KWARGS)
+        self.assertEqual(missing, [], "Add these endpoints to URL_KWARGS")
+
+    def test_query_counts_are_constant_and_within_budget(self):
+        measurements = {size: self._measure(size) for size in SIZES}
+        smallest = measurements[SIZES[0]]
+
+        if os.environ.get("UPDATE_QUERY_BUDGETS"):
+            BUDGET_FILE.write_text(json.dumps(smallest, indent=2, sort_keys=True) + "\n")
+
+        budgets = json.loads(BUDGET_FILE.read_text())
+
+        for name in sorted(self.endpoints):
+            with self.subTest(endpoint=name):
+                per_size = {size: measurements[size][name] for size in SIZES}
+                self.assertEqual(
+                    len(set(per_size.values())),
+                    1,
+                    f"{name}: query count grows with the dataset {per_size}",
+                )
+                self.assertIn(name, budgets, f"{name}: no budget recorded in {BUDGET_FILE.name}")
+                self.assertLessEqual(
+                    smallest[name],
+                    budgets[name],
+                    f"{name}: {smallest[name]} queries exceeds budget of {budgets[name]}",
+                )
@@ -0,0 +1,73 @@
+import json
+import re
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import include, path
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from accounts.tests.helpers import authenticate
+from smarthr360_backend import urls as project_urls
+
+SERVER_TIMING_RE = re.compile(r'app;dur=[\d.]+, db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def n_plus_one(request):
+    """One lookup per user, each with a different number of e-mails in the IN clause."""
+    emails = list(User.objects.values_list("email", flat=True))
+    for count in range(1, len(emails) + 1):
+        User.objects.filter(email__in=emails[:count]).exists()
+    return HttpResponse()
+
+
+urlpatterns = [
+    path("n-plus-one/", n_plus_one),
+    path("", include(project_urls)),
+]
+
+
+class QueryInstrumentationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_server_timing_header_reports_query_count(self):
+        resp = self.client.get("/api/auth/login/")
+        match = SERVER_TIMING_RE.fullmatch(resp["Server-Timing"])
+        self.assertIsNotNone(match, resp["Server-Timing"])
+
+    def test_structured_log_line_per_request(self):
+        User.objects.create_user(email="hr@example.com", password="HrPass123!", role=User.Role.HR)
+        authenticate(self.client, "hr@example.com", "HrPass123!")
+
+        with self.assertLogs("smarthr360.requests", level="INFO") as logs:
+            resp = self.client.get("/api/auth/users/")
+
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["path"], "/api/auth/users/")
+        self.assertEqual(record["view"], "auth-user-list")
+        self.assertEqual(record["status"], 200)
+        queries = int(SERVER_TIMING_RE.fullmatch(resp["Server-Timing"]).group(1))
+        self.assertEqual(record["db_queries"], queries)
+        self.assertGreater(queries, 0)
+
+    @override_settings(QUERY_INSTRUMENTATION_REPEAT_THRESHOLD=2, ROOT_URLCONF=__name__)
+    def test_repeated_sql_template_is_flagged(self):
+        for index in range(3):
+            User.objects.create_user(email=f"user{index}@example.com")
+
+        with self.assertLogs("smarthr360.requests", level="WARNING") as logs:
+            self.client.get("/n-plus-one/")
+
+        record = json.loads(logs.records[-1].getMessage())
+        flagged = record["repeated_queries"][0]
+        self.assertIn("accounts_user", flagged["sql"])
+        self.assertIn("(%s, ...)", flagged["sql"])
+        self.assertEqual(flagged["count"], 3)
+
+    @override_settings(QUERY_INSTRUMENTATION_ENABLED=False)
+    def test_can_be_disabled(self):
+        resp = self.client.get("/api/auth/login/")
+        self.assertNotIn("Server-Timing", resp)
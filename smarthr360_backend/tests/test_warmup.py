@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts import hashing
+from accounts.models import User
+from hr.models import Department, Skill
+from smarthr360_backend import response_cache, warmup
+
+
+@override_settings(CACHE_SHARED=True, RESPONSE_CACHE_TTL=300)
+class WarmUpTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = User.objects.create_user(email="warm-up@example.com", role=User.Role.EMPLOYEE)
+        Department.objects.create(name="Engineering", code="ENG")
+        Skill.objects.bulk_create(Skill(name=f"Skill {index:02d}", code=f"S{index:02d}") for index in range(25))
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.employee)}")
+
+    # The pool has its own tests; do not leave processes running after this one.
+    @override_settings(PASSWORD_HASH_POOL=False)
+    def test_every_step(self):
+        self.addCleanup(hashing.reset_pool)
+        report = warmup.warm_up()
+
+        self.assertEqual(list(report), list(warmup.STEPS))
+        self.assertFalse([name for name, step in report.items() if "error" in step])
+        self.assertGreater(report["url_resolver"]["result"], 100)
+        self.assertGreater(report["serializers"]["result"], 20)
+        self.assertEqual(report["databases"]["result"], {"default": True})
+        self.assertIsNone(report["hashing_pool"]["result"])
+
+    def test_reference_lists_are_cached_per_role(self):
+        primed = warmup.prime_reference_caches()
+        self.assertEqual(primed, 4 * len(User.Role.values))
+        response_cache.reset_stats()
+
+        resp = self.client.get("/api/hr/departments/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(response_cache.get_stats()["DepartmentListCreateView"]["hits"], 1)
+
+        # Paginated lists are not kept: their links name the request's host.
+        self.client.get("/api/hr/skills/")
+        self.assertEqual(response_cache.get_stats()["SkillListCreateView"]["hits"], 0)
+
+    @override_settings(ALLOWED_HOSTS=[".example.com"])
+    def test_request_host_is_allowed(self):
+        # The paginated skills list builds links from the request's host.
+        with self.assertNoLogs("smarthr360_backend.warmup", "WARNING"):
+            self.assertEqual(warmup.prime_reference_caches(), 4 * len(User.Role.values))
+
+    def test_failing_list_does_not_stop_the_others(self):
+        with mock.patch("hr.views.DepartmentListCreateView.list", side_effect=RuntimeError("boom")):
+            with self.assertLogs("smarthr360_backend.warmup", "WARNING"):
+                primed = warmup.prime_reference_caches()
+        self.assertEqual(primed, 3 * len(User.Role.values))
+
+    def test_failing_step_does_not_stop_the_others(self):
+        with mock.patch.dict(warmup.STEPS, {"url_resolver": mock.Mock(side_effect=RuntimeError("boom"))}):
+            with self.assertLogs("smarthr360_backend.warmup", "WARNING"):
+                report = warmup.warm_up(("url_resolver", "serializers"))
+
+        self.assertEqual(report["url_resolver"]["error"], "RuntimeError: boom")
+        self.assertIn("result", report["serializers"])
+
+    @override_settings(WORKER_WARMUP=False)
+    def test_disabled(self):
+        with mock.patch.object(warmup, "warm_up") as warm_up:
+            warmup.warm_up_worker()
+            warmup.warm_up_master()
+        warm_up.assert_not_called()
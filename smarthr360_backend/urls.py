@@ -15,25 +15,33 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
+
+from .docs import docs_view
+from .views import DatabasePoolStatsView, ResponseCacheStatsView
+
+if settings.OPENAPI_SCHEMA_PRECOMPUTED:
+    schema_view = 'smarthr360_backend.openapi.PrecomputedSchemaView'
+else:
+    schema_view = 'drf_spectacular.views.SpectacularAPIView'
 
 urlpatterns = [
     path('admin/', admin.site.urls),
 
     # API Documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    path('api/schema/', docs_view(schema_view), name='schema'),
+    path('docs/', docs_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'), name='swagger-ui'),
+    path('redoc/', docs_view('drf_spectacular.views.SpectacularRedocView', url_name='schema'), name='redoc'),
 
     # API endpoints
     path('api/auth/', include('accounts.urls')),
     path("api/hr/", include("hr.urls")),
     path("api/reviews/", include("reviews.urls")),
     path("api/wellbeing/", include("wellbeing.urls")),
+
+    # Operations
+    path("api/ops/response-cache/", ResponseCacheStatsView.as_view(), name="ops-response-cache"),
+    path("api/ops/db-pool/", DatabasePoolStatsView.as_view(), name="ops-db-pool"),
 ]
@@ -0,0 +1,97 @@
+"""
+Resource version counters used for conditional GET (ETag) and the response cache.
+
+Each tracked model has a collection counter, and each row has its own counter.
+Both live in the default cache and are bumped from ``post_save`` /
+``post_delete``, so a view can tell whether a client's copy is still fresh
+without touching the model's table.
+
+``QuerySet.update()``, ``bulk_create()`` and raw SQL do not send signals: code
+that writes tracked models that way must call ``bump_model_version()`` itself.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+KEY_PREFIX = "resource-version"
+
+
+def _label(model) -> str:
+    return model._meta.label_lower
+
+
+def _key(model, pk=None) -> str:
+    key = f"{KEY_PREFIX}:{_label(model)}"
+    if pk is not None:
+        key = f"{key}:{pk}"
+    return key
+
+
+def _seed() -> int:
+    # Counters start from the clock rather than 0, so a counter that was evicted
+    # from the cache never restarts at a value a client may still hold.
+    return time.time_ns()
+
+
+def get_versions(specs) -> list[int]:
+    """
+    Return the version of each ``(model, pk)`` pair in ``specs``.
+
+    ``pk=None`` selects the collection counter. Missing counters are created.
+    """
+    specs = list(specs)
+    keys = [_key(model, pk) for model, pk in specs]
+    found = cache.get_many(keys)
+
+    result = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            seed = _seed()
+            cache.add(key, seed, timeout=None)
+            version = cache.get(key, seed)
+        result.append(version)
+    return result
+
+
+def _bump(model, pk=None) -> None:
+    key = _key(model, pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _seed(), timeout=None)
+
+
+def bump_model_version(model, pk=None) -> None:
+    """
+    Invalidate the collection counter of ``model`` (and the row counter of ``pk``).
+
+    Counters are bumped immediately and once more when the surrounding
+    transaction commits, so a reader racing the commit cannot pin the new
+    version to the old rows.
+    """
+
+    def bump():
+        if pk is not None:
+            _bump(model, pk)
+        _bump(model)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def _on_model_change(sender, instance, **kwargs):
+    bump_model_version(sender, instance.pk)
+
+
+def track_versions(*models) -> None:
+    """Bump version counters of ``models`` whenever a row is saved or deleted."""
+    for model in models:
+        label = _label(model)
+        post_save.connect(_on_model_change, sender=model, dispatch_uid=f"{KEY_PREFIX}:save:{label}")
+        post_delete.connect(_on_model_change, sender=model, dispatch_uid=f"{KEY_PREFIX}:delete:{label}")
@@ -0,0 +1,57 @@
+import os
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions import IsAdminRole
+
+from . import db_pool, response_cache
+from .api_mixins import ApiResponseMixin
+
+
+class ResponseCacheStatsView(ApiResponseMixin, APIView):
+    """
+    GET    /api/ops/response-cache/  → hit/miss counters per cached view (ADMIN)
+    DELETE /api/ops/response-cache/  → reset the counters (ADMIN)
+    """
+    permission_classes = [IsAdminRole]
+
+    def get(self, request):
+        return Response(
+            {
+                "enabled": getattr(settings, "CACHE_SHARED", False),
+                "default_ttl": getattr(settings, "RESPONSE_CACHE_TTL", 0),
+                "views": response_cache.get_stats(),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def delete(self, request):
+        response_cache.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class DatabasePoolStatsView(ApiResponseMixin, APIView):
+    """
+    GET    /api/ops/db-pool/  → connection pool health and wait-time counters (ADMIN)
+    DELETE /api/ops/db-pool/  → reset the counters (ADMIN)
+
+    Pools are per process: the answer describes the worker that served the request.
+    """
+    permission_classes = [IsAdminRole]
+
+    def get(self, request):
+        return Response(
+            {
+                "pid": os.getpid(),
+                "health": db_pool.check_health(),
+                "stats": db_pool.get_stats(),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def delete(self, request):
+        db_pool.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
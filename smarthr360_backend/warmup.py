@@ -0,0 +1,224 @@
+"""
+Worker warm-up.
+
+The first requests a new worker serves pay for work done once per process:
+compiling the URL resolver, building serializer fields (which fills the
+models' ``_meta`` caches and loads translation catalogs), connecting to the
+database, starting the password-hashing processes and computing the
+reference-data lists. ``warm_up()`` does it before the worker takes traffic.
+Each step is timed. A failing step is logged and skipped, so warm-up never
+keeps a worker from starting.
+
+``gunicorn.conf.py`` runs it when ``WORKER_WARMUP`` is on:
+
+- under ``--preload`` the master runs ``PRELOAD_STEPS`` before forking. They
+  open no connection, and the workers share the result;
+- each worker runs ``WORKER_STEPS`` in ``post_worker_init``, once the
+  application is loaded and before it accepts connections.
+
+``manage.py warm_up`` runs the steps in a fresh process and prints timings.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import URLResolver, get_resolver
+from rest_framework import serializers
+from rest_framework.test import force_authenticate
+
+from accounts import hashing
+from accounts.grouping import ROLE_TO_BASE_GROUP
+
+from . import db_pool
+from .api_mixins import CachedListMixin
+
+logger = logging.getLogger(__name__)
+
+
+def _url_patterns(patterns, prefix=""):
+    """``(route, callback)`` for each URL pattern, with its full route."""
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from _url_patterns(pattern.url_patterns, route)
+        else:
+            yield route, pattern.callback
+
+
+def load_url_resolver() -> int:
+    """Import the URLconf and compile its patterns; return how many there are."""
+    resolver = get_resolver()
+    resolver.reverse_dict  # noqa: B018 - populated (and every regex compiled) on first access
+    return sum(1 for _ in _url_patterns(resolver.url_patterns))
+
+
+def _project_serializers():
+    get_resolver().url_patterns  # noqa: B018 - imports the views, and so their serializers
+    base_dir = Path(settings.BASE_DIR).resolve()
+    packages = {
+        config.name.split(".")[0]
+        for config in apps.get_app_configs()
+        if Path(config.path).resolve().is_relative_to(base_dir) and "site-packages" not in config.path
+    }
+    pending = [serializers.Serializer]
+    seen = set()
+    while pending:
+        cls = pending.pop()
+        for subclass in cls.__subclasses__():
+            if subclass not in seen:
+                seen.add(subclass)
+                pending.append(subclass)
+                if subclass.__module__.split(".")[0] in packages:
+                    yield subclass
+
+
+def build_serializer_fields() -> int:
+    """Build the fields of each project serializer once; return how many were built."""
+    built = 0
+    for serializer_class in _project_serializers():
+        try:
+            serializer_class().fields  # noqa: B018
+        except Exception:
+            # Serializers that need a request or an instance in their context.
+            logger.debug("Warm-up skipped %s", serializer_class.__qualname__, exc_info=True)
+            continue
+        built += 1
+    return built
+
+
+def connect_databases() -> dict[str, bool]:
+    """
+    Open each database's connection pool, or check the connection without one.
+
+    Unpooled connections belong to the calling thread: this one is closed again,
+    request threads open their own.
+    """
+    healthy = {}
+    for alias in connections:
+        health = db_pool.check_health(alias)
+        if not health["pooled"]:
+            connections[alias].close()
+        if not health["healthy"]:
+            logger.warning("Warm-up: database %r unavailable: %s", alias, health["error"])
+        healthy[alias] = health["healthy"]
+    return healthy
+
+
+def _allowed_host() -> str:
+    """A host ``request.get_host()`` accepts: the first ALLOWED_HOSTS entry that names one."""
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*":
+            return host.lstrip(".")
+    return "localhost"
+
+
+def _prime_view(view_class, initkwargs, path: str, factory: RequestFactory) -> int:
+    from accounts.models import User
+
+    primed = 0
+    for role in User.Role.values:
+        view = view_class(**initkwargs)
+        if view.get_response_cache_ttl() <= 0:
+            break
+        user = User(role=role)
+        user._group_names = frozenset(filter(None, [ROLE_TO_BASE_GROUP.get(role)]))
+        request = factory.get(path)
+        force_authenticate(request, user=user)
+        view.setup(request)
+        response = view.dispatch(request)
+        if response.status_code != 200:
+            continue
+        page = response.data.get("data") if isinstance(response.data, dict) else None
+        if isinstance(page, dict) and (page.get("next") or page.get("previous")):
+            cache.delete(view.get_response_cache_key(view.request))
+            continue
+        primed += 1
+    return primed
+
+
+def prime_reference_caches() -> int:
+    """
+    Fill the response cache of each ``CachedListMixin`` list (departments,
+    skills, review cycles, surveys...) as seen by each role with its default
+    group (``ROLE_TO_BASE_GROUP``); return the number of entries stored.
+
+    Only single-page lists are kept: the links of a paginated one would carry
+    the host of the warm-up request. That host is taken from ALLOWED_HOSTS,
+    so building the links passes host validation. A list that fails is logged
+    and skipped.
+    """
+    factory = RequestFactory(HTTP_HOST=_allowed_host())
+    primed = 0
+    for route, callback in _url_patterns(get_resolver().url_patterns):
+        view_class = getattr(callback, "view_class", None)
+        if not (view_class and issubclass(view_class, CachedListMixin)) or "<" in route or "^" in route:
+            continue
+        try:
+            primed += _prime_view(view_class, callback.view_initkwargs, f"/{route}", factory)
+        except Exception:
+            logger.warning("Warm-up could not prime %s", view_class.__name__, exc_info=True)
+    return primed
+
+
+def start_hashing_pool() -> int | None:
+    """Start the password-hashing processes (``PASSWORD_HASH_POOL``)."""
+    if not hashing.is_enabled():
+        return None
+    return hashing.warm_up()
+
+
+STEPS = {
+    "url_resolver": load_url_resolver,
+    "serializers": build_serializer_fields,
+    "databases": connect_databases,
+    "reference_caches": prime_reference_caches,
+    "hashing_pool": start_hashing_pool,
+}
+PRELOAD_STEPS = ("url_resolver", "serializers")
+WORKER_STEPS = tuple(STEPS)
+
+
+def warm_up(steps=WORKER_STEPS) -> dict[str, dict]:
+    """Run ``steps`` in order; return ``{step: {"ms", "result"} or {"ms", "error"}}``."""
+    report = {}
+    for name in steps:
+        start = time.perf_counter()
+        try:
+            outcome = {"result": STEPS[name]()}
+        except Exception as exc:
+            logger.warning("Warm-up step %s failed", name, exc_info=True)
+            outcome = {"error": f"{type(exc).__name__}: {exc}"}
+        report[name] = {"ms": round((time.perf_counter() - start) * 1000, 1), **outcome}
+    logger.info(
+        "Warm-up of process %s: %s",
+        os.getpid(),
+        ", ".join(f"{name} {step['ms']} ms" for name, step in report.items()),
+    )
+    return report
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "WORKER_WARMUP", False)
+
+
+def warm_up_master() -> None:
+    """gunicorn ``when_ready`` under ``--preload``: warm what the forked workers share."""
+    if is_enabled():
+        warm_up(PRELOAD_STEPS)
+        # Never hand a connection opened here down to the workers.
+        connections.close_all()
+
+
+def warm_up_worker() -> None:
+    """gunicorn ``post_worker_init``."""
+    if is_enabled():
+        warm_up(WORKER_STEPS)
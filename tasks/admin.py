@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ("name", "queue", "status", "attempts", "run_at", "finished_at")
+    list_filter = ("status", "queue")
+    search_fields = ("name",)
+    readonly_fields = (
+        "args",
+        "kwargs",
+        "attempts",
+        "last_error",
+        "locked_by",
+        "locked_at",
+        "created_at",
+        "finished_at",
+    )
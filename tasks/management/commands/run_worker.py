@@ -0,0 +1,63 @@
+"""
+Run background tasks (see ``tasks.registry`` and ``tasks.worker``).
+
+    manage.py run_worker                          # until SIGTERM / Ctrl-C
+    manage.py run_worker --queue default --queue reports --concurrency 4
+    manage.py run_worker --burst                  # run what is due, then exit
+"""
+
+from __future__ import annotations
+
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.worker import run_workers
+
+
+class Command(BaseCommand):
+    help = "Run queued background tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            help="Queue to consume (repeatable, default: default).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.TASKS_CONCURRENCY,
+            help="Worker threads (default: TASKS_CONCURRENCY).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.TASKS_POLL_INTERVAL,
+            help="Seconds between polls when no task is due (default: TASKS_POLL_INTERVAL).",
+        )
+        parser.add_argument("--burst", action="store_true", help="Exit once no task is due.")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        queues = options["queues"] or ["default"]
+        self.stdout.write(f"Running tasks from {', '.join(queues)} with {options['concurrency']} threads")
+        try:
+            run_workers(
+                queues=queues,
+                concurrency=options["concurrency"],
+                poll_interval=options["poll_interval"],
+                burst=options["burst"],
+                stop=stop,
+            )
+        except KeyboardInterrupt:
+            # Running tasks finish; queued ones stay for the next worker.
+            stop.set()
+        self.stdout.write(self.style.SUCCESS("Worker stopped."))
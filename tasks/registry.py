@@ -0,0 +1,90 @@
+"""
+The ``@task`` decorator.
+
+    from tasks.registry import task
+
+    @task(max_attempts=5, retry_delay=30)
+    def rebuild_report(report_id):
+        ...
+
+    rebuild_report.enqueue(report.pk)                       # as soon as a worker is free
+    rebuild_report.schedule(timedelta(minutes=10), report.pk)
+
+``enqueue()`` stores a ``Task`` row in the caller's transaction: the task runs
+only if the caller commits, and only after it commits. Arguments must be JSON
+serializable; pass primary keys, not model instances.
+
+With ``TASKS_RUN_INLINE`` (the default: turn it off only where a
+``run_worker`` process runs) the function runs immediately inside
+``enqueue()`` and scheduling is ignored.
+"""
+
+from __future__ import annotations
+
+import functools
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Task
+
+_registry: dict[str, TaskFunction] = {}
+
+
+class TaskFunction:
+    def __init__(self, func, *, name: str, queue: str, priority: int, max_attempts: int, retry_delay: float):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name = name
+        self.queue = queue
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, **kwargs) -> Task | None:
+        return self.schedule(None, *args, **kwargs)
+
+    def schedule(self, when: datetime | timedelta | None, *args, **kwargs) -> Task | None:
+        """Run at ``when`` (a datetime, or a delay from now)."""
+        if settings.TASKS_RUN_INLINE:
+            self.func(*args, **kwargs)
+            return None
+        if isinstance(when, timedelta):
+            when = timezone.now() + when
+        return Task.objects.create(
+            name=self.name,
+            args=list(args),
+            kwargs=kwargs,
+            queue=self.queue,
+            priority=self.priority,
+            run_at=when or timezone.now(),
+            max_attempts=self.max_attempts,
+        )
+
+
+def task(func=None, *, name: str | None = None, queue: str = "default", priority: int = 0,
+         max_attempts: int = 3, retry_delay: float = 10):
+    """Register ``func`` as a task (usable with or without arguments)."""
+
+    def register(func):
+        task_name = name or f"{func.__module__}.{func.__qualname__}"
+        wrapper = TaskFunction(
+            func,
+            name=task_name,
+            queue=queue,
+            priority=priority,
+            max_attempts=max_attempts,
+            retry_delay=retry_delay,
+        )
+        _registry[task_name] = wrapper
+        return wrapper
+
+    return register(func) if func is not None else register
+
+
+def get_task(name: str) -> TaskFunction | None:
+    return _registry.get(name)
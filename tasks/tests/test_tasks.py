@@ -0,0 +1,170 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.registry import get_task, task
+from tasks.worker import Worker, requeue_stale
+
+calls: list[tuple[object, str]] = []
+
+
+@task(name="tests.record")
+def record(value, *, label="x"):
+    calls.append((value, label))
+
+
+@task(name="tests.flaky", max_attempts=2, retry_delay=30)
+def flaky():
+    raise RuntimeError("boom")
+
+
+@task(name="tests.urgent", priority=-10)
+def urgent(value):
+    calls.append((value, "urgent"))
+
+
+@override_settings(TASKS_RUN_INLINE=False, TASKS_LEASE_SECONDS=600)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+        self.worker = Worker(worker_id="test-worker")
+
+    def test_enqueue_stores_a_row_and_the_worker_runs_it(self):
+        queued = record.enqueue(1, label="a")
+
+        self.assertEqual(queued.status, Task.Status.QUEUED)
+        self.assertEqual((queued.args, queued.kwargs), ([1], {"label": "a"}))
+        self.assertEqual(calls, [])
+
+        self.assertTrue(self.worker.run_one())
+        self.assertFalse(self.worker.run_one())
+
+        queued.refresh_from_db()
+        self.assertEqual(calls, [(1, "a")])
+        self.assertEqual(queued.status, Task.Status.SUCCEEDED)
+        self.assertEqual(queued.attempts, 1)
+        self.assertIsNotNone(queued.finished_at)
+
+    def test_rolled_back_enqueue_leaves_nothing(self):
+        try:
+            with transaction.atomic():
+                record.enqueue(1)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertFalse(Task.objects.exists())
+
+    def test_scheduled_task_waits_until_due(self):
+        scheduled = record.schedule(timedelta(minutes=5), 2)
+
+        self.assertFalse(self.worker.run_one())
+
+        Task.objects.filter(pk=scheduled.pk).update(run_at=timezone.now() - timedelta(seconds=1))
+        self.assertTrue(self.worker.run_one())
+        self.assertEqual(calls, [(2, "x")])
+
+    def test_lower_priority_value_runs_first(self):
+        record.enqueue(1)
+        urgent.enqueue(2)
+
+        self.worker.run_one()
+        self.assertEqual(calls, [(2, "urgent")])
+
+    def test_worker_only_consumes_its_queues(self):
+        Task.objects.create(name="tests.record", args=[3], queue="reports")
+
+        self.assertFalse(self.worker.run_one())
+        self.assertTrue(Worker(queues=["reports"]).run_one())
+        self.assertEqual(calls, [(3, "x")])
+
+    def test_failure_is_retried_with_backoff_then_failed(self):
+        queued = flaky.enqueue()
+
+        before = timezone.now()
+        self.worker.run_one()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Task.Status.QUEUED)
+        self.assertEqual(queued.attempts, 1)
+        self.assertIn("RuntimeError: boom", queued.last_error)
+        self.assertGreaterEqual(queued.run_at, before + timedelta(seconds=30))
+        self.assertFalse(self.worker.run_one())
+
+        Task.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        self.worker.run_one()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Task.Status.FAILED)
+        self.assertEqual(queued.attempts, 2)
+
+    def test_unknown_task_fails_without_retry(self):
+        queued = Task.objects.create(name="tests.missing")
+
+        self.worker.run_one()
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Task.Status.FAILED)
+        self.assertIn("Unknown task", queued.last_error)
+
+    def test_claimed_task_is_not_claimed_again(self):
+        record.enqueue(1)
+
+        claimed = self.worker.claim()
+
+        self.assertEqual(claimed.status, Task.Status.RUNNING)
+        self.assertEqual(claimed.locked_by, "test-worker")
+        self.assertIsNone(Worker(worker_id="other").claim())
+
+    def test_stale_running_task_is_requeued(self):
+        record.enqueue(1)
+        claimed = self.worker.claim()
+        Task.objects.filter(pk=claimed.pk).update(locked_at=timezone.now() - timedelta(seconds=601))
+
+        self.assertEqual(requeue_stale(), 1)
+
+        claimed.refresh_from_db()
+        self.assertEqual(claimed.status, Task.Status.QUEUED)
+        self.assertEqual(claimed.locked_by, "")
+        self.assertTrue(self.worker.run_one())
+
+    def test_stale_task_out_of_attempts_is_failed(self):
+        queued = flaky.enqueue()
+        Task.objects.filter(pk=queued.pk).update(
+            status=Task.Status.RUNNING, attempts=2, locked_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(requeue_stale(), 0)
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Task.Status.FAILED)
+
+    def test_inline_mode_runs_immediately(self):
+        with self.settings(TASKS_RUN_INLINE=True):
+            self.assertIsNone(record.enqueue(4))
+        self.assertEqual(calls, [(4, "x")])
+        self.assertFalse(Task.objects.exists())
+
+    def test_registry_lookup(self):
+        self.assertIs(get_task("tests.record"), record)
+        self.assertIsNotNone(get_task("reviews.tasks.recalculate_review_score"))
+        self.assertIsNone(get_task("tests.missing"))
+
+
+@override_settings(TASKS_RUN_INLINE=False)
+class RunWorkerCommandTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_burst_runs_due_tasks_and_exits(self):
+        for value in range(5):
+            record.enqueue(value)
+
+        out = StringIO()
+        call_command("run_worker", "--burst", "--concurrency", "2", "--poll-interval", "0.05", stdout=out)
+
+        self.assertEqual(sorted(value for value, _ in calls), [0, 1, 2, 3, 4])
+        self.assertEqual(Task.objects.filter(status=Task.Status.SUCCEEDED).count(), 5)
+        self.assertIn("Worker stopped.", out.getvalue())
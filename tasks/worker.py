@@ -0,0 +1,174 @@
+"""
+Claim and run ``Task`` rows (see ``tasks.registry``).
+
+On PostgreSQL a task is claimed with ``SELECT ... FOR UPDATE SKIP LOCKED``:
+concurrent workers never wait on each other's rows. Elsewhere (SQLite) the
+worker polls and claims with a conditional UPDATE on the status, so two
+workers can never run the same task.
+
+A failed task is queued again after ``retry_delay * 2 ** (attempts - 1)``
+seconds (at most one hour) until ``max_attempts`` is reached, then marked
+FAILED. A task left RUNNING longer than ``TASKS_LEASE_SECONDS`` (its worker
+died) is queued again, so a task runs at least once and may run twice: keep
+tasks idempotent.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 3600
+FALLBACK_CANDIDATES = 5
+
+
+class Worker:
+    def __init__(self, *, queues=("default",), worker_id: str | None = None):
+        self.queues = list(queues)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+    def _due(self, now):
+        return Task.objects.filter(
+            status=Task.Status.QUEUED,
+            queue__in=self.queues,
+            run_at__lte=now,
+        ).order_by("priority", "run_at", "id")
+
+    def claim(self) -> Task | None:
+        now = timezone.now()
+        if connection.features.has_select_for_update_skip_locked:
+            with transaction.atomic():
+                task = self._due(now).select_for_update(skip_locked=True).first()
+                if task is None:
+                    return None
+                task.status = Task.Status.RUNNING
+                task.locked_by = self.worker_id
+                task.locked_at = now
+                task.attempts += 1
+                task.save(update_fields=["status", "locked_by", "locked_at", "attempts"])
+                return task
+
+        for pk in self._due(now).values_list("pk", flat=True)[:FALLBACK_CANDIDATES]:
+            claimed = Task.objects.filter(pk=pk, status=Task.Status.QUEUED).update(
+                status=Task.Status.RUNNING,
+                locked_by=self.worker_id,
+                locked_at=now,
+                attempts=F("attempts") + 1,
+            )
+            if claimed:
+                return Task.objects.get(pk=pk)
+        return None
+
+    def execute(self, task: Task) -> bool:
+        """Run a claimed task and record the outcome; return True on success."""
+        task_function = get_task(task.name)
+        try:
+            if task_function is None:
+                raise LookupError(f"Unknown task {task.name!r}")
+            task_function.func(*task.args, **task.kwargs)
+        except Exception as exc:
+            logger.exception("Task %s #%s failed (attempt %d)", task.name, task.pk, task.attempts)
+            self._record_failure(task, exc, retry_delay=task_function.retry_delay if task_function else None)
+            return False
+
+        Task.objects.filter(pk=task.pk).update(
+            status=Task.Status.SUCCEEDED,
+            finished_at=timezone.now(),
+            last_error="",
+            locked_by="",
+            locked_at=None,
+        )
+        return True
+
+    def _record_failure(self, task: Task, exc: Exception, *, retry_delay: float | None) -> None:
+        now = timezone.now()
+        error = f"{type(exc).__name__}: {exc}"[:2000]
+        if retry_delay is None or task.attempts >= task.max_attempts:
+            Task.objects.filter(pk=task.pk).update(
+                status=Task.Status.FAILED, finished_at=now, last_error=error, locked_by="", locked_at=None
+            )
+            return
+        delay = min(retry_delay * 2 ** (task.attempts - 1), MAX_RETRY_DELAY)
+        Task.objects.filter(pk=task.pk).update(
+            status=Task.Status.QUEUED,
+            run_at=now + timedelta(seconds=delay),
+            last_error=error,
+            locked_by="",
+            locked_at=None,
+        )
+
+    def run_one(self) -> bool:
+        """Claim and run one due task; return False when none is due."""
+        task = self.claim()
+        if task is None:
+            return False
+        self.execute(task)
+        return True
+
+    def run(self, stop: threading.Event, *, poll_interval: float, burst: bool = False) -> None:
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                if self.run_one():
+                    continue
+                if burst:
+                    break
+                stop.wait(poll_interval)
+        finally:
+            connection.close()
+
+
+def requeue_stale(lease_seconds: float | None = None) -> int:
+    """Queue again the tasks whose worker stopped reporting; return how many."""
+    lease_seconds = lease_seconds or settings.TASKS_LEASE_SECONDS
+    cutoff = timezone.now() - timedelta(seconds=lease_seconds)
+    stale = Task.objects.filter(status=Task.Status.RUNNING, locked_at__lt=cutoff)
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Task.Status.FAILED,
+        finished_at=timezone.now(),
+        last_error="Worker lease expired",
+        locked_by="",
+        locked_at=None,
+    )
+    requeued = stale.update(status=Task.Status.QUEUED, locked_by="", locked_at=None)
+    if failed or requeued:
+        logger.warning("Requeued %d stale tasks, failed %d", requeued, failed)
+    return requeued
+
+
+def run_workers(*, queues, concurrency: int, poll_interval: float, burst: bool, stop: threading.Event) -> None:
+    """Run ``concurrency`` worker threads until ``stop`` is set (or, in burst mode, the queue is empty)."""
+    requeue_stale()
+    threads = [
+        threading.Thread(
+            target=Worker(queues=queues).run,
+            args=(stop,),
+            kwargs={"poll_interval": poll_interval, "burst": burst},
+            name=f"task-worker-{index}",
+        )
+        for index in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+
+    last_requeue = time.monotonic()
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=poll_interval)
+        if time.monotonic() - last_requeue >= settings.TASKS_LEASE_SECONDS / 2:
+            requeue_stale()
+            last_requeue = time.monotonic()
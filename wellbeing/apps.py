@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class WellbeingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'wellbeing'
+
+    def ready(self):
+        from smarthr360_backend.versioning import track_versions
+
+        from .models import SurveyQuestion, WellbeingSurvey
+
+        track_versions(SurveyQuestion, WellbeingSurvey)
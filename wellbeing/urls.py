@@ -1,19 +1,21 @@
 from django.urls import path
 
+from smarthr360_backend.async_views import read_view
+
 from .views import (
+    AsyncWellbeingSurveyDetailView,
     SurveyQuestionDetailView,
     SurveyQuestionListCreateView,
     SurveyStatsView,
     SurveySubmitView,
     TeamStatsView,
-    WellbeingSurveyDetailView,
     WellbeingSurveyListCreateView,
 )
 
 urlpatterns = [
     # surveys
     path("surveys/", WellbeingSurveyListCreateView.as_view(), name="wellbeing-survey-list"),
-    path("surveys/<int:pk>/", WellbeingSurveyDetailView.as_view(), name="wellbeing-survey-detail"),
+    path("surveys/<int:pk>/", read_view(AsyncWellbeingSurveyDetailView), name="wellbeing-survey-detail"),
 
     # questions
     path(
@@ -1,6 +1,7 @@
 import json
 
 # wellbeing/views.py (UPDATED WITH ENVELOPE)
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions, status
 from rest_framework.exceptions import PermissionDenied
@@ -9,7 +10,8 @@ from rest_framework.views import APIView
 from accounts.access import has_hr_access, is_auditor, is_manager
 from accounts.models import User
 from hr.models import EmployeeProfile
-from smarthr360_backend.api_mixins import ApiResponseMixin
+from smarthr360_backend.api_mixins import ApiResponseMixin, CachedListMixin, ConditionalGetMixin, ReplicaReadMixin
+from smarthr360_backend.async_views import AsyncConditionalGetMixin, AsyncReadView
 
 from .models import SurveyQuestion, SurveyResponse, WellbeingSurvey
 from .serializers import (
@@ -21,8 +23,9 @@ from .serializers import (
 )
 
 
-class WellbeingSurveyListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
-    queryset = WellbeingSurvey.objects.all()
+class WellbeingSurveyListCreateView(ConditionalGetMixin, CachedListMixin, ApiResponseMixin, generics.ListCreateAPIView):
+    versioned_models = (WellbeingSurvey, SurveyQuestion)
+    queryset = WellbeingSurvey.objects.prefetch_related("questions")
     serializer_class = WellbeingSurveySerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -33,8 +36,9 @@ class WellbeingSurveyListCreateView(ApiResponseMixin, generics.ListCreateAPIView
         serializer.save(created_by=user)
 
 
-class WellbeingSurveyDetailView(ApiResponseMixin, generics.RetrieveUpdateAPIView):
-    queryset = WellbeingSurvey.objects.all()
+class WellbeingSurveyDetailView(ConditionalGetMixin, ApiResponseMixin, generics.RetrieveUpdateAPIView):
+    versioned_models = (WellbeingSurvey, SurveyQuestion)
+    queryset = WellbeingSurvey.objects.prefetch_related("questions")
     serializer_class = WellbeingSurveySerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -45,7 +49,20 @@ class WellbeingSurveyDetailView(ApiResponseMixin, generics.RetrieveUpdateAPIView
         serializer.save()
 
 
-class SurveyQuestionListCreateView(ApiResponseMixin, generics.ListCreateAPIView):
+class AsyncWellbeingSurveyDetailView(AsyncConditionalGetMixin, AsyncReadView):
+    sync_view = WellbeingSurveyDetailView
+    versioned_models = (WellbeingSurvey, SurveyQuestion)
+
+    async def read(self, request, pk):
+        try:
+            survey = await WellbeingSurvey.objects.prefetch_related("questions").aget(pk=pk)
+        except WellbeingSurvey.DoesNotExist:
+            raise Http404("No WellbeingSurvey matches the given query.") from None
+        return self.success_response(WellbeingSurveySerializer(survey).data)
+
+
+class SurveyQuestionListCreateView(ConditionalGetMixin, ApiResponseMixin, generics.ListCreateAPIView):
+    versioned_models = (SurveyQuestion, WellbeingSurvey)
     serializer_class = SurveyQuestionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -63,7 +80,8 @@ class SurveyQuestionListCreateView(ApiResponseMixin, generics.ListCreateAPIView)
         serializer.save(survey=self.get_survey())
 
 
-class SurveyQuestionDetailView(ApiResponseMixin, generics.RetrieveUpdateDestroyAPIView):
+class SurveyQuestionDetailView(ConditionalGetMixin, ApiResponseMixin, generics.RetrieveUpdateDestroyAPIView):
+    versioned_models = (SurveyQuestion,)
     queryset = SurveyQuestion.objects.select_related("survey")
     serializer_class = SurveyQuestionSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -174,7 +192,7 @@ class SurveySubmitView(ApiResponseMixin, APIView):
         )
 
 
-class SurveyStatsView(ApiResponseMixin, APIView):
+class SurveyStatsView(ReplicaReadMixin, ApiResponseMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, survey_id):
@@ -228,7 +246,7 @@ class SurveyStatsView(ApiResponseMixin, APIView):
         return self.success_response(s.data)
 
 
-class TeamStatsView(ApiResponseMixin, APIView):
+class TeamStatsView(ReplicaReadMixin, ApiResponseMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, survey_id):